@@ -5,7 +5,12 @@ from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from app.core import deps
 from app.core.config import settings
-from app.core.security import verify_password, create_access_token, get_password_hash
+from app.core.security import (
+    HashingBusyError,
+    create_access_token,
+    get_password_hash,
+    verify_and_update_password,
+)
 from app.models.users import User, UserRole
 from app.schemas.users import Token, UserCreate, User as UserSchema
 
@@ -25,7 +30,8 @@ def login_access_token(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password",
             )
-        if not verify_password(form_data.password, user.hashed_password):
+        verified, new_hash = verify_and_update_password(form_data.password, user.hashed_password)
+        if not verified:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password",
@@ -35,6 +41,11 @@ def login_access_token(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Inactive user",
             )
+        if new_hash:
+            # Hash parameters changed since this password was stored; upgrade it transparently
+            user.hashed_password = new_hash
+            db.commit()
+            deps.invalidate_principal(user.email)
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         return {
             "access_token": create_access_token(
@@ -42,8 +53,8 @@ def login_access_token(
             ),
             "token_type": "bearer",
         }
-    except HTTPException:
-        # Propagate expected auth errors as-is
+    except (HTTPException, HashingBusyError):
+        # Propagate expected auth errors and backpressure as-is
         raise
     except Exception as exc:  # noqa: BLE001
         # Surface the underlying error message to help diagnose 500s
@@ -1,6 +1,7 @@
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 import os
+from typing import Optional
 
 
 # Ensure the backend/.env file is always loaded, regardless of cwd.
@@ -15,13 +16,97 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8  # 8 days
     ALGORITHM: str = "HS256"
-    
-    
+
+    # Authenticated principal cache (app/core/deps.py). Kept short so role
+    # changes made on another worker are picked up quickly.
+    AUTH_CACHE_TTL_SECONDS: int = 30
+    AUTH_CACHE_MAX_ENTRIES: int = 2048
+
+    # Dedicated argon2 executor (app/core/security.py). Requests beyond
+    # workers + queue size are rejected with 503 instead of queueing.
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_SIZE: int = 16
+    PASSWORD_HASH_TIMEOUT_SECONDS: float = 10.0
+
+    # Background jobs (app/workers/jobs.py) and the bulk credential pipeline.
+    JOB_WORKERS: int = 2
+    JOB_RETENTION_SECONDS: int = 60 * 60 * 24
+    BULK_HASH_PROCESSES: int = 0  # 0 = one per CPU core
+    BULK_CREDENTIAL_CHUNK_SIZE: int = 500
+    # POST /imports/{kind}: uploads are spooled to IMPORT_DIR (default: a
+    # directory under the system temp dir) and loaded one transaction per chunk.
+    IMPORT_DIR: str = ""
+    IMPORT_MAX_BYTES: int = 512 * 1024 * 1024
+    IMPORT_CHUNK_SIZE: int = 2000
+
+    # Per-(doctor, date) availability/booking index (app/core/interval_index.py).
+    # The TTL bounds how long bookings made by another worker go unseen.
+    INTERVAL_INDEX_MAX_ENTRIES: int = 4096
+    INTERVAL_INDEX_TTL_SECONDS: int = 60
+
+    # POST /appointments/bulk: rows per request (one multi-row INSERT).
+    BULK_APPOINTMENT_MAX_ITEMS: int = 1000
+
+    # POST /appointments/series: occurrences a recurrence rule may expand to.
+    APPOINTMENT_SERIES_MAX_OCCURRENCES: int = 104
+
+    # GET /appointments/slots: longest date range per search.
+    SLOT_SEARCH_MAX_DAYS: int = 31
+
+    # POST /shifts/generate: longest date range per request.
+    SHIFT_GENERATE_MAX_DAYS: int = 366
+
+    # Shift assignment: maximum active shifts per staff member per ISO week.
+    STAFF_MAX_SHIFTS_PER_WEEK: int = 6
+    # POST /shifts/assign/bulk: pairs per request (one multi-row INSERT).
+    BULK_SHIFT_ASSIGNMENT_MAX_ITEMS: int = 5000
+    # GET /shifts/roster: cached weeks per worker. Shift writes invalidate
+    # their week; the TTL bounds staleness from other workers' writes.
+    ROSTER_CACHE_MAX_WEEKS: int = 104
+    ROSTER_CACHE_TTL_SECONDS: int = 300
+    # GET /shifts/swap/candidates: widest exchange_days window (either side).
+    SWAP_EXCHANGE_MAX_DAYS: int = 14
+
+    # GET /rooms/{room_number}: rooms cached per worker by number. Room
+    # writes update their entry; the TTL bounds staleness across workers.
+    ROOM_CACHE_MAX_ENTRIES: int = 1024
+    ROOM_CACHE_TTL_SECONDS: int = 60
+
+    # Version-counter ETags (rooms, users, availability): longest a worker
+    # keeps answering 304 after another worker changed the table.
+    TABLE_VERSION_MAX_AGE_SECONDS: int = 60
+
+    # Debug mode: adds X-DB-Queries / X-DB-Time headers to every response.
+    DEBUG: bool = False
+    # Log a possible N+1 when one request repeats a statement this often.
+    QUERY_REPEAT_THRESHOLD: int = 5
+
     # First superuser
     FIRST_SUPERUSER_EMAIL: str = "admin@hospital.com"
     FIRST_SUPERUSER_PASSWORD: str = "admin123"
 
+    # Migration runner (app/db/migrations): per-statement lock wait and retries.
+    MIGRATION_LOCK_TIMEOUT_MS: int = 5000
+    MIGRATION_MAX_RETRIES: int = 10
+
     DATABASE_URL: str
+    # Optional explicit URL for the async engine; derived from DATABASE_URL
+    # (postgresql+asyncpg) when unset.
+    ASYNC_DATABASE_URL: Optional[str] = None
+    # Optional read-only replica for GET endpoints and ML feature extraction.
+    DATABASE_READ_URL: Optional[str] = None
+    # After a request commits, the same client reads from the primary for
+    # this long so it sees its own writes despite replica lag. Tracked per
+    # worker process, so it only holds for reads served by the same worker.
+    READ_YOUR_WRITES_SECONDS: int = 5
+
+    # Connection pool, applied to every engine (primary, replica, sync, async).
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_TIMEOUT_SECONDS: int = 30
+    DB_CONNECT_TIMEOUT_SECONDS: int = 10
+    DB_SSLMODE: str = "require"
 
     class Config:
         case_sensitive = True
@@ -1,6 +1,11 @@
-from datetime import datetime, date, time
+from dataclasses import dataclass
+from datetime import datetime, date, time, timedelta
+from typing import Dict, Iterable, Optional
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from app.core import interval_index
+from app.core.config import settings
 from app.models.appointment import Appointment, AppointmentStatus, DoctorAvailability
 # from app.models.room import OTSlot, OTBooking, OTSlotStatus  # Commented out until schema aligned
 from app.models.shift import Shift, StaffShiftAssignment, AssignmentStatus
@@ -17,46 +22,32 @@ def validate_doctor_availability(
     appointment_date: date,
     start_time: time,
     end_time: time,
+    exclude_appointment_id: Optional[int] = None,
 ) -> bool:
     """
     Validates if a doctor is available:
     1. Checks if the time slot is within their working hours (DoctorAvailability).
     2. Checks if they have any overlapping appointments.
     Returns True if available, False otherwise.
+
+    Answered from the in-memory interval index, which loads the doctor's
+    day from the database on a miss. Pass ``exclude_appointment_id`` when
+    moving an appointment so it does not conflict with itself.
     """
-    # 1. Check working hours (simplified: assumes weekly schedule)
-    day_of_week = appointment_date.weekday()  # 0=Monday
-    availability = db.query(DoctorAvailability).filter(
-        DoctorAvailability.doctor_id == doctor_id,
-        DoctorAvailability.day_of_week == day_of_week
-    ).first()
-
-    if not availability:
-        # If no availability defined, assume unavailable or default? 
-        # Requirement says "Availability validation before booking". 
-        # If not defined, let's assume valid for now OR invalid. Safe bet: Invalid if not explicitly available.
-        return False
-    
-    # Check time boundaries (all values are plain times in IST)
-    if start_time < availability.start_time or end_time > availability.end_time:
-        return False
+    doctor_day = interval_index.get_doctor_day(db, doctor_id, appointment_date)
+    return doctor_day.is_free(start_time, end_time, exclude_appointment_id)
+
+
+BOOKING_CONFLICT_CONSTRAINT = "ex_appointments_doctor_no_overlap"
 
-    # 2. Check existing appointments
-    overlap = db.query(Appointment).filter(
-        Appointment.doctor_id == doctor_id,
-        Appointment.appointment_date == appointment_date,
-        Appointment.status == AppointmentStatus.SCHEDULED,
-        or_(
-            and_(Appointment.start_time < end_time, Appointment.start_time >= start_time),
-            and_(Appointment.end_time > start_time, Appointment.end_time <= end_time),
-            and_(Appointment.start_time <= start_time, Appointment.end_time >= end_time),
-        ),
-    ).first()
-
-    if overlap:
-        return False
 
-    return True
+def is_booking_conflict(exc: IntegrityError) -> bool:
+    """True if ``exc`` is the appointments exclusion constraint rejecting a double booking."""
+    orig = exc.orig
+    if getattr(orig, "pgcode", None) != "23P01":  # exclusion_violation
+        return False
+    diag = getattr(orig, "diag", None)
+    return getattr(diag, "constraint_name", BOOKING_CONFLICT_CONSTRAINT) == BOOKING_CONFLICT_CONSTRAINT
 
 
 # NOTE: OT-related validation functions commented out until OT models are fixed
@@ -94,27 +85,62 @@ def validate_doctor_availability(
 #     return True
 
 
-def validate_shift_overlap(
+# Assignments that still occupy the staff member's time
+ACTIVE_ASSIGNMENT_STATUSES = (AssignmentStatus.ASSIGNED, AssignmentStatus.SWAP_REQUESTED)
+
+
+@dataclass(frozen=True)
+class StaffLoad:
+    overlapping: int = 0       # active shifts overlapping the candidate shift
+    shifts_this_week: int = 0  # active shifts in the candidate's ISO week (Mon-Sun)
+
+    @property
+    def over_weekly_cap(self) -> bool:
+        return self.shifts_this_week >= settings.STAFF_MAX_SHIFTS_PER_WEEK
+
+
+def staff_shift_load(
     db: Session,
-    staff_id: int,
-    shift_date: date,
-    start_time: time,
-    end_time: time,
-) -> bool:
-    """Checks if a staff member already has an overlapping shift on the same date."""
-    from app.models.shift import Shift
-    
-    assignments = db.query(StaffShiftAssignment).filter(
-        StaffShiftAssignment.staff_id == staff_id,
-        StaffShiftAssignment.assignment_status.in_([AssignmentStatus.ASSIGNED, AssignmentStatus.SWAPPED]),
+    staff_ids: Iterable[int],
+    start_time: datetime,
+    end_time: datetime,
+) -> Dict[int, StaffLoad]:
+    """
+    Overlap and weekly-capacity counts for several staff members against
+    one candidate shift, in a single indexed query (assignments by
+    staff_id joined to shifts by primary key). Staff without active
+    shifts in range are absent from the result; use ``.get(id, StaffLoad())``.
+    """
+    staff_ids = list(staff_ids)
+    if not staff_ids:
+        return {}
+    week_start = datetime.combine(start_time.date() - timedelta(days=start_time.weekday()), datetime.min.time())
+    week_end = week_start + timedelta(days=7)
+    overlaps = and_(Shift.start_time < end_time, Shift.end_time > start_time)
+    in_week = and_(Shift.start_time >= week_start, Shift.start_time < week_end)
+    rows = db.execute(
+        select(
+            StaffShiftAssignment.staff_id,
+            func.count().filter(overlaps),
+            func.count().filter(in_week),
+        )
+        .join(Shift, Shift.id == StaffShiftAssignment.shift_id)
+        .where(
+            StaffShiftAssignment.staff_id.in_(staff_ids),
+            StaffShiftAssignment.status.in_(ACTIVE_ASSIGNMENT_STATUSES),
+            or_(overlaps, in_week),
+        )
+        .group_by(StaffShiftAssignment.staff_id)
     ).all()
+    return {staff_id: StaffLoad(overlapping, week) for staff_id, overlapping, week in rows}
 
-    for assignment in assignments:
-        # Get shift directly since relationship is commented out
-        shift = db.query(Shift).filter(Shift.id == assignment.shift_id).first()
-        if not shift or shift.shift_date != shift_date:
-            continue
-        if check_time_overlap(start_time, end_time, shift.start_time, shift.end_time):
-            return False
 
-    return True
+def validate_shift_overlap(
+    db: Session,
+    staff_id: int,
+    start_time: datetime,
+    end_time: datetime,
+) -> bool:
+    """Checks if a staff member is free for a shift: no overlapping active shift and under the weekly cap."""
+    load = staff_shift_load(db, [staff_id], start_time, end_time).get(staff_id, StaffLoad())
+    return not load.overlapping and not load.over_weekly_cap
@@ -4,5 +4,17 @@ All code should go through this module, but the actual engine
 configuration lives in app.db.db so there is a single source of truth.
 """
 
-from app.db.db import engine, SessionLocal, Base, get_db  # noqa: F401
+from app.db.db import (  # noqa: F401
+    engine,
+    read_engine,
+    SessionLocal,
+    ReadSessionLocal,
+    Base,
+    get_db,
+    async_engine,
+    async_read_engine,
+    AsyncSessionLocal,
+    AsyncReadSessionLocal,
+    get_async_db,
+)
 
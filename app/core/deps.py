@@ -1,41 +1,162 @@
-from typing import Generator, Optional, List
-from fastapi import Depends, HTTPException, status
+import time
+from typing import AsyncGenerator, Generator, Optional, List
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
-from sqlalchemy.orm import Session
-from app.core.db import SessionLocal
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+from app.core.cache import TTLCache
+from app.core.db import (
+    SessionLocal,
+    ReadSessionLocal,
+    AsyncSessionLocal,
+    AsyncReadSessionLocal,
+    read_engine,
+    engine,
+)
 from app.core.config import settings
 from app.models.users import User, UserRole
 from app.schemas.users import TokenData
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/login/access-token")
 
-def get_db() -> Generator:
+# Decoded bearer tokens (token -> subject). Entries expire with the token
+# itself, so a repeat call with the same token skips signature verification.
+_token_cache = TTLCache("auth_tokens", maxsize=settings.AUTH_CACHE_MAX_ENTRIES)
+
+# Column snapshots of authenticated users keyed by email (the token subject).
+# Invalidated explicitly by the users router; the TTL bounds staleness for
+# changes made by other workers or directly in the database.
+_principal_cache = TTLCache(
+    "auth_principals",
+    maxsize=settings.AUTH_CACHE_MAX_ENTRIES,
+    ttl=settings.AUTH_CACHE_TTL_SECONDS,
+)
+_PRINCIPAL_COLUMNS = [c.key for c in User.__table__.columns]
+
+# Clients (by bearer token, else address) that committed a write recently.
+# Their reads stay on the primary until the entry expires. Per process: see
+# get_db.
+_HAS_REPLICA = read_engine is not engine
+_recent_writers = TTLCache("read_your_writes", maxsize=4096, ttl=settings.READ_YOUR_WRITES_SECONDS)
+_READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def _client_key(request: Request) -> str:
+    return request.headers.get("authorization") or (request.client.host if request.client else "")
+
+
+def _use_replica(request: Request) -> bool:
+    return (
+        _HAS_REPLICA
+        and request.method in _READ_METHODS
+        and _recent_writers.get(_client_key(request)) is None
+    )
+
+
+def get_db(request: Request) -> Generator:
+    """
+    Session for the request: GET/HEAD go to the read replica (if configured),
+    everything else to the primary.
+
+    Read-your-writes is per worker process: a client's reads stay on the
+    primary for READ_YOUR_WRITES_SECONDS after a write only if they land on
+    the worker that served the write. With several workers and no sticky
+    sessions a read may still hit the lagging replica; endpoints whose
+    reads fill a cache or must never be stale use get_primary_db.
+    """
+    db = ReadSessionLocal() if _use_replica(request) else SessionLocal()
+    try:
+        yield db
+    finally:
+        if _HAS_REPLICA and db.info.get("committed_writes"):
+            _recent_writers.set(_client_key(request), True)
+        db.close()
+
+def get_primary_db() -> Generator:
+    """Session on the primary even for GET, e.g. to fill caches that writes invalidate."""
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def get_read_db() -> Generator:
+    """Session on the read replica for read-only work that is not a GET (e.g. ML features)."""
     try:
-        db = SessionLocal()
+        db = ReadSessionLocal()
         yield db
     finally:
         db.close()
 
-def get_current_user(original_token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+async def get_async_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    session_factory = AsyncReadSessionLocal if _use_replica(request) else AsyncSessionLocal
+    async with session_factory() as db:
+        yield db
+
+async def get_primary_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Async session on the primary even for GET, e.g. for bodies tagged with table versions."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def get_current_user(original_token: str = Depends(oauth2_scheme), db: Session = Depends(get_primary_db)) -> User:
+    # The primary, never the replica: a lagging row cached here would keep a
+    # deactivated or demoted user's old access for AUTH_CACHE_TTL_SECONDS.
+    # The session only connects on a cache miss.
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(original_token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-        token_data = TokenData(email=email)
-    except JWTError:
-        raise credentials_exception
-    user = db.query(User).filter(User.email == token_data.email).first()
-    if user is None:
+    email = _decode_token(original_token)
+    if email is None:
         raise credentials_exception
+    token_data = TokenData(email=email)
+
+    snapshot = _principal_cache.get(token_data.email)
+    if snapshot is None:
+        user = db.query(User).filter(User.email == token_data.email).first()
+        if user is None:
+            raise credentials_exception
+        _principal_cache.set(token_data.email, {k: getattr(user, k) for k in _PRINCIPAL_COLUMNS})
+        return user
+
+    # Rebuild a detached instance from the snapshot: it behaves like a row
+    # loaded by another session and never shares state across requests.
+    user = User(**snapshot)
+    make_transient_to_detached(user)
     return user
 
+
+def _decode_token(token: str) -> Optional[str]:
+    """Return the token subject, or None if the token is invalid."""
+    subject = _token_cache.get(token)
+    if subject is not None:
+        return subject
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return None
+    subject = payload.get("sub")
+    if subject is None:
+        return None
+    exp = payload.get("exp")
+    ttl = exp - time.time() if exp is not None else settings.AUTH_CACHE_TTL_SECONDS
+    if ttl > 0:
+        _token_cache.set(token, subject, ttl=ttl)
+    return subject
+
+
+def invalidate_principal(*emails: Optional[str]) -> None:
+    """Drop cached principals after a user row changes."""
+    for email in emails:
+        if email:
+            _principal_cache.pop(email)
+
+
+def invalidate_all_principals() -> None:
+    _principal_cache.clear()
+
 def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
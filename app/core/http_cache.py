@@ -0,0 +1,67 @@
+"""
+Conditional GET support (ETag / If-None-Match).
+
+``conditional_response`` takes an already serialized body, tags it with
+a strong ETag derived from its hash and answers 304 Not Modified, with
+no body, when the client's If-None-Match already names that tag. Polling
+clients then only pay for the query, not for transferring and parsing
+an unchanged payload.
+
+For slowly changing reference data ``versioned_etag`` derives the tag
+from the tables' version counters (app/core/table_versions.py) instead,
+so ``not_modified`` can answer 304 before the handler queries anything.
+
+Responses are marked ``private, no-cache``: per-user data that browsers
+may keep but must revalidate on every use. Hits and misses are counted
+per route in http_conditional_requests_total.
+"""
+
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+
+from app.core import table_versions
+from app.core.metrics import http_conditional_requests_total, route_template
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if If-None-Match lists ``etag`` (weak comparison, as RFC 9110 requires for GET) or is ``*``."""
+    header: Optional[str] = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in tags or etag in tags
+
+
+def _record(request: Request, hit: bool) -> None:
+    http_conditional_requests_total.inc((route_template(request.scope), "hit" if hit else "miss"))
+
+
+def conditional_response(request: Request, body: bytes, media_type: str = "application/json") -> Response:
+    etag = make_etag(body)
+    return not_modified(request, etag) or tagged_response(request, body, etag, media_type)
+
+
+def versioned_etag(request: Request, *tables: str) -> str:
+    """Tag for the current versions of ``tables`` and this URL; take it before reading."""
+    return table_versions.etag(tables, request.url.path, request.url.query)
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """A 304 if the client already holds ``etag``, else None."""
+    if not etag_matches(request, etag):
+        return None
+    _record(request, hit=True)
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+
+def tagged_response(request: Request, body: bytes, etag: str, media_type: str = "application/json") -> Response:
+    _record(request, hit=False)
+    return Response(content=body, media_type=media_type, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
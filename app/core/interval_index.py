@@ -0,0 +1,262 @@
+"""
+In-memory interval index of doctor availability and booked appointments.
+
+One ``DoctorDay`` per (doctor_id, date) holds the doctor's working
+windows for that weekday and the SCHEDULED appointments sorted by start
+time, with a running maximum of end times. An overlap check is then a
+bisect plus a short backwards walk: O(log n) instead of two round trips.
+
+Entries are loaded lazily from the database (the source of truth) on a
+miss, kept current by write-through from the scheduling endpoints, and
+bounded by the shared LRU/TTL cache. Entries are immutable; a write
+builds a new entry and swaps it in, so readers never see a half-updated
+index. The TTL bounds how long another worker's bookings can go unseen.
+
+Each entry also carries a bitmap view at 5-minute resolution, one bit
+per slot of the day in a plain Python int (288 bits): ``hours_bits``
+for slots fully inside working hours, ``IntervalSet.bits`` for slots
+touched by a booking, and ``free_bits`` for the difference. Questions
+over many doctors ("who is free 10:00-10:30", "when are these three all
+free") become integer AND/OR operations (app/scheduling/occupancy.py).
+"""
+
+import threading
+from bisect import bisect_left
+from dataclasses import dataclass
+from datetime import date, time
+from functools import cached_property
+from itertools import accumulate
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.appointment import Appointment, AppointmentStatus, DoctorAvailability
+
+
+BIT_MINUTES = 5
+BITS_PER_DAY = 24 * 60 // BIT_MINUTES
+
+
+def _minutes(t: time) -> int:
+    return t.hour * 60 + t.minute + (1 if t.second or t.microsecond else 0)
+
+
+def _mask(first: int, last: int) -> int:
+    """Bits first..last-1 set."""
+    return ((1 << (last - first)) - 1) << first if last > first else 0
+
+
+def span_bits(start: time, end: time) -> int:
+    """Every 5-minute slot that [start, end) touches."""
+    return _mask(_minutes(start) // BIT_MINUTES, -(-_minutes(end) // BIT_MINUTES))
+
+
+def inner_bits(start: time, end: time) -> int:
+    """Only the 5-minute slots lying entirely inside [start, end)."""
+    return _mask(-(-_minutes(start) // BIT_MINUTES), _minutes(end) // BIT_MINUTES)
+
+
+@dataclass(frozen=True)
+class IntervalSet:
+    """Half-open [start, end) intervals sorted by start, with prefix-max ends."""
+    starts: Tuple[time, ...] = ()
+    ends: Tuple[time, ...] = ()
+    ids: Tuple[int, ...] = ()
+    max_end: Tuple[time, ...] = ()
+
+    @classmethod
+    def build(cls, intervals) -> "IntervalSet":
+        rows = sorted(intervals)
+        if not rows:
+            return cls()
+        starts, ends, ids = zip(*rows)
+        return cls(starts, ends, ids, tuple(accumulate(ends, max)))
+
+    @cached_property
+    def bits(self) -> int:
+        """5-minute slots of the day touched by any interval (time-of-day intervals only)."""
+        bits = 0
+        for start, end in zip(self.starts, self.ends):
+            bits |= span_bits(start, end)
+        return bits
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __iter__(self) -> Iterator[Tuple[time, time, int]]:
+        return iter(zip(self.starts, self.ends, self.ids))
+
+    def overlapping(self, start: time, end: time) -> Iterator[int]:
+        """Ids of intervals overlapping [start, end)."""
+        # Only intervals starting before `end` can overlap; among those,
+        # walk back while the running max end still reaches past `start`.
+        i = bisect_left(self.starts, end) - 1
+        while i >= 0 and self.max_end[i] > start:
+            if self.ends[i] > start:
+                yield self.ids[i]
+            i -= 1
+
+    def overlaps(self, start: time, end: time, exclude_id: Optional[int] = None) -> bool:
+        return any(i != exclude_id for i in self.overlapping(start, end))
+
+    def with_interval(self, start: time, end: time, id_: int) -> "IntervalSet":
+        return IntervalSet.build([*self.without(id_), (start, end, id_)])
+
+    def without(self, id_: int) -> "IntervalSet":
+        if id_ not in self.ids:
+            return self
+        return IntervalSet.build([row for row in self if row[2] != id_])
+
+
+@dataclass(frozen=True)
+class DoctorDay:
+    windows: Tuple[Tuple[time, time], ...]
+    bookings: IntervalSet
+
+    def within_hours(self, start: time, end: time) -> bool:
+        return any(w_start <= start and end <= w_end for w_start, w_end in self.windows)
+
+    def is_free(self, start: time, end: time, exclude_appointment_id: Optional[int] = None) -> bool:
+        return self.within_hours(start, end) and not self.bookings.overlaps(start, end, exclude_appointment_id)
+
+    # Bitmap view; cached on the (immutable) entry, so it is rebuilt only
+    # for the doctor-day a write replaced.
+    @cached_property
+    def hours_bits(self) -> int:
+        bits = 0
+        for start, end in self.windows:
+            bits |= inner_bits(start, end)
+        return bits
+
+    @cached_property
+    def free_bits(self) -> int:
+        return self.hours_bits & ~self.bookings.bits
+
+
+_index = TTLCache(
+    "doctor_day_index",
+    maxsize=settings.INTERVAL_INDEX_MAX_ENTRIES,
+    ttl=settings.INTERVAL_INDEX_TTL_SECONDS,
+)
+# Serializes write-through read-modify-write; readers never take it.
+_write_lock = threading.Lock()
+
+
+def load_doctor_day(db: Session, doctor_id: int, day: date) -> DoctorDay:
+    windows = db.execute(
+        select(DoctorAvailability.start_time, DoctorAvailability.end_time).where(
+            DoctorAvailability.doctor_id == doctor_id,
+            DoctorAvailability.day_of_week == day.weekday(),
+        )
+    ).all()
+    bookings = db.execute(
+        select(Appointment.start_time, Appointment.end_time, Appointment.id).where(
+            Appointment.doctor_id == doctor_id,
+            Appointment.appointment_date == day,
+            Appointment.status == AppointmentStatus.SCHEDULED,
+        )
+    ).all()
+    return DoctorDay(
+        windows=tuple(sorted((w.start_time, w.end_time) for w in windows)),
+        bookings=IntervalSet.build(tuple(b) for b in bookings),
+    )
+
+
+def load_doctor_days(db: Session, keys: Iterable[Tuple[int, date]]) -> Dict[Tuple[int, date], DoctorDay]:
+    """Load many (doctor_id, date) entries in two queries and refresh them in the index."""
+    keys = set(keys)
+    if not keys:
+        return {}
+    doctor_ids = {doctor_id for doctor_id, _ in keys}
+    windows: Dict[Tuple[int, int], list] = {}
+    for row in db.execute(
+        select(DoctorAvailability.doctor_id, DoctorAvailability.day_of_week,
+               DoctorAvailability.start_time, DoctorAvailability.end_time).where(
+            DoctorAvailability.doctor_id.in_(doctor_ids),
+            DoctorAvailability.day_of_week.in_({day.weekday() for _, day in keys}),
+        )
+    ):
+        windows.setdefault((row.doctor_id, row.day_of_week), []).append((row.start_time, row.end_time))
+    bookings: Dict[Tuple[int, date], list] = {}
+    for row in db.execute(
+        select(Appointment.doctor_id, Appointment.appointment_date,
+               Appointment.start_time, Appointment.end_time, Appointment.id).where(
+            tuple_(Appointment.doctor_id, Appointment.appointment_date).in_(list(keys)),
+            Appointment.status == AppointmentStatus.SCHEDULED,
+        )
+    ):
+        bookings.setdefault((row.doctor_id, row.appointment_date), []).append(
+            (row.start_time, row.end_time, row.id)
+        )
+
+    days = {}
+    for doctor_id, day in keys:
+        entry = DoctorDay(
+            windows=tuple(sorted(windows.get((doctor_id, day.weekday()), ()))),
+            bookings=IntervalSet.build(bookings.get((doctor_id, day), ())),
+        )
+        days[(doctor_id, day)] = entry
+        _index.set((doctor_id, day), entry)
+    return days
+
+
+def get_doctor_day(db: Session, doctor_id: int, day: date) -> DoctorDay:
+    return _index.get_or_set((doctor_id, day), lambda: load_doctor_day(db, doctor_id, day))
+
+
+def get_doctor_days(db: Session, keys: Iterable[Tuple[int, date]]) -> Dict[Tuple[int, date], DoctorDay]:
+    """Cached entries for many doctor-days; all misses are loaded together."""
+    days, missing = {}, []
+    for key in keys:
+        entry = _index.get(key)
+        if entry is None:
+            missing.append(key)
+        else:
+            days[key] = entry
+    days.update(load_doctor_days(db, missing))
+    return days
+
+
+def _update(doctor_id: int, day: date, change) -> None:
+    # Write-through only touches entries already cached; a miss will load
+    # the committed state from the database anyway.
+    key = (doctor_id, day)
+    with _write_lock:
+        entry = _index.get(key)
+        if entry is not None:
+            _index.set(key, DoctorDay(entry.windows, change(entry.bookings)))
+
+
+def record_booking(doctor_id: int, day: date, start_time: time, end_time: time, appointment_id: int) -> None:
+    """Reflect a committed SCHEDULED appointment."""
+    _update(doctor_id, day, lambda b: b.with_interval(start_time, end_time, appointment_id))
+
+
+def record_appointment(appointment: Appointment) -> None:
+    """Reflect a committed appointment (new, moved or status-changed)."""
+    if appointment.status == AppointmentStatus.SCHEDULED:
+        record_booking(
+            appointment.doctor_id,
+            appointment.appointment_date,
+            appointment.start_time,
+            appointment.end_time,
+            appointment.id,
+        )
+    else:
+        forget_appointment(appointment.doctor_id, appointment.appointment_date, appointment.id)
+
+
+def forget_appointment(doctor_id: int, day: date, appointment_id: int) -> None:
+    _update(doctor_id, day, lambda b: b.without(appointment_id))
+
+
+def invalidate_day(doctor_id: int, day: date) -> None:
+    _index.pop((doctor_id, day))
+
+
+def invalidate_doctor(doctor_id: int) -> None:
+    """Drop every cached day for a doctor, e.g. after availability changes."""
+    _index.pop_where(lambda key: key[0] == doctor_id)
@@ -0,0 +1,301 @@
+"""
+Low-overhead request, database-pool and ML metrics in Prometheus text format.
+
+Recording is lock-free: every thread writes to its own shard (plain dicts
+and pre-bucketed lists), and shards are only summed when /metrics is
+scraped. The event loop thread, each anyio worker thread and each pool
+thread therefore update their own counters without contention.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.cache import cache_stats
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+Labels = Tuple[str, ...]
+
+_metrics: List["_Metric"] = []
+
+
+class _Shards:
+    """One mutable shard per thread; registration is the only shared write."""
+
+    def __init__(self, factory: Callable[[], dict]):
+        self._factory = factory
+        self._local = threading.local()
+        self._all: List[dict] = []
+
+    def mine(self) -> dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._factory()
+            self._local.shard = shard
+            self._all.append(shard)  # list.append is atomic
+        return shard
+
+    def snapshot(self) -> List[dict]:
+        return list(self._all)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        _metrics.append(self)
+
+    def _fmt_labels(self, labels: Labels, extra: str = "") -> str:
+        parts = [f'{k}="{_escape(v)}"' for k, v in zip(self.labelnames, labels)]
+        if extra:
+            parts.append(extra)
+        return "{" + ",".join(parts) + "}" if parts else ""
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.kind}"
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._shards = _Shards(dict)
+
+    def inc(self, labels: Labels = (), amount: float = 1) -> None:
+        shard = self._shards.mine()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def values(self) -> Dict[Labels, float]:
+        totals: Dict[Labels, float] = {}
+        for shard in self._shards.snapshot():
+            for labels, value in list(shard.items()):
+                totals[labels] = totals.get(labels, 0) + value
+        return totals
+
+    def render(self) -> Iterable[str]:
+        yield from super().render()
+        for labels, value in sorted(self.values().items()):
+            yield f"{self.name}{self._fmt_labels(labels)} {value}"
+
+
+class Gauge(Counter):
+    """Up/down gauge; shards hold deltas, so inc/dec may happen on any thread."""
+    kind = "gauge"
+
+    def dec(self, labels: Labels = (), amount: float = 1) -> None:
+        self.inc(labels, -amount)
+
+
+class CallbackGauge(_Metric):
+    """Gauge whose values are read from a callback at scrape time."""
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str], callback: Callable[[], Dict[Labels, float]]):
+        super().__init__(name, help, labelnames)
+        self._callback = callback
+
+    def render(self) -> Iterable[str]:
+        yield from super().render()
+        for labels, value in sorted(self._callback().items()):
+            yield f"{self.name}{self._fmt_labels(labels)} {value}"
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+        self._shards = _Shards(dict)
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        shard = self._shards.mine()
+        series = shard.get(labels)
+        if series is None:
+            # [per-bucket counts..., +Inf count, sum]
+            series = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    @contextmanager
+    def time(self, labels: Labels = ()):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, labels)
+
+    def render(self) -> Iterable[str]:
+        yield from super().render()
+        merged: Dict[Labels, List[float]] = {}
+        for shard in self._shards.snapshot():
+            for labels, series in list(shard.items()):
+                total = merged.setdefault(labels, [0] * len(series))
+                for i, v in enumerate(series):
+                    total[i] += v
+        for labels, series in sorted(merged.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                bucket_labels = self._fmt_labels(labels, 'le="%s"' % le)
+                yield f"{self.name}_bucket{bucket_labels} {cumulative}"
+            yield f"{self.name}_sum{self._fmt_labels(labels)} {series[-1]}"
+            yield f"{self.name}_count{self._fmt_labels(labels)} {cumulative}"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# ─── Metric definitions ────────────────────────────────────────────
+
+http_requests_total = Counter(
+    "http_requests_total", "HTTP requests by route, method and status.", ["method", "route", "status"]
+)
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route.", ["method", "route"]
+)
+http_response_size_bytes = Histogram(
+    "http_response_size_bytes", "HTTP response body size by route.", ["method", "route"], buckets=SIZE_BUCKETS
+)
+http_requests_in_flight = Gauge("http_requests_in_flight", "HTTP requests currently being served.")
+http_conditional_requests_total = Counter(
+    "http_conditional_requests_total",
+    "ETag-tagged GET responses by route; result=hit is a 304 Not Modified.",
+    ["route", "result"],
+)
+
+db_pool_wait_seconds = Histogram(
+    "db_pool_wait_seconds", "Time spent waiting for a pooled connection.", ["engine"]
+)
+ml_inference_seconds = Histogram(
+    "ml_inference_seconds", "ML feature extraction and prediction time.", ["stage"]
+)
+
+_engines: Dict[str, object] = {}
+
+
+def _pool_values(attr: str) -> Dict[Labels, float]:
+    values = {}
+    for name, engine in list(_engines.items()):
+        pool = engine.pool
+        fn = getattr(pool, attr, None)
+        if fn is not None:
+            values[(name,)] = fn()
+    return values
+
+
+CallbackGauge("db_pool_size", "Configured pool size.", ["engine"], lambda: _pool_values("size"))
+CallbackGauge("db_pool_checked_out", "Connections currently checked out.", ["engine"], lambda: _pool_values("checkedout"))
+CallbackGauge("db_pool_overflow", "Connections open beyond pool_size.", ["engine"], lambda: _pool_values("overflow"))
+
+
+def _cache_values(key: str) -> Dict[Labels, float]:
+    return {(name,): stats[key] for name, stats in cache_stats().items()}
+
+
+CallbackGauge("app_cache_hits", "In-process cache hits since start.", ["cache"], lambda: _cache_values("hits"))
+CallbackGauge("app_cache_misses", "In-process cache misses since start.", ["cache"], lambda: _cache_values("misses"))
+CallbackGauge("app_cache_size", "Entries held by in-process caches.", ["cache"], lambda: _cache_values("size"))
+
+
+def register_engine(name: str, engine) -> None:
+    """Expose pool gauges for an engine (sync or async)."""
+    _engines[name] = getattr(engine, "sync_engine", engine)
+
+
+class _TimedPoolMixin:
+    """Records how long each checkout waits for a pooled connection."""
+
+    metrics_name = "primary"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_pool_wait_seconds.observe(time.perf_counter() - started, (self.metrics_name,))
+
+
+def timed_pool(name: str, asyncio: bool = False) -> type:
+    """A QueuePool subclass labelled ``name`` in db_pool_wait_seconds."""
+    base = AsyncAdaptedQueuePool if asyncio else QueuePool
+    return type(f"Timed{base.__name__}", (_TimedPoolMixin, base), {"metrics_name": name})
+
+
+def render() -> str:
+    lines: List[str] = []
+    for metric in _metrics:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def route_template(scope) -> str:
+    """
+    Full path template of the matched route, e.g. /api/v1/rooms/{room_number}.
+
+    Routes of an included router may only know their own relative path, so
+    the prefix is recovered from the request path: it is whatever precedes
+    the longest suffix the route's own pattern matches.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if template is None:
+        return "unmatched"
+    path = scope["path"]
+    regex = getattr(route, "path_regex", None)
+    if regex is None or regex.match(path):
+        return template
+    for i, char in enumerate(path):
+        if char == "/" and regex.match(path[i:]):
+            return path[:i] + template
+    return template
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware (no BaseHTTPMiddleware task overhead) recording
+    per-route latency, status codes, response sizes and in-flight requests.
+    Routes are labelled by their template, e.g. /api/v1/rooms/{room_number}.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = [500]
+        size = [0]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            elif message["type"] == "http.response.body":
+                size[0] += len(message.get("body", b""))
+            await send(message)
+
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_requests_in_flight.dec()
+            labels = (scope["method"], route_template(scope))
+            http_request_duration_seconds.observe(time.perf_counter() - started, labels)
+            http_response_size_bytes.observe(size[0], labels)
+            http_requests_total.inc(labels + (str(status[0]),))
@@ -0,0 +1,102 @@
+"""
+Keyset (cursor) pagination for list endpoints.
+
+A cursor is an opaque, URL-safe token holding the sort key of the last
+row of the previous page. The next page is fetched with a row comparison
+on that key, e.g. ``WHERE (start_time, id) > (:t, :id) ORDER BY start_time, id``,
+which an index on the same columns answers without scanning skipped rows.
+Rows written while a client pages through are neither repeated nor skipped.
+
+Offset pagination is kept for backward compatibility and uses the same
+stable ordering.
+"""
+
+import base64
+import json
+from datetime import date, datetime, time
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from fastapi import HTTPException
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+MAX_PAGE_SIZE = 500
+
+_DECODERS = {
+    "d": date.fromisoformat,
+    "t": time.fromisoformat,
+    "dt": datetime.fromisoformat,
+}
+
+
+def _encode_value(value: Any) -> Any:
+    # datetime is a subclass of date, so check it first
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, time):
+        return {"t": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and len(value) == 1:
+        (tag, raw), = value.items()
+        return _DECODERS[tag](raw)
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> List[Any]:
+    """Decode a cursor whose values must have exactly ``types``; 400 otherwise."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = [_decode_value(v) for v in json.loads(base64.urlsafe_b64decode(padded))]
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    # Exact types: a tampered cursor must not reach the database as a type
+    # error (bool is an int subclass, datetime a date subclass)
+    if len(values) != len(types) or any(type(v) is not t for v, t in zip(values, types)):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+async def paginate(
+    db: AsyncSession,
+    stmt: Select,
+    order_by: Sequence[InstrumentedAttribute],
+    *,
+    cursor: Optional[str],
+    skip: int,
+    limit: int,
+) -> Union[List[Any], Dict[str, Any]]:
+    """
+    Run ``stmt`` ordered by ``order_by`` (which must end in a unique column).
+
+    With ``cursor=None`` this is classic offset pagination and returns a
+    list. Otherwise (an empty cursor means the first page) it returns
+    ``{"items": [...], "next_cursor": str | None}``.
+    """
+    stmt = stmt.order_by(*order_by)
+    if cursor is None:
+        result = await db.execute(stmt.offset(skip).limit(limit))
+        return result.scalars().all()
+
+    if cursor:
+        types = [col.type.python_type for col in order_by]
+        stmt = stmt.where(tuple_(*order_by) > tuple_(*decode_cursor(cursor, types)))
+    result = await db.execute(stmt.limit(limit + 1))
+    items = result.scalars().all()
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        next_cursor = encode_cursor([getattr(last, col.key) for col in order_by])
+    return {"items": items, "next_cursor": next_cursor}
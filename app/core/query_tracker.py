@@ -0,0 +1,130 @@
+"""
+Per-request SQL statement accounting and N+1 detection.
+
+Cursor-execute events on every Engine (sync, async and replica alike)
+feed whichever ``QueryStats`` is active in the current context. The
+middleware opens one per HTTP request; sync endpoints run in a worker
+thread with a copy of the request context, so their statements land in
+the same stats object. Stats opened inside another (the middleware's
+inside a test's ``assert_max_queries``) also count towards the outer one.
+
+Tests use ``assert_max_queries`` to pin a query budget on a code path:
+
+    with assert_max_queries(3):
+        client.get("/api/v1/shifts/my-shifts", headers=headers)
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_current: ContextVar[Optional["QueryStats"]] = ContextVar("query_stats", default=None)
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    seconds: float = 0.0
+    statements: Dict[str, int] = field(default_factory=dict)
+    parent: Optional["QueryStats"] = field(default=None, repr=False)
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.seconds += elapsed
+        self.statements[statement] = self.statements.get(statement, 0) + 1
+        if self.parent is not None:
+            self.parent.record(statement, elapsed)
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statements executed at least ``threshold`` times (likely N+1)."""
+        return sorted(
+            ((sql, n) for sql, n in self.statements.items() if n >= threshold),
+            key=lambda item: -item[1],
+        )
+
+    def summary(self) -> str:
+        lines = [f"{self.count} queries in {self.seconds * 1000:.1f} ms"]
+        for sql, n in sorted(self.statements.items(), key=lambda item: -item[1]):
+            lines.append(f"  {n:4d}x {' '.join(sql.split())[:200]}")
+        return "\n".join(lines)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = conn.info.get("query_started")
+    if stats is None or not started:
+        return
+    stats.record(statement, time.perf_counter() - started.pop())
+
+
+@contextmanager
+def track() -> Iterator[QueryStats]:
+    stats = QueryStats(parent=_current.get())
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[QueryStats]:
+    """Fail if the block issues more than ``limit`` SQL statements."""
+    with track() as stats:
+        yield stats
+    if stats.count > limit:
+        raise AssertionError(f"Expected at most {limit} queries, got {stats.summary()}")
+
+
+class QueryTrackerMiddleware:
+    """
+    Pure ASGI middleware counting statements and DB time per request.
+
+    Repeated identical statements are logged as a likely N+1. With
+    ``settings.DEBUG`` on, the totals are also returned as X-DB-Queries /
+    X-DB-Time (milliseconds) response headers.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track() as stats:
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start" and settings.DEBUG:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-db-queries", str(stats.count).encode()))
+                    headers.append((b"x-db-time", f"{stats.seconds * 1000:.1f}".encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+
+        repeated = stats.repeated(settings.QUERY_REPEAT_THRESHOLD)
+        if repeated:
+            logger.warning(
+                "Possible N+1 on %s %s: %s",
+                scope["method"], scope["path"],
+                "; ".join(f"{n}x {' '.join(sql.split())[:120]}" for sql, n in repeated),
+            )
@@ -1,5 +1,7 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Any, Union
+from typing import Optional, Any, Union, Callable, Tuple
 from jose import jwt
 from passlib.context import CryptContext
 from app.core.config import settings
@@ -7,16 +9,72 @@ from app.core.config import settings
 pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+class HashingBusyError(Exception):
+    """Raised when the password-hashing executor cannot take more work."""
+
+
+class HashingExecutor:
+    """
+    Dedicated, bounded pool for argon2 work.
+
+    argon2-cffi releases the GIL while hashing, so a thread pool gives real
+    parallelism without pickling. At most ``workers + queue_size`` calls may
+    be running or queued; anything beyond that is rejected immediately with
+    HashingBusyError instead of tying up more request threads.
+    """
+
+    def __init__(self, workers: int, queue_size: int, timeout: float):
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pwhash")
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._timeout = timeout
+
+    def run(self, fn: Callable, *args: Any) -> Any:
+        if not self._slots.acquire(blocking=False):
+            raise HashingBusyError("Password hashing is saturated")
+        try:
+            future = self._pool.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        # The slot is freed when the work finishes, even if the caller gave up.
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self._timeout)
+        except FutureTimeoutError:
+            raise HashingBusyError("Password hashing timed out")
+
+
+hashing_executor = HashingExecutor(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_size=settings.PASSWORD_HASH_QUEUE_SIZE,
+    timeout=settings.PASSWORD_HASH_TIMEOUT_SECONDS,
+)
+
+
+def _verify_and_update(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
     try:
-        return pwd_context.verify(plain_password, hashed_password)
+        return pwd_context.verify_and_update(plain_password, hashed_password)
     except Exception:
-        # If verification fails for any reason, return False
-        return False
+        # If verification fails for any reason, treat it as a mismatch
+        return False, None
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return verify_and_update_password(plain_password, hashed_password)[0]
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password on the hashing executor.
+
+    Returns (verified, new_hash). new_hash is set when the stored hash uses
+    outdated parameters (pwd_context.needs_update) and should be persisted.
+    """
+    return hashing_executor.run(_verify_and_update, plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return hashing_executor.run(pwd_context.hash, password)
 
 
 def create_access_token(subject: Union[str, Any], expires_delta: Optional[timedelta] = None, role: Optional[str] = None) -> str:
@@ -0,0 +1,62 @@
+"""
+Per-table version counters for conditional GETs of reference data.
+
+Every committed write through a SessionLocal session bumps the version of
+the tables it touched: ORM flushes and insert()/update()/delete()
+statements are recorded by the session hooks in app/db/db.py, raw SQL
+must call ``touch``. Versions are bumped after the commit, never at
+flush time, so a read can not tag old rows with the new version.
+
+An ETag built from these versions (plus the query string) can be checked
+before the handler reads anything: if the client already holds it, the
+answer is 304 without a query or serialization. Tags are computed before
+the read, so they can only be older than the body they describe - a
+write racing the read costs one extra full response, never a stale 304.
+That holds only for bodies read on the primary, which the counters
+describe: a lagging replica could serve old rows under a new tag, so
+tagged endpoints use deps.get_primary_db / get_primary_async_db.
+
+Counters are per process. The ETag includes a boot nonce, so a restart
+or another worker never answers 304 for a tag it did not issue, and the
+current epoch of TABLE_VERSION_MAX_AGE_SECONDS, which bounds how long a
+worker keeps confirming a tag after another worker changed the table.
+"""
+
+import hashlib
+import secrets
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+from app.core.config import settings
+
+_BOOT = secrets.token_hex(8)
+_versions: Dict[str, int] = {}
+_lock = threading.Lock()
+
+
+def version(table: str) -> int:
+    return _versions.get(table, 0)
+
+
+def bump(tables: Iterable[str]) -> None:
+    with _lock:
+        for table in tables:
+            _versions[table] = _versions.get(table, 0) + 1
+
+
+def touch(session, *tables: str) -> None:
+    """Record writes the session hooks can not see (raw SQL); bumped on commit."""
+    session.info.setdefault("pending_tables", set()).update(tables)
+
+
+def table_of(statement) -> Optional[str]:
+    """Target table name of an insert/update/delete statement."""
+    table = getattr(statement, "table", None)
+    return getattr(table, "name", None)
+
+
+def etag(tables: Iterable[str], *parts: str) -> str:
+    epoch = int(time.monotonic() // settings.TABLE_VERSION_MAX_AGE_SECONDS)
+    key = ":".join([_BOOT, str(epoch), *(f"{t}={version(t)}" for t in sorted(tables)), *parts])
+    return '"v' + hashlib.blake2b(key.encode(), digest_size=12).hexdigest() + '"'
@@ -1,24 +1,115 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 from app.core.config import settings
+from app.core import table_versions
+from app.core.metrics import register_engine, timed_pool
+
+
+def _pool_kwargs(name: str, asyncio: bool = False) -> dict:
+    return {
+        "poolclass": timed_pool(name, asyncio=asyncio),
+        "pool_pre_ping": True,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+    }
+
+
+def _create_sync_engine(url: str, name: str):
+    sync_engine = create_engine(
+        url,
+        connect_args={"sslmode": settings.DB_SSLMODE, "connect_timeout": settings.DB_CONNECT_TIMEOUT_SECONDS},
+        **_pool_kwargs(name),
+    )
+    register_engine(name, sync_engine)
+    return sync_engine
+
+
+def _async_url(url: str) -> URL:
+    """Derive an asyncpg URL from the sync DATABASE_URL.
+
+    asyncpg takes SSL settings via connect_args, so libpq-only query
+    parameters such as sslmode are dropped from the URL.
+    """
+    sync_url = make_url(url)
+    query = {k: v for k, v in sync_url.query.items() if k not in ("sslmode", "connect_timeout")}
+    return sync_url.set(drivername="postgresql+asyncpg", query=query)
+
+
+def _create_async_engine(url, name: str):
+    ssl = False if settings.DB_SSLMODE == "disable" else settings.DB_SSLMODE
+    async_engine = create_async_engine(
+        url,
+        connect_args={"ssl": ssl, "timeout": settings.DB_CONNECT_TIMEOUT_SECONDS},
+        **_pool_kwargs(name, asyncio=True),
+    )
+    register_engine(name, async_engine)
+    return async_engine
 
 
 # Central SQLAlchemy engine for Supabase Session Pooler.
 # We avoid eager connections here; engine is lazy until first use.
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10,
-    connect_args={"sslmode": "require", "connect_timeout": 10},
-)
+engine = _create_sync_engine(settings.DATABASE_URL, "primary")
+
+# Optional read-only replica. Without DATABASE_READ_URL reads share the
+# primary engine. Pools are sized per engine, so reports and list
+# endpoints no longer compete with bookings for the same connections.
+read_engine = _create_sync_engine(settings.DATABASE_READ_URL, "replica") if settings.DATABASE_READ_URL else engine
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+
+# Async engines for read-heavy endpoints. Async handlers do not occupy an
+# anyio worker thread while waiting on the database, so their concurrency
+# is bounded by the pool rather than by the threadpool size.
+async_engine = _create_async_engine(settings.ASYNC_DATABASE_URL or _async_url(settings.DATABASE_URL), "async_primary")
+async_read_engine = (
+    _create_async_engine(_async_url(settings.DATABASE_READ_URL), "async_replica") if settings.DATABASE_READ_URL else async_engine
+)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+AsyncReadSessionLocal = async_sessionmaker(async_read_engine, class_=AsyncSession, expire_on_commit=False)
 
 Base = declarative_base()
 
 
+# Track whether a primary session committed any writes, so the request
+# layer can keep that client on the primary for a moment (read-your-writes),
+# and which tables they touched, for the version counters behind ETags.
+@event.listens_for(SessionLocal, "after_flush")
+def _mark_flush(session, flush_context):
+    session.info["pending_writes"] = True
+    tables = {obj.__table__.name for obj in (*session.new, *session.dirty, *session.deleted)}
+    session.info.setdefault("pending_tables", set()).update(tables)
+
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _mark_dml(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["pending_writes"] = True
+        table = table_versions.table_of(orm_execute_state.statement)
+        if table:
+            orm_execute_state.session.info.setdefault("pending_tables", set()).add(table)
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _mark_commit(session):
+    if session.info.pop("pending_writes", False):
+        session.info["committed_writes"] = True
+    table_versions.bump(session.info.pop("pending_tables", ()))
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _clear_pending(session):
+    session.info.pop("pending_writes", None)
+    session.info.pop("pending_tables", None)
+
+
 def get_db():
     db = SessionLocal()
     try:
@@ -27,3 +118,6 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,193 @@
+"""
+Versioned schema migrations.
+
+Migrations live in ``app/db/migrations/versions`` as modules named
+``v<NNNN>_<description>.py``. Each one exposes ``upgrade(op)`` and is
+applied at most once; applied versions are recorded in the
+``schema_migrations`` table.
+
+Migrations run on an AUTOCOMMIT connection so indexes can be built with
+``CREATE INDEX CONCURRENTLY`` without blocking writes. Every statement
+runs under a short ``lock_timeout`` and is retried with backoff when it
+cannot get its lock, so a migration never queues behind (and in turn
+blocks) live traffic for long. Steps must therefore be idempotent
+(IF NOT EXISTS and similar), which also makes a partly applied migration
+safe to re-run.
+
+Run: python -m app.db.migrations upgrade | status
+"""
+
+import importlib
+import logging
+import pkgutil
+import time
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Callable, List, Optional, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary constant key so only one migration runner works at a time.
+_ADVISORY_LOCK_KEY = 7_314_522_001
+# lock_not_available, deadlock_detected
+_RETRYABLE_PGCODES = {"55P03", "40P01"}
+
+
+class MigrationError(Exception):
+    """Raised when a migration cannot be applied safely."""
+
+
+@dataclass
+class Migration:
+    version: int
+    name: str
+    module: ModuleType
+
+    @property
+    def description(self) -> str:
+        return (self.module.__doc__ or self.name).strip().splitlines()[0]
+
+
+class Operations:
+    """Helpers handed to each migration's ``upgrade(op)``."""
+
+    def __init__(self, conn: Connection):
+        self.conn = conn
+
+    def execute(self, sql: str, **params) -> None:
+        _with_retry(lambda: self.conn.execute(text(sql), params))
+
+    def scalar(self, sql: str, **params):
+        return self.conn.execute(text(sql), params).scalar()
+
+    def index_exists(self, name: str) -> bool:
+        return bool(self.scalar("SELECT to_regclass(:name) IS NOT NULL", name=name))
+
+    def create_index(
+        self,
+        name: str,
+        table: str,
+        columns: Sequence[str],
+        *,
+        unique: bool = False,
+        where: Optional[str] = None,
+        using: Optional[str] = None,
+    ) -> None:
+        """CREATE [UNIQUE] INDEX CONCURRENTLY IF NOT EXISTS, cleaning up invalid leftovers."""
+        # A failed concurrent build leaves an INVALID index behind; IF NOT
+        # EXISTS would then silently skip it, so drop it and rebuild.
+        invalid = self.scalar(
+            "SELECT NOT i.indisvalid FROM pg_index i "
+            "JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = :name",
+            name=name,
+        )
+        if invalid:
+            logger.warning("Dropping invalid index %s left by an earlier build", name)
+            self.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+        sql = (
+            f"CREATE {'UNIQUE ' if unique else ''}INDEX CONCURRENTLY IF NOT EXISTS {name} "
+            f"ON {table}{f' USING {using}' if using else ''} ({', '.join(columns)})"
+        )
+        if where:
+            sql += f" WHERE {where}"
+        self.execute(sql)
+
+    def constraint_exists(self, table: str, name: str) -> bool:
+        return bool(self.scalar(
+            "SELECT 1 FROM pg_constraint WHERE conname = :name AND conrelid = to_regclass(:table)",
+            name=name, table=table,
+        ))
+
+    def add_unique_constraint_using_index(self, table: str, name: str, index: str) -> None:
+        """Promote an existing unique index to a named constraint (metadata-only)."""
+        if not self.constraint_exists(table, name):
+            self.execute(f"ALTER TABLE {table} ADD CONSTRAINT {name} UNIQUE USING INDEX {index}")
+
+
+def _with_retry(fn: Callable):
+    delay = 0.5
+    for attempt in range(1, settings.MIGRATION_MAX_RETRIES + 1):
+        try:
+            return fn()
+        except DBAPIError as exc:
+            pgcode = getattr(exc.orig, "pgcode", None)
+            if pgcode not in _RETRYABLE_PGCODES or attempt == settings.MIGRATION_MAX_RETRIES:
+                raise
+            logger.warning("Lock not available (attempt %d), retrying in %.1fs", attempt, delay)
+            time.sleep(delay)
+            delay = min(delay * 2, 30)
+
+
+def discover() -> List[Migration]:
+    from app.db.migrations import versions
+
+    migrations = []
+    for info in pkgutil.iter_modules(versions.__path__):
+        if not info.name.startswith("v"):
+            continue
+        version = int(info.name[1:].split("_", 1)[0])
+        module = importlib.import_module(f"{versions.__name__}.{info.name}")
+        migrations.append(Migration(version=version, name=info.name, module=module))
+    migrations.sort(key=lambda m: m.version)
+    if len({m.version for m in migrations}) != len(migrations):
+        raise MigrationError("Duplicate migration version numbers")
+    return migrations
+
+
+def _connect(engine: Engine) -> Connection:
+    conn = engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+    conn.execute(text(f"SET lock_timeout = '{int(settings.MIGRATION_LOCK_TIMEOUT_MS)}ms'"))
+    conn.execute(text("SET statement_timeout = 0"))
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        " version INTEGER PRIMARY KEY,"
+        " name TEXT NOT NULL,"
+        " applied_at TIMESTAMPTZ NOT NULL DEFAULT now())"
+    ))
+    return conn
+
+
+def applied_versions(conn: Connection) -> set:
+    return {row[0] for row in conn.execute(text("SELECT version FROM schema_migrations"))}
+
+
+def upgrade(engine: Optional[Engine] = None, target: Optional[int] = None) -> List[Migration]:
+    """Apply all pending migrations (up to ``target``) in version order."""
+    if engine is None:
+        from app.db.db import engine
+    applied: List[Migration] = []
+    with _connect(engine) as conn:
+        conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": _ADVISORY_LOCK_KEY})
+        try:
+            done = applied_versions(conn)
+            for migration in discover():
+                if migration.version in done or (target is not None and migration.version > target):
+                    continue
+                logger.info("Applying %s", migration.name)
+                started = time.perf_counter()
+                migration.module.upgrade(Operations(conn))
+                conn.execute(
+                    text("INSERT INTO schema_migrations (version, name) VALUES (:v, :n)"),
+                    {"v": migration.version, "n": migration.name},
+                )
+                logger.info("Applied %s in %.1fs", migration.name, time.perf_counter() - started)
+                applied.append(migration)
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _ADVISORY_LOCK_KEY})
+    return applied
+
+
+def status(engine: Optional[Engine] = None) -> List[tuple]:
+    """(migration, is_applied) for every known migration."""
+    if engine is None:
+        from app.db.db import engine
+    with _connect(engine) as conn:
+        done = applied_versions(conn)
+    return [(m, m.version in done) for m in discover()]
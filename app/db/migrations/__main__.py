@@ -0,0 +1,32 @@
+"""
+Command-line entry point for the migration runner.
+
+Run: python -m app.db.migrations upgrade [--target N]
+     python -m app.db.migrations status
+"""
+import argparse
+import logging
+
+from app.db import migrations
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m app.db.migrations")
+    sub = parser.add_subparsers(dest="command", required=True)
+    up = sub.add_parser("upgrade", help="apply pending migrations")
+    up.add_argument("--target", type=int, default=None, help="stop after this version")
+    sub.add_parser("status", help="list migrations and whether they are applied")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    if args.command == "upgrade":
+        applied = migrations.upgrade(target=args.target)
+        print(f"Applied {len(applied)} migration(s)")
+    else:
+        for migration, is_applied in migrations.status():
+            print(f"{'[x]' if is_applied else '[ ]'} {migration.version:04d} {migration.description}")
+
+
+if __name__ == "__main__":
+    main()
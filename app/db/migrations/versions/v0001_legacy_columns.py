@@ -0,0 +1,25 @@
+"""Add doctor_availability.doctor_name and staff_shift_assignments.assignment_date.
+
+Replaces scripts/add_missing_columns.py. The assignment date is derived
+from the shift's start_time (shifts has no separate date column).
+"""
+
+
+def upgrade(op):
+    op.execute("ALTER TABLE doctor_availability ADD COLUMN IF NOT EXISTS doctor_name VARCHAR(100)")
+    op.execute("ALTER TABLE staff_shift_assignments ADD COLUMN IF NOT EXISTS assignment_date DATE")
+
+    op.execute("""
+        UPDATE doctor_availability da
+        SET doctor_name = CONCAT('Dr. ', u.full_name)
+        FROM users u
+        WHERE da.doctor_id = u.id
+          AND da.doctor_name IS NULL
+    """)
+    op.execute("""
+        UPDATE staff_shift_assignments ssa
+        SET assignment_date = CAST(s.start_time AS DATE)
+        FROM shifts s
+        WHERE ssa.shift_id = s.id
+          AND ssa.assignment_date IS NULL
+    """)
@@ -0,0 +1,41 @@
+"""Indexes for conflict detection, assignment lookups and keyset pagination; unique room_number.
+
+- appointments: doctor/date lookups for scheduled bookings
+  (validate_doctor_availability) plus the keyset orders of read_appointments
+- doctor_availability: (doctor_id, day_of_week)
+- staff_shift_assignments: staff_id (read_my_shifts) and shift_id (joins, deletes)
+- shifts: keyset order of list_shifts
+- rooms: room_number becomes a unique constraint
+"""
+from app.db.migrations import MigrationError
+
+
+def upgrade(op):
+    op.create_index(
+        "ix_appointments_doctor_date_scheduled", "appointments",
+        ["doctor_id", "appointment_date", "start_time"],
+        where="status = 'SCHEDULED'",
+    )
+    op.create_index("ix_appointments_date_start_id", "appointments", ["appointment_date", "start_time", "id"])
+    op.create_index(
+        "ix_appointments_doctor_date_start_id", "appointments",
+        ["doctor_id", "appointment_date", "start_time", "id"],
+    )
+    op.create_index(
+        "ix_appointments_status_date_start_id", "appointments",
+        ["status", "appointment_date", "start_time", "id"],
+    )
+    op.create_index("ix_doctor_availability_doctor_day", "doctor_availability", ["doctor_id", "day_of_week"])
+    op.create_index("ix_staff_shift_assignments_staff_id", "staff_shift_assignments", ["staff_id"])
+    op.create_index("ix_staff_shift_assignments_shift_id", "staff_shift_assignments", ["shift_id"])
+    op.create_index("ix_shifts_start_time_id", "shifts", ["start_time", "id"])
+
+    if not op.constraint_exists("rooms", "uq_rooms_room_number"):
+        duplicates = op.scalar(
+            "SELECT string_agg(room_number, ', ') FROM ("
+            " SELECT room_number FROM rooms GROUP BY room_number HAVING count(*) > 1 LIMIT 20) d"
+        )
+        if duplicates:
+            raise MigrationError(f"Duplicate room numbers must be resolved first: {duplicates}")
+        op.create_index("uq_rooms_room_number", "rooms", ["room_number"], unique=True)
+        op.add_unique_constraint_using_index("rooms", "uq_rooms_room_number", "uq_rooms_room_number")
@@ -0,0 +1,35 @@
+"""Exclusion constraint preventing overlapping SCHEDULED appointments per doctor.
+
+- appointments: ex_appointments_doctor_no_overlap, a GiST exclusion over
+  (doctor_id as a single-value int4range, tsrange of the slot); built-in
+  range operator classes only, so no extension is required
+
+Exclusion constraints cannot be built CONCURRENTLY, so adding it holds
+an exclusive lock on appointments while the GiST index is built. Run it
+in a quiet window on large tables. Existing overlaps must be resolved
+first; the migration lists them and stops rather than failing halfway.
+"""
+from app.db.migrations import MigrationError
+
+
+def upgrade(op):
+    if op.constraint_exists("appointments", "ex_appointments_doctor_no_overlap"):
+        return
+
+    overlaps = op.scalar(
+        "SELECT string_agg(a_id || '/' || b_id, ', ') FROM ("
+        " SELECT a.id AS a_id, b.id AS b_id FROM appointments a"
+        " JOIN appointments b ON b.doctor_id = a.doctor_id"
+        "  AND b.appointment_date = a.appointment_date AND b.id > a.id"
+        "  AND b.start_time < a.end_time AND b.end_time > a.start_time"
+        " WHERE a.status = 'SCHEDULED' AND b.status = 'SCHEDULED' LIMIT 20) p"
+    )
+    if overlaps:
+        raise MigrationError(f"Overlapping scheduled appointments must be resolved first: {overlaps}")
+
+    op.execute(
+        "ALTER TABLE appointments ADD CONSTRAINT ex_appointments_doctor_no_overlap "
+        "EXCLUDE USING gist (int4range(doctor_id, doctor_id, '[]') WITH =, "
+        "tsrange(appointment_date + start_time, appointment_date + end_time) WITH &&) "
+        "WHERE (status = 'SCHEDULED')"
+    )
@@ -0,0 +1,28 @@
+"""Recurring appointment series.
+
+- appointment_series: the recurrence rule of each series
+- appointments.series_id: nullable link from each occurrence to its series
+- ix_appointments_series_date (series_id, appointment_date), partial on
+  series members, for set-based reschedule/cancel of a series
+
+Adding a nullable column is metadata-only; the index is built concurrently.
+"""
+
+
+def upgrade(op):
+    op.execute(
+        "CREATE TABLE IF NOT EXISTS appointment_series ("
+        " id SERIAL PRIMARY KEY,"
+        " doctor_id INTEGER NOT NULL REFERENCES users(id),"
+        " patient_id INTEGER NOT NULL,"
+        " rrule VARCHAR(255) NOT NULL,"
+        " starts_on DATE NOT NULL,"
+        " created_at TIMESTAMPTZ DEFAULT now())"
+    )
+    op.execute(
+        "ALTER TABLE appointments ADD COLUMN IF NOT EXISTS series_id INTEGER REFERENCES appointment_series(id)"
+    )
+    op.create_index(
+        "ix_appointments_series_date", "appointments", ["series_id", "appointment_date"],
+        where="series_id IS NOT NULL",
+    )
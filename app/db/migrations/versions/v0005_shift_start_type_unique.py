@@ -0,0 +1,22 @@
+"""Unique (start_time, type) on shifts.
+
+- shifts: uq_shifts_start_time_type, so POST /shifts/generate can skip
+  already generated shifts with ON CONFLICT DO NOTHING
+
+Existing duplicates must be merged first; the migration lists them and stops.
+"""
+from app.db.migrations import MigrationError
+
+
+def upgrade(op):
+    if op.constraint_exists("shifts", "uq_shifts_start_time_type"):
+        return
+
+    duplicates = op.scalar(
+        "SELECT string_agg(type || ' ' || start_time, ', ') FROM ("
+        " SELECT type, start_time FROM shifts GROUP BY type, start_time HAVING count(*) > 1 LIMIT 20) d"
+    )
+    if duplicates:
+        raise MigrationError(f"Duplicate shifts (same type and start time) must be merged first: {duplicates}")
+    op.create_index("uq_shifts_start_time_type", "shifts", ["start_time", "type"], unique=True)
+    op.add_unique_constraint_using_index("shifts", "uq_shifts_start_time_type", "uq_shifts_start_time_type")
@@ -0,0 +1,26 @@
+"""Unique active (staff_id, shift_id) assignment.
+
+- staff_shift_assignments: uq_staff_shift_assignments_active, partial on
+  ASSIGNED / SWAP_REQUESTED rows, so POST /shifts/assign/bulk can skip
+  duplicates with ON CONFLICT DO NOTHING. Swapped and completed rows
+  keep their history.
+
+Existing duplicates must be resolved first; the migration lists them and stops.
+"""
+from app.db.migrations import MigrationError
+
+
+def upgrade(op):
+    if not op.index_exists("uq_staff_shift_assignments_active"):
+        duplicates = op.scalar(
+            "SELECT string_agg(staff_id || '/' || shift_id, ', ') FROM ("
+            " SELECT staff_id, shift_id FROM staff_shift_assignments"
+            " WHERE status IN ('ASSIGNED', 'SWAP_REQUESTED')"
+            " GROUP BY staff_id, shift_id HAVING count(*) > 1 LIMIT 20) d"
+        )
+        if duplicates:
+            raise MigrationError(f"Duplicate active assignments (staff/shift) must be resolved first: {duplicates}")
+    op.create_index(
+        "uq_staff_shift_assignments_active", "staff_shift_assignments", ["staff_id", "shift_id"],
+        unique=True, where="status IN ('ASSIGNED', 'SWAP_REQUESTED')",
+    )
@@ -0,0 +1,42 @@
+"""Ward / floor / type capacity counters.
+
+- room_capacity: rooms and beds (total and active) per (ward_name,
+  floor_number, room_type), kept in step by the rooms router so
+  GET /rooms/capacity reads one row per group instead of every room
+
+The backfill recomputes every group from rooms and overwrites what is
+there (groups without rooms drop to zero). The runner applies it once;
+to repair counters that drifted later (e.g. rooms written by old code
+between the migration and the deploy), run
+scripts/rebuild_room_capacity.py.
+"""
+
+
+def upgrade(op):
+    op.execute(
+        "CREATE TABLE IF NOT EXISTS room_capacity ("
+        " ward_name VARCHAR NOT NULL,"
+        " floor_number INTEGER NOT NULL,"
+        " room_type roomtype NOT NULL,"
+        " rooms INTEGER NOT NULL DEFAULT 0,"
+        " active_rooms INTEGER NOT NULL DEFAULT 0,"
+        " beds INTEGER NOT NULL DEFAULT 0,"
+        " active_beds INTEGER NOT NULL DEFAULT 0,"
+        " PRIMARY KEY (ward_name, floor_number, room_type))"
+    )
+    op.execute(
+        "INSERT INTO room_capacity (ward_name, floor_number, room_type, rooms, active_rooms, beds, active_beds)"
+        " SELECT ward_name, floor_number, room_type, count(*),"
+        "  count(*) FILTER (WHERE is_active),"
+        "  coalesce(sum(bed_capacity), 0),"
+        "  coalesce(sum(bed_capacity) FILTER (WHERE is_active), 0)"
+        " FROM rooms GROUP BY ward_name, floor_number, room_type"
+        " ON CONFLICT (ward_name, floor_number, room_type) DO UPDATE SET"
+        "  rooms = EXCLUDED.rooms, active_rooms = EXCLUDED.active_rooms,"
+        "  beds = EXCLUDED.beds, active_beds = EXCLUDED.active_beds"
+    )
+    op.execute(
+        "UPDATE room_capacity c SET rooms = 0, active_rooms = 0, beds = 0, active_beds = 0"
+        " WHERE NOT EXISTS (SELECT 1 FROM rooms r WHERE r.ward_name = c.ward_name"
+        "  AND r.floor_number = c.floor_number AND r.room_type = c.room_type)"
+    )
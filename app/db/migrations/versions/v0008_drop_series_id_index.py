@@ -0,0 +1,10 @@
+"""Drop ix_appointment_series_id.
+
+v0004 used to create it on appointment_series (id), which the primary
+key index already covers; databases migrated before that was removed
+still have it.
+"""
+
+
+def upgrade(op):
+    op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_appointment_series_id")
@@ -2,6 +2,8 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from app.core import deps
+from app.core.cache import cache_stats
+from app.models.users import User, UserRole
 
 router = APIRouter()
 
@@ -15,3 +17,9 @@ def health_db(db: Session = Depends(deps.get_db)):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Database connection failed: {str(e)}"
         )
+
+
+@router.get("/health/cache")
+def health_cache(current_user: User = Depends(deps.require_role([UserRole.ADMIN]))):
+    """Hit/miss counters for the in-process caches (admin only)."""
+    return cache_stats()
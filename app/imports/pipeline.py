@@ -0,0 +1,167 @@
+"""
+Bulk import pipeline.
+
+An upload is streamed to a temporary file (``receive``), never held in
+memory, and then loaded by a background job (``run``): records are read
+back in chunks of IMPORT_CHUNK_SIZE, validated against the kind's create
+schema and written by the kind's loader (app/imports/targets.py), one
+transaction per chunk, so progress is visible and committed as it goes.
+
+Rejected records - unparseable, invalid, or refused by the loader - are
+written with their line number and reason to a CSV error file that can be
+downloaded until the job expires. A chunk the database refuses as a whole
+is rolled back and all its records rejected; the import carries on. If
+the file itself can not be read any further the job fails, but the
+chunks before stay committed and the error file, ending with the line
+where reading stopped, can still be downloaded.
+"""
+
+import csv
+import json
+import logging
+import os
+import tempfile
+import time
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from fastapi import HTTPException, Request
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.db import SessionLocal
+from app.imports.readers import Record, read
+from app.imports.targets import TARGETS, Reject, Row
+from app.workers.jobs import Job
+
+logger = logging.getLogger(__name__)
+
+
+def import_dir() -> str:
+    path = settings.IMPORT_DIR or os.path.join(tempfile.gettempdir(), "hospital-imports")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def error_file(job_id: str) -> str:
+    return os.path.join(import_dir(), f"{job_id}.errors.csv")
+
+
+def remove_expired() -> None:
+    """Delete error files (and orphaned uploads) older than the jobs that reference them."""
+    cutoff = time.time() - settings.JOB_RETENTION_SECONDS
+    with os.scandir(import_dir()) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+
+
+async def receive(request: Request) -> Tuple[str, int]:
+    """Stream the request body to a temporary file; returns its path and line count."""
+    fd, path = tempfile.mkstemp(prefix="upload-", dir=import_dir())
+    size = lines = 0
+    last = b"\n"
+    try:
+        with os.fdopen(fd, "wb") as f:
+            async for chunk in request.stream():
+                if not chunk:
+                    continue
+                size += len(chunk)
+                if size > settings.IMPORT_MAX_BYTES:
+                    raise HTTPException(
+                        status_code=413, detail=f"Import files are limited to {settings.IMPORT_MAX_BYTES} bytes."
+                    )
+                lines += chunk.count(b"\n")
+                last = chunk[-1:]
+                await run_in_threadpool(f.write, chunk)
+    except BaseException:
+        os.remove(path)
+        raise
+    return path, lines + (last != b"\n")
+
+
+def _chunks(records: Iterable[Record], size: int) -> Iterator[List[Record]]:
+    records = iter(records)
+    while chunk := list(islice(records, size)):
+        yield chunk
+
+
+def _validate(schema, chunk: List[Record]) -> Tuple[List[Row], List[Reject]]:
+    rows: List[Row] = []
+    rejects: List[Reject] = []
+    for record in chunk:
+        if record.error:
+            rejects.append((record.line, record.error))
+            continue
+        try:
+            rows.append((record.line, schema.model_validate(record.data)))
+        except ValidationError as exc:
+            reason = "; ".join(
+                f"{'.'.join(str(part) for part in error['loc']) or 'record'}: {error['msg']}"
+                for error in exc.errors(include_url=False)
+            )
+            rejects.append((record.line, reason))
+    return rows, rejects
+
+
+def _summary(job: Job, kind: str, loaded: int, rejected: int, has_errors: bool) -> Dict:
+    return {
+        "kind": kind,
+        "loaded": loaded,
+        "rejected": rejected,
+        "errors_url": f"{settings.API_V1_STR}/imports/{job.id}/errors" if has_errors else None,
+    }
+
+
+def run(job: Job, kind: str, path: str, fmt: str) -> Dict:
+    """Background job: validate and load every record of the file at ``path``."""
+    target = TARGETS[kind]
+    loaded = rejected = last_read = 0
+
+    def records() -> Iterator[Record]:
+        nonlocal last_read
+        for record in read(path, fmt):
+            last_read = record.line
+            yield record
+
+    db = SessionLocal()
+    try:
+        with open(error_file(job.id), "w", newline="", encoding="utf-8") as errors:
+            writer = csv.writer(errors)
+            writer.writerow(["line", "error", "record"])
+            try:
+                for chunk in _chunks(records(), settings.IMPORT_CHUNK_SIZE):
+                    rows, rejects = _validate(target.schema, chunk)
+                    if rows:
+                        try:
+                            refused, after_commit = target.load(db, rows)
+                            db.commit()
+                        except Exception as exc:  # noqa: BLE001 - includes driver errors from COPY
+                            db.rollback()
+                            logger.exception("Import job %s: chunk at line %d failed", job.id, chunk[0].line)
+                            reason = f"Chunk failed: {exc.__class__.__name__}"
+                            refused, after_commit = [(line, reason) for line, _ in rows], None
+                        if after_commit:
+                            after_commit()
+                        rejects += refused
+
+                    by_line = {record.line: record.data for record in chunk}
+                    for line, reason in sorted(rejects):
+                        writer.writerow([line, reason, json.dumps(by_line[line], default=str)])
+                    loaded += len(chunk) - len(rejects)
+                    rejected += len(rejects)
+                    job.advance(processed=len(chunk) - len(rejects), failed=len(rejects))
+            except Exception as exc:
+                # Earlier chunks are committed: keep their rejects downloadable
+                # and say where the file stopped being read
+                writer.writerow([last_read + 1, f"Import stopped: {exc.__class__.__name__}: {exc}", ""])
+                job.result = _summary(job, kind, loaded, rejected, has_errors=True)
+                raise
+    finally:
+        db.close()
+        os.remove(path)
+
+    if not rejected:
+        os.remove(error_file(job.id))
+    return _summary(job, kind, loaded, rejected, has_errors=bool(rejected))
@@ -0,0 +1,82 @@
+"""
+Streaming record readers for import files.
+
+Both formats are read record by record from the spooled upload on disk,
+so memory stays bounded by one chunk whatever the file size. Every
+record carries the line it ends on, which is how rejects are reported.
+
+CSV needs a header row; empty cells are left out of the record so
+optional fields fall back to their defaults. NDJSON is one JSON object
+per line; blank lines are skipped.
+
+A line that is not valid UTF-8, holds a NUL (which Postgres text can not
+store) or is malformed CSV becomes a record with an error, so it is
+rejected on its own and reading carries on.
+"""
+
+import csv
+import json
+from typing import Iterator, NamedTuple, Optional
+
+
+class Record(NamedTuple):
+    line: int
+    data: dict
+    error: Optional[str] = None  # set when the line itself could not be parsed
+
+
+def _text_error(text: str) -> Optional[str]:
+    # Files are decoded with surrogateescape: undecodable bytes survive as
+    # lone surrogates and are reported here instead of aborting the read
+    if "\x00" in text:
+        return "Contains a NUL character"
+    try:
+        text.encode("utf-8")
+    except UnicodeEncodeError:
+        return "Not valid UTF-8"
+    return None
+
+
+def read_csv(path: str) -> Iterator[Record]:
+    with open(path, newline="", encoding="utf-8-sig", errors="surrogateescape") as f:
+        reader = csv.DictReader(f)
+        while True:
+            try:
+                row = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as exc:
+                # DictReader only updates line_num for rows it returns
+                yield Record(reader.reader.line_num, {}, f"Malformed CSV: {exc}")
+                continue
+            data = {key: value for key, value in row.items() if key is not None and value not in ("", None)}
+            error = _text_error("".join(data.values()))
+            if error is None and None in row:
+                error = f"{len(row[None])} more cells than header columns"
+            yield Record(reader.line_num, data, error)
+
+
+def read_ndjson(path: str) -> Iterator[Record]:
+    with open(path, encoding="utf-8", errors="surrogateescape") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            error = _text_error(line)
+            if error is None and "\\u0000" in line:
+                error = "Contains a NUL character"
+            if error is not None:
+                yield Record(line_no, {"raw": line.rstrip("\n")}, error)
+                continue
+            try:
+                data = json.loads(line)
+            except ValueError as exc:
+                yield Record(line_no, {"raw": line.rstrip("\n")}, f"Invalid JSON: {exc}")
+                continue
+            if isinstance(data, dict):
+                yield Record(line_no, data)
+            else:
+                yield Record(line_no, {"raw": data}, "Expected a JSON object")
+
+
+def read(path: str, fmt: str) -> Iterator[Record]:
+    return read_csv(path) if fmt == "csv" else read_ndjson(path)
@@ -0,0 +1,68 @@
+import os
+from typing import Any, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import FileResponse
+
+from app.core import deps
+from app.imports import pipeline
+from app.models.users import User, UserRole
+from app.schemas.job import Job as JobSchema
+from app.workers.jobs import get_job, submit_job
+
+router = APIRouter()
+
+_CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+
+@router.post("/{kind}", response_model=JobSchema, status_code=202)
+async def start_import(
+    kind: Literal["rooms", "users", "availability", "appointments"],
+    request: Request,
+    format: Optional[Literal["csv", "ndjson"]] = None,
+    current_user: User = Depends(deps.require_role([UserRole.ADMIN])),
+) -> Any:
+    """
+    Bulk-load records from the request body (Admin only): CSV with a
+    header row (Content-Type text/csv) or one JSON object per line
+    (application/x-ndjson); ``format`` overrides the content type.
+
+    Each record is validated like the matching create endpoint. The body
+    is streamed to disk and loaded as a background job; poll /jobs/{id}
+    for progress, and download rejected records with their line number and
+    reason from /imports/{id}/errors.
+    """
+    fmt = format or _CONTENT_TYPES.get(request.headers.get("content-type", "").split(";")[0].strip())
+    if fmt is None:
+        raise HTTPException(status_code=415, detail="Send text/csv or application/x-ndjson, or pass format=csv|ndjson.")
+
+    pipeline.remove_expired()
+    path, lines = await pipeline.receive(request)
+    records = lines - 1 if fmt == "csv" else lines  # header row
+    if records <= 0:
+        os.remove(path)
+        raise HTTPException(status_code=400, detail="The import file has no records.")
+    job = submit_job(f"import_{kind}", pipeline.run, kind, path, fmt, total=records)
+    return job.to_dict()
+
+
+@router.get("/{job_id}/errors")
+def download_import_errors(
+    job_id: str,
+    current_user: User = Depends(deps.require_role([UserRole.ADMIN])),
+) -> Any:
+    """
+    Rejected records of an import as CSV: line, error, record (Admin only).
+    Also served for a failed import, up to the line where it stopped.
+    """
+    job = get_job(job_id)
+    path = pipeline.error_file(job_id)
+    finished = job is not None and job.status in ("succeeded", "failed")
+    if not finished or not job.kind.startswith("import_") or not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="No error file for this import")
+    return FileResponse(path, media_type="text/csv", filename=f"{job.kind}-{job_id}-errors.csv")
@@ -0,0 +1,162 @@
+"""
+What each import kind validates against and how a validated chunk is written.
+
+Every loader gets the chunk's (line, item) rows, writes what it can
+inside the caller's transaction and returns the rejected lines with a
+reason, plus an optional callback for in-process caches to run once the
+chunk is committed:
+
+  rooms         multi-row INSERT ... ON CONFLICT on room_number; the
+                capacity counters get the inserted rooms in one upsert
+  users         passwords hashed in parallel, then multi-row INSERT ...
+                ON CONFLICT on email
+  availability  COPY FROM STDIN; rows only reference doctors, checked
+                with one query first, so nothing can make COPY fail
+  appointments  the bulk booking sweep (working hours, existing bookings,
+                the rest of the chunk) and its multi-row INSERT
+"""
+
+import csv
+import io
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core import interval_index, table_versions
+from app.models.room import Room
+from app.models.users import User, UserRole
+from app.rooms import capacity
+from app.schemas.appointment import AppointmentCreate, AvailabilityCreate
+from app.schemas.room import RoomCreate
+from app.schemas.users import UserCreate
+from app.scheduling import bulk
+from app.users.credentials import hash_passwords
+
+Row = Tuple[int, BaseModel]  # (line in the file, validated item)
+Reject = Tuple[int, str]  # (line, reason)
+Loaded = Tuple[List[Reject], Optional[Callable[[], None]]]
+
+DUPLICATE_ROOM_DETAIL = "Room number already exists."
+ROOM_TYPE_REQUIRED_DETAIL = "room_type is required."
+DUPLICATE_EMAIL_DETAIL = "Email already exists."
+DOCTOR_NOT_FOUND_DETAIL = "Doctor not found."
+INVALID_DAY_DETAIL = "day_of_week must be 0 (Monday) to 6 (Sunday)."
+INVALID_HOURS_DETAIL = "end_time must be after start_time."
+
+
+@dataclass(frozen=True)
+class Target:
+    schema: Type[BaseModel]
+    load: Callable[[Session, List[Row]], Loaded]
+
+
+def _first_wins(rows: List[Row], key: Callable[[BaseModel], object], inserted: set, detail: str) -> List[Reject]:
+    """
+    Rows ON CONFLICT DO NOTHING skipped: keys that already existed, and
+    repeats within the chunk (only the first row of a key was inserted).
+    """
+    rejects, seen = [], set()
+    for line, item in rows:
+        value = key(item)
+        if value not in inserted or value in seen:
+            rejects.append((line, detail))
+        seen.add(value)
+    return rejects
+
+
+def load_rooms(db: Session, rows: List[Row]) -> Loaded:
+    rejects = [(line, ROOM_TYPE_REQUIRED_DETAIL) for line, item in rows if item.room_type is None]
+    rows = [(line, item) for line, item in rows if item.room_type is not None]
+    if not rows:
+        return rejects, None
+    inserted = db.execute(
+        insert(Room)
+        .values([item.model_dump() for _, item in rows])
+        .on_conflict_do_nothing(constraint="uq_rooms_room_number")
+        .returning(Room.room_number, Room.ward_name, Room.floor_number, Room.room_type,
+                   Room.bed_capacity, Room.is_active)
+    ).all()
+    capacity.add(db, [capacity.state(room) for room in inserted])
+    inserted_numbers = {room.room_number for room in inserted}
+    return rejects + _first_wins(rows, lambda item: item.room_number, inserted_numbers, DUPLICATE_ROOM_DETAIL), None
+
+
+def load_users(db: Session, rows: List[Row]) -> Loaded:
+    hashes = hash_passwords([item.password for _, item in rows])
+    inserted = db.scalars(
+        insert(User)
+        .values([
+            {
+                "email": item.email,
+                "hashed_password": hashed,
+                "full_name": item.full_name,
+                "role": item.role,
+                "is_active": item.is_active if item.is_active is not None else True,
+            }
+            for (_, item), hashed in zip(rows, hashes)
+        ])
+        .on_conflict_do_nothing(index_elements=[User.email])
+        .returning(User.email)
+    ).all()
+    return _first_wins(rows, lambda item: item.email, set(inserted), DUPLICATE_EMAIL_DETAIL), None
+
+
+_AVAILABILITY_COLUMNS = ("doctor_id", "day_of_week", "start_time", "end_time")
+
+
+def load_availability(db: Session, rows: List[Row]) -> Loaded:
+    doctors = set(db.scalars(
+        select(User.id).where(User.id.in_({item.doctor_id for _, item in rows}), User.role == UserRole.DOCTOR)
+    ))
+    rejects: List[Reject] = []
+    written = set()
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for line, item in rows:
+        if item.doctor_id not in doctors:
+            rejects.append((line, DOCTOR_NOT_FOUND_DETAIL))
+        elif not 0 <= item.day_of_week <= 6:
+            rejects.append((line, INVALID_DAY_DETAIL))
+        elif item.end_time <= item.start_time:
+            rejects.append((line, INVALID_HOURS_DETAIL))
+        else:
+            writer.writerow([getattr(item, column) for column in _AVAILABILITY_COLUMNS])
+            written.add(item.doctor_id)
+    if buffer.tell():
+        buffer.seek(0)
+        with db.connection().connection.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY doctor_availability ({', '.join(_AVAILABILITY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)", buffer
+            )
+        table_versions.touch(db, "doctor_availability")  # COPY bypasses the session hooks
+
+    def after_commit() -> None:
+        for doctor_id in written:
+            interval_index.invalidate_doctor(doctor_id)
+
+    return rejects, after_commit
+
+
+def load_appointments(db: Session, rows: List[Row]) -> Loaded:
+    days = interval_index.load_doctor_days(db, {(item.doctor_id, item.appointment_date) for _, item in rows})
+    accepted, conflicts = bulk.sweep(rows, days)
+    created, lost = bulk.insert_rows(db, accepted)
+    booked = [(a.doctor_id, a.appointment_date, a.start_time, a.end_time, a.id) for _, a in created]
+
+    def after_commit() -> None:
+        for booking in booked:
+            interval_index.record_booking(*booking)
+
+    return [(r["index"], r["reason"]) for r in conflicts + lost], after_commit
+
+
+TARGETS: Dict[str, Target] = {
+    "rooms": Target(RoomCreate, load_rooms),
+    "users": Target(UserCreate, load_users),
+    "availability": Target(AvailabilityCreate, load_availability),
+    "appointments": Target(AppointmentCreate, load_appointments),
+}
@@ -1,6 +1,10 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from app.core.config import settings
+from app.core.security import HashingBusyError
+from app.core import metrics
+from app.core.query_tracker import QueryTrackerMiddleware
 from app.core.db import engine, Base
 import app.models  # noqa: F401 — ensure all models are registered with Base
 from app.auth import router as auth_router
@@ -9,6 +13,8 @@ from app.rooms import router as rooms_router
 from app.shifts import router as shifts_router
 from app.users import router as users_router
 from app.ml import router as ml_router
+from app.workers import router as jobs_router
+from app.imports import router as imports_router
 
 # NOTE:
 # For Supabase/managed Postgres in production, we avoid calling
@@ -32,6 +38,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(QueryTrackerMiddleware)
+# Added last so it wraps everything else and times the full request
+app.add_middleware(metrics.MetricsMiddleware)
+
+
+
+@app.exception_handler(HashingBusyError)
+def hashing_busy_handler(request: Request, exc: HashingBusyError) -> JSONResponse:
+    # Password hashing is saturated: shed load quickly so CRUD traffic keeps flowing
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Authentication service busy, please retry shortly."},
+        headers={"Retry-After": "1"},
+    )
+
 # All routers mounted under /api/v1
 app.include_router(auth_router.router, prefix=settings.API_V1_STR, tags=["auth"])
 app.include_router(users_router.router, prefix=f"{settings.API_V1_STR}/users", tags=["users"])
@@ -39,6 +60,8 @@ app.include_router(scheduling_router.router, prefix=f"{settings.API_V1_STR}/appo
 app.include_router(rooms_router.router, prefix=f"{settings.API_V1_STR}/rooms", tags=["rooms"])
 app.include_router(shifts_router.router, prefix=f"{settings.API_V1_STR}/shifts", tags=["shifts"])
 app.include_router(ml_router.router, prefix=f"{settings.API_V1_STR}/ml", tags=["ml"])
+app.include_router(jobs_router.router, prefix=f"{settings.API_V1_STR}/jobs", tags=["jobs"])
+app.include_router(imports_router.router, prefix=f"{settings.API_V1_STR}/imports", tags=["imports"])
 from app.health import router as health_router
 app.include_router(health_router.router, prefix=settings.API_V1_STR, tags=["health"])
 
@@ -51,3 +74,8 @@ def read_root() -> dict[str, str]:
 @app.get("/health")
 def health() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def prometheus_metrics() -> PlainTextResponse:
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
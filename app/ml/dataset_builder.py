@@ -2,14 +2,15 @@
 
 from sqlalchemy.orm import Session
 from sqlalchemy import func, extract, case
-from app.core.db import SessionLocal
+from app.core.db import ReadSessionLocal
 from app.models.appointment import Appointment
 from app.models.users import User
 import pandas as pd
 
 
 def build_ml_dataset() -> pd.DataFrame:
-    db: Session = SessionLocal()
+    # Read-only aggregate: run it on the replica when one is configured
+    db: Session = ReadSessionLocal()
 
     query = (
         db.query(
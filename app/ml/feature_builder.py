@@ -13,7 +13,12 @@ from app.models.shift import StaffShiftAssignment
 
 
 class FeatureBuilder:
-    """Extract ML features from database for a given date and hour."""
+    """
+    Extract ML features from database for a given date and hour.
+
+    All queries are read-only; callers should pass a read-replica session
+    (deps.get_read_db / ReadSessionLocal).
+    """
     
     def __init__(self, db: Session):
         self.db = db
@@ -2,6 +2,7 @@
 
 import joblib
 import pandas as pd
+from app.core.metrics import ml_inference_seconds
 from app.ml.preprocessing import preprocess_dataset
 
 MODEL_PATH = "app/ml/best_model.pkl"
@@ -14,7 +15,8 @@ class ForecastService:
 
     def predict(self, df: pd.DataFrame):
 
-        df = preprocess_dataset(df)
+        with ml_inference_seconds.time(("preprocess",)):
+            df = preprocess_dataset(df)
 
         features = [
             "hour",
@@ -26,6 +28,7 @@ class ForecastService:
             "emergency_count",
         ]
 
-        prediction = self.model.predict(df[features])
+        with ml_inference_seconds.time(("predict",)):
+            prediction = self.model.predict(df[features])
 
         return prediction.tolist()
\ No newline at end of file
@@ -13,6 +13,7 @@ from app.models.users import User, UserRole
 from app.models.appointment import Appointment, DoctorAvailability
 from app.models.room import Room
 from app.models.shift import Shift, StaffShiftAssignment, AssignmentStatus, ShiftName
+from app.rooms import capacity
 
 
 # Realistic data pools
@@ -179,6 +180,8 @@ def seed_rooms(db):
     ]
     
     db.add_all(rooms)
+    db.flush()
+    capacity.rebuild(db)
     db.commit()
     
     print(f"  ✓ Created {len(rooms)} rooms\n")
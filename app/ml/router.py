@@ -10,6 +10,7 @@ from app.models.users import User, UserRole
 from app.schemas import ml as schemas
 from app.ml.forecast_service import ForecastService
 from app.ml.feature_builder import FeatureBuilder
+from app.core.metrics import ml_inference_seconds
 
 router = APIRouter()
 
@@ -40,7 +41,7 @@ def get_forecast_service() -> ForecastService:
 def predict_demand(
     *,
     request: schemas.ForecastRequest,
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_read_db),
     current_user: User = Depends(deps.require_role([UserRole.ADMIN, UserRole.HR, UserRole.DOCTOR, UserRole.STAFF])),
 ) -> Any:
     """
@@ -56,7 +57,8 @@ def predict_demand(
     feature_builder = FeatureBuilder(db)
     
     try:
-        features = feature_builder.build_features(request.date, request.hour)
+        with ml_inference_seconds.time(("features",)):
+            features = feature_builder.build_features(request.date, request.hour)
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -95,7 +97,7 @@ def predict_demand(
 def optimize_shift(
     *,
     request: schemas.ShiftOptimizeRequest,
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_read_db),
     current_user: User = Depends(deps.require_role([UserRole.ADMIN, UserRole.HR, UserRole.DOCTOR, UserRole.STAFF])),
 ) -> Any:
     """
@@ -112,7 +114,8 @@ def optimize_shift(
     feature_builder = FeatureBuilder(db)
     
     try:
-        features = feature_builder.build_features(request.date, request.hour)
+        with ml_inference_seconds.time(("features",)):
+            features = feature_builder.build_features(request.date, request.hour)
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, DateTime, Date, Time, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, DateTime, Date, Time, ForeignKey, Enum, Index, literal
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from app.core.db import Base
 import enum
 
@@ -25,6 +26,18 @@ class AppointmentType(str, enum.Enum):
     EMERGENCY = "Emergency"
 
 
+class AppointmentSeries(Base):
+    """A recurring booking: the rule its occurrences (appointments.series_id) were expanded from."""
+    __tablename__ = "appointment_series"
+
+    id = Column(Integer, primary_key=True)
+    doctor_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    patient_id = Column(Integer, nullable=False)
+    rrule = Column(String(255), nullable=False)  # RFC 5545 RRULE, e.g. FREQ=WEEKLY;COUNT=12
+    starts_on = Column(Date, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
 class Appointment(Base):
     __tablename__ = "appointments"
 
@@ -46,11 +59,46 @@ class Appointment(Base):
     status = Column(Enum(AppointmentStatus), default=AppointmentStatus.SCHEDULED, nullable=False)
     reason_for_visit = Column(String(255), nullable=False)
     notes = Column(String, nullable=True)
+    series_id = Column(Integer, ForeignKey("appointment_series.id"), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     doctor = relationship("User", backref="appointments")
 
+    # Composite indexes matching the keyset order (appointment_date, start_time, id)
+    # used by read_appointments, with and without its doctor/status filters, plus
+    # the scheduled-only lookup used by conflict detection.
+    # Applied to existing databases by migrations v0002.
+    #
+    # The exclusion constraint makes double booking impossible: no two
+    # SCHEDULED appointments of a doctor may have overlapping time ranges.
+    # doctor_id is compared as a single-value int4range so the built-in
+    # GiST range operator class covers both columns (no btree_gist needed).
+    # Violations raise SQLSTATE 23P01 (see conflict_detection.is_booking_conflict).
+    # Applied to existing databases by migrations v0003.
+    #
+    # Series occurrences are looked up by (series_id, appointment_date); v0004.
+    __table_args__ = (
+        ExcludeConstraint(
+            (func.int4range(doctor_id, doctor_id, literal("[]", literal_execute=True)), "="),
+            (func.tsrange(appointment_date + start_time, appointment_date + end_time), "&&"),
+            name="ex_appointments_doctor_no_overlap",
+            using="gist",
+            where=text("status = 'SCHEDULED'"),
+        ),
+        Index(
+            "ix_appointments_doctor_date_scheduled", "doctor_id", "appointment_date", "start_time",
+            postgresql_where=text("status = 'SCHEDULED'"),
+        ),
+        Index("ix_appointments_date_start_id", "appointment_date", "start_time", "id"),
+        Index("ix_appointments_doctor_date_start_id", "doctor_id", "appointment_date", "start_time", "id"),
+        Index("ix_appointments_status_date_start_id", "status", "appointment_date", "start_time", "id"),
+        Index(
+            "ix_appointments_series_date", "series_id", "appointment_date",
+            postgresql_where=text("series_id IS NOT NULL"),
+        ),
+    )
+
 
 class DoctorAvailability(Base):
     __tablename__ = "doctor_availability"
@@ -64,3 +112,7 @@ class DoctorAvailability(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     doctor = relationship("User", backref="availabilities")
+
+    __table_args__ = (
+        Index("ix_doctor_availability_doctor_day", "doctor_id", "day_of_week"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Date, Time, ForeignKey, Enum, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Date, Time, ForeignKey, Enum, Boolean, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.db import Base
@@ -25,6 +25,24 @@ class Room(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    # room_number is the business identifier used in URLs (migration v0002)
+    __table_args__ = (
+        UniqueConstraint("room_number", name="uq_rooms_room_number"),
+    )
+
+
+class RoomCapacity(Base):
+    """Room and bed totals per (ward, floor, type), maintained with every room write (migration v0007)."""
+    __tablename__ = "room_capacity"
+
+    ward_name = Column(String, primary_key=True)
+    floor_number = Column(Integer, primary_key=True)
+    room_type = Column(Enum(RoomType), primary_key=True)
+    rooms = Column(Integer, nullable=False, default=0)
+    active_rooms = Column(Integer, nullable=False, default=0)
+    beds = Column(Integer, nullable=False, default=0)
+    active_beds = Column(Integer, nullable=False, default=0)
+
 
 # NOTE: OTSlot and OTBooking models are commented out because they don't match the database schema
 # Uncomment and fix these models once the database schema is aligned
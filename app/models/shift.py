@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, String, DateTime, Date, Time, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, DateTime, Date, Time, ForeignKey, Enum, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from app.core.db import Base
 import enum
 
@@ -29,6 +29,13 @@ class Shift(Base):
     # Relationships commented out to avoid loading non-existent columns
     # assignments = relationship("StaffShiftAssignment", back_populates="shift")
 
+    # Keyset order used by list_shifts. One shift per type and start time
+    # makes roster generation idempotent (migrations v0005).
+    __table_args__ = (
+        Index("ix_shifts_start_time_id", "start_time", "id"),
+        UniqueConstraint("start_time", "type", name="uq_shifts_start_time_type"),
+    )
+
 
 class AssignmentStatus(str, enum.Enum):
     """Match the database enum 'shiftassignmentstatus' exactly."""
@@ -42,8 +49,8 @@ class StaffShiftAssignment(Base):
     __tablename__ = "staff_shift_assignments"
 
     id = Column(Integer, primary_key=True, index=True)
-    staff_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    shift_id = Column(Integer, ForeignKey("shifts.id", ondelete="CASCADE"), nullable=False)
+    staff_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    shift_id = Column(Integer, ForeignKey("shifts.id", ondelete="CASCADE"), nullable=False, index=True)
     status = Column(Enum(AssignmentStatus, name='shiftassignmentstatus'), default=AssignmentStatus.ASSIGNED, nullable=True)
     target_staff_id = Column(Integer, nullable=True)  # Actual column name in DB (not swap_requested_to)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -53,3 +60,18 @@ class StaffShiftAssignment(Base):
     # staff = relationship("User", foreign_keys=[staff_id])
     # swap_target = relationship("User", foreign_keys=[target_staff_id])
     # shift = relationship("Shift", back_populates="assignments")
+    # Read-only link for joined reads (read_my_shifts loads it with
+    # contains_eager); never lazy-loaded, so it cannot cause N+1 queries.
+    shift = relationship("Shift", viewonly=True, lazy="raise")
+
+    # A staff member holds a shift at most once while the assignment is
+    # active, so bulk assignment can skip duplicates with ON CONFLICT
+    # (migrations v0006).
+    __table_args__ = (
+        Index(
+            "uq_staff_shift_assignments_active", "staff_id", "shift_id",
+            unique=True,
+            postgresql_where=text("status IN ('ASSIGNED', 'SWAP_REQUESTED')"),
+            sqlite_where=text("status IN ('ASSIGNED', 'SWAP_REQUESTED')"),
+        ),
+    )
@@ -0,0 +1,47 @@
+"""
+Cache of rooms by room number.
+
+get_room and the write endpoints look rooms up by their business key on
+every call. Entries are pydantic snapshots, written through by the
+rooms router after each commit (a rename moves the entry) and dropped on
+delete. Entries are per worker; the TTL bounds how long another
+worker's writes go unseen. Misses must be loaded on the primary: a
+replica row from before a write would be kept for the whole TTL.
+"""
+
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.room import Room
+from app.schemas.room import Room as RoomOut
+
+_rooms = TTLCache(
+    "rooms_by_number",
+    maxsize=settings.ROOM_CACHE_MAX_ENTRIES,
+    ttl=settings.ROOM_CACHE_TTL_SECONDS,
+)
+
+
+def get_room(db: Session, room_number: str) -> Optional[RoomOut]:
+    room = _rooms.get(room_number)
+    if room is None:
+        row = db.scalar(select(Room).where(Room.room_number == room_number))
+        if row is None:
+            return None
+        room = RoomOut.model_validate(row)
+        _rooms.set(room_number, room)
+    return room
+
+
+def remember(room: RoomOut, previous_number: Optional[str] = None) -> None:
+    if previous_number is not None and previous_number != room.room_number:
+        _rooms.pop(previous_number)
+    _rooms.set(room.room_number, room)
+
+
+def forget(room_number: str) -> None:
+    _rooms.pop(room_number)
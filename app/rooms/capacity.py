@@ -0,0 +1,105 @@
+"""
+Ward / floor / type capacity counters.
+
+room_capacity holds, per (ward_name, floor_number, room_type), the number
+of rooms and beds, in total and active only. Every room write applies
+its delta in the same transaction with one INSERT ... ON CONFLICT DO
+UPDATE that adds to the existing counters, so concurrent writes to one
+ward never lose an update and the dashboard reads one row per group
+instead of every room.
+
+``rebuild`` recomputes the table from rooms, for bulk loads that bypass
+the router (the seeder) or to repair drift
+(scripts/rebuild_room_capacity.py).
+"""
+
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Integer, cast, delete, func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.room import Room, RoomCapacity, RoomType
+
+# (ward_name, floor_number, room_type, bed_capacity, is_active)
+RoomState = Tuple[str, int, RoomType, int, bool]
+
+GROUP_COLUMNS = {
+    "ward": RoomCapacity.ward_name,
+    "floor": RoomCapacity.floor_number,
+    "type": RoomCapacity.room_type,
+}
+COUNTERS = ("rooms", "active_rooms", "beds", "active_beds")
+
+
+def state(room) -> RoomState:
+    """The fields of a room (ORM instance or row) that the counters depend on."""
+    room_type = room.room_type if isinstance(room.room_type, RoomType) else RoomType[room.room_type]
+    return (room.ward_name, room.floor_number, room_type, room.bed_capacity, bool(room.is_active))
+
+
+def apply(db: Session, before: Optional[RoomState] = None, after: Optional[RoomState] = None) -> None:
+    """Move one room's contribution from ``before`` to ``after`` (None = absent); does not commit."""
+    _upsert(db, [(before, -1), (after, 1)])
+
+
+def add(db: Session, rooms: Iterable[RoomState]) -> None:
+    """Count many new rooms with one statement (bulk import); does not commit."""
+    _upsert(db, [(room, 1) for room in rooms])
+
+
+def _upsert(db: Session, changes: Iterable[Tuple[Optional[RoomState], int]]) -> None:
+    deltas: Dict[tuple, List[int]] = defaultdict(lambda: [0, 0, 0, 0])
+    for room, sign in changes:
+        if room is None:
+            continue
+        ward_name, floor_number, room_type, beds, active = room
+        delta = deltas[(ward_name, floor_number, room_type)]
+        delta[0] += sign
+        delta[1] += sign * active
+        delta[2] += sign * beds
+        delta[3] += sign * beds * active
+    rows = [
+        {"ward_name": w, "floor_number": f, "room_type": t, **dict(zip(COUNTERS, delta))}
+        for (w, f, t), delta in deltas.items()
+        if any(delta)
+    ]
+    if not rows:
+        return
+    stmt = insert(RoomCapacity).values(rows)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[RoomCapacity.ward_name, RoomCapacity.floor_number, RoomCapacity.room_type],
+        set_={name: getattr(RoomCapacity, name) + getattr(stmt.excluded, name) for name in COUNTERS},
+    ))
+
+
+def totals(db: Session, group_by: Iterable[str]) -> List[dict]:
+    """Counters summed over the requested dimensions (any of ward, floor, type), groups with rooms only."""
+    keys = [GROUP_COLUMNS[name] for name in group_by]
+    sums = [func.sum(getattr(RoomCapacity, name)).label(name) for name in COUNTERS]
+    stmt = (
+        select(*keys, *sums)
+        .group_by(*keys)
+        .having(func.sum(RoomCapacity.rooms) > 0)
+        .order_by(*keys)
+    )
+    return [dict(row._mapping) for row in db.execute(stmt)]
+
+
+def rebuild(db: Session) -> None:
+    """Recompute every counter from rooms; does not commit."""
+    # Room writes in flight finish first, later ones wait and add their delta
+    # on top of the recomputed counters
+    db.execute(text("LOCK TABLE room_capacity IN EXCLUSIVE MODE"))
+    db.execute(delete(RoomCapacity))
+    active = cast(Room.is_active, Integer)
+    db.execute(
+        insert(RoomCapacity).from_select(
+            ["ward_name", "floor_number", "room_type", *COUNTERS],
+            select(
+                Room.ward_name, Room.floor_number, Room.room_type,
+                func.count(), func.sum(active), func.sum(Room.bed_capacity), func.sum(Room.bed_capacity * active),
+            ).group_by(Room.ward_name, Room.floor_number, Room.room_type),
+        )
+    )
@@ -1,18 +1,32 @@
-from typing import List, Any
+from typing import List, Any, Literal, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from pydantic import TypeAdapter
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core import deps
+from app.core.http_cache import not_modified, tagged_response, versioned_etag
+from app.core.pagination import MAX_PAGE_SIZE, paginate
 # from app.core.conflict_detection import validate_ot_availability, validate_ot_slot_overlap  # Commented out
 from app.models.room import Room, RoomType
 # OTSlot, OTBooking, OTSlotStatus, OTBookingStatus are commented out in models
 from app.models.users import User, UserRole
 from app.schemas import room as schemas
+from app.schemas.pagination import CursorPage
+from app.rooms import cache, capacity
 
 router = APIRouter()
 
+DUPLICATE_ROOM_DETAIL = "Room number already exists"
+ROOM_NOT_FOUND_DETAIL = "Room not found"
+
+_rooms_adapter = TypeAdapter(Union[List[schemas.Room], CursorPage[schemas.Room]])
+_capacity_adapter = TypeAdapter(List[schemas.RoomCapacity])
+
 
 # ─── Room CRUD ────────────────────────────────────────────
 
@@ -26,44 +40,83 @@ def create_room(
     """
     Create a new room (Admin only).
     """
-    # Ensure room_number is unique since it is used as the business identifier
-    existing = db.query(Room).filter(Room.room_number == room_in.room_number).first()
-    if existing:
-        raise HTTPException(status_code=400, detail="Room number already exists")
-
-    room = Room(**room_in.model_dump())
-    db.add(room)
+    # room_number is the unique business key: one INSERT both checks and writes
+    room = db.scalar(
+        insert(Room)
+        .values(**room_in.model_dump())
+        .on_conflict_do_nothing(constraint="uq_rooms_room_number")
+        .returning(Room)
+    )
+    if room is None:
+        raise HTTPException(status_code=400, detail=DUPLICATE_ROOM_DETAIL)
+    capacity.apply(db, after=capacity.state(room))
+    snapshot = schemas.Room.model_validate(room)
     db.commit()
-    db.refresh(room)
-    return room
+    cache.remember(snapshot)
+    return snapshot
 
 
-@router.get("/", response_model=List[schemas.Room])
-def read_rooms(
-    db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
+@router.get("/", response_model=Union[List[schemas.Room], CursorPage[schemas.Room]])
+async def read_rooms(
+    request: Request,
+    db: AsyncSession = Depends(deps.get_primary_async_db),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    List all rooms ordered by id.
+
+    Pass ``cursor`` (empty for the first page) for keyset pagination.
+    Supports If-None-Match: while no room changed the answer is 304
+    without a query.
+    """
+    etag = versioned_etag(request, "rooms")
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    page = await paginate(db, select(Room), [Room.id], cursor=cursor, skip=skip, limit=limit)
+    body = _rooms_adapter.dump_json(_rooms_adapter.validate_python(page, from_attributes=True))
+    return tagged_response(request, body, etag)
+
+
+# Registered before /{room_number}, which would otherwise match "capacity"
+@router.get("/capacity", response_model=List[schemas.RoomCapacity])
+def read_room_capacity(
+    request: Request,
+    db: Session = Depends(deps.get_primary_db),
+    group_by: List[Literal["ward", "floor", "type"]] = Query(["ward", "floor", "type"]),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
-    List all rooms.
+    Room and bed totals (all and active only) per ward, floor and/or room
+    type, from the maintained counters rather than the rooms themselves.
+
+    Supports If-None-Match: while no room changed the answer is 304
+    without a query.
     """
-    rooms = db.query(Room).offset(skip).limit(limit).all()
-    return rooms
+    etag = versioned_etag(request, "room_capacity")
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    rows = capacity.totals(db, dict.fromkeys(group_by))
+    body = _capacity_adapter.dump_json(_capacity_adapter.validate_python(rows))
+    return tagged_response(request, body, etag)
 
 
 @router.get("/{room_number}", response_model=schemas.Room)
 def get_room(
     room_number: str,
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_primary_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Get a room by room number.
     """
-    room = db.query(Room).filter(Room.room_number == room_number).first()
+    room = cache.get_room(db, room_number)
     if not room:
-        raise HTTPException(status_code=404, detail="Room not found")
+        raise HTTPException(status_code=404, detail=ROOM_NOT_FOUND_DETAIL)
     return room
 
 
@@ -78,26 +131,40 @@ def update_room(
     """
     Update a room by room number (Admin only).
     """
-    room = db.query(Room).filter(Room.room_number == room_number).first()
-    if not room:
-        raise HTTPException(status_code=404, detail="Room not found")
-
     update_data = room_in.model_dump(exclude_unset=True)
-
-    # If room_number is being changed, ensure the new number is not already in use
-    new_room_number = update_data.get("room_number")
-    if new_room_number and new_room_number != room.room_number:
-        existing = db.query(Room).filter(Room.room_number == new_room_number).first()
-        if existing:
-            raise HTTPException(status_code=400, detail="Room number already exists")
-
-    for field, value in update_data.items():
-        setattr(room, field, value)
-
-    db.add(room)
+    if not update_data:
+        return get_room(room_number, db, current_user)
+
+    # One UPDATE ... RETURNING both the new row and, from the locked
+    # pre-update snapshot in FROM, the old values the counters need
+    old = (
+        select(Room.id, Room.ward_name, Room.floor_number, Room.room_type, Room.bed_capacity, Room.is_active)
+        .where(Room.room_number == room_number)
+        .with_for_update()
+        .subquery("old")
+    )
+    try:
+        row = db.execute(
+            update(Room)
+            .where(Room.id == old.c.id)
+            .values(**update_data)
+            .returning(Room, old.c.ward_name, old.c.floor_number, old.c.room_type, old.c.bed_capacity, old.c.is_active),
+            execution_options={"synchronize_session": False},
+        ).first()
+    except IntegrityError as exc:
+        db.rollback()
+        if getattr(exc.orig, "pgcode", None) != "23505":  # unique_violation: renamed onto another room
+            raise
+        raise HTTPException(status_code=400, detail=DUPLICATE_ROOM_DETAIL)
+    if row is None:
+        raise HTTPException(status_code=404, detail=ROOM_NOT_FOUND_DETAIL)
+
+    room, *before = row
+    capacity.apply(db, tuple(before), capacity.state(room))
+    snapshot = schemas.Room.model_validate(room)
     db.commit()
-    db.refresh(room)
-    return room
+    cache.remember(snapshot, previous_number=room_number)
+    return snapshot
 
 
 @router.delete("/{room_number}")
@@ -110,36 +177,18 @@ def delete_room(
     """
     Delete a room by room number (Admin only).
     """
-    try:
-        # Get the room using raw SQL to avoid model field mismatches
-        result = db.execute(
-            text("SELECT id FROM rooms WHERE room_number = :room_number"),
-            {"room_number": room_number}
-        ).fetchone()
-        
-        if not result:
-            raise HTTPException(status_code=404, detail="Room not found")
-        
-        room_id = result[0]
-        
-        # Delete the room using raw SQL
-        db.execute(
-            text("DELETE FROM rooms WHERE id = :room_id"),
-            {"room_id": room_id}
-        )
-        
-        db.commit()
-        return {"detail": f"Room {room_number} deleted successfully"}
-    
-    except HTTPException:
-        raise
-    except Exception as e:
-        db.rollback()
-        print(f"Error deleting room {room_number}: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to delete room: {str(e)}"
-        )
+    deleted = db.execute(
+        delete(Room)
+        .where(Room.room_number == room_number)
+        .returning(Room.ward_name, Room.floor_number, Room.room_type, Room.bed_capacity, Room.is_active),
+        execution_options={"synchronize_session": False},
+    ).first()
+    if not deleted:
+        raise HTTPException(status_code=404, detail=ROOM_NOT_FOUND_DETAIL)
+    capacity.apply(db, before=capacity.state(deleted))
+    db.commit()
+    cache.forget(room_number)
+    return {"detail": f"Room {room_number} deleted successfully"}
 
 
 # ─── OT Slots and Bookings (Temporarily Disabled) ────────────────────────────────────────────
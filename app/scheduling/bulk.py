@@ -0,0 +1,130 @@
+"""
+Bulk appointment booking.
+
+A batch is validated in one TypeAdapter pass, the working hours and
+existing bookings of every (doctor, date) it touches are loaded in two
+queries, and conflicts - with existing bookings and inside the batch -
+are found with one sorted sweep per doctor-day. Accepted rows are then
+written with a single multi-row INSERT in one transaction.
+"""
+
+from collections import defaultdict
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core import interval_index
+from app.models.appointment import Appointment
+from app.schemas.appointment import Appointment as AppointmentOut, AppointmentCreate
+
+BOOKING_CONFLICT_DETAIL = "Doctor already has an appointment at the requested time."
+UNAVAILABLE_DETAIL = "Doctor is not available at the requested time."
+PAST_DATE_DETAIL = "Appointment date cannot be in the past."
+
+_adapter = TypeAdapter(List[AppointmentCreate])
+
+Row = Tuple[int, AppointmentCreate]  # (index in the request, validated item)
+
+
+def validate_items(items: List[Any]) -> Tuple[List[Row], List[dict]]:
+    """Validate every item at once; invalid rows come back with their pydantic errors."""
+    try:
+        return list(enumerate(_adapter.validate_python(items))), []
+    except ValidationError as exc:
+        errors: Dict[int, list] = defaultdict(list)
+        for error in exc.errors(include_url=False, include_context=False):
+            index, *loc = error["loc"]
+            errors[index].append({**error, "loc": loc})
+    rejected = [
+        {"index": index, "reason": "Invalid appointment", "errors": errs} for index, errs in sorted(errors.items())
+    ]
+    valid = [i for i in range(len(items)) if i not in errors]
+    return list(zip(valid, _adapter.validate_python([items[i] for i in valid]))), rejected
+
+
+def sweep(
+    rows: List[Row],
+    days: Dict[Tuple[int, date], interval_index.DoctorDay],
+    earliest_date: Optional[date] = None,
+) -> Tuple[List[Row], List[dict]]:
+    """
+    Accept or reject each row against the doctor's day and the rest of the batch.
+
+    Rows of a doctor-day are visited in start order while tracking the
+    furthest end among accepted rows: a row overlaps an earlier accepted
+    row exactly when it starts before that end. Earlier slots win.
+    """
+    accepted: List[Row] = []
+    rejected: List[dict] = []
+    by_day: Dict[Tuple[int, date], List[Row]] = defaultdict(list)
+    for index, item in rows:
+        if earliest_date is not None and item.appointment_date < earliest_date:
+            rejected.append({"index": index, "reason": PAST_DATE_DETAIL})
+        else:
+            by_day[(item.doctor_id, item.appointment_date)].append((index, item))
+
+    for key, day_rows in by_day.items():
+        doctor_day = days[key]
+        day_rows.sort(key=lambda row: (row[1].start_time, row[1].end_time, row[0]))
+        reach_end, reach_index = None, None
+        for index, item in day_rows:
+            start, end = item.start_time, item.end_time
+            if not doctor_day.within_hours(start, end):
+                rejected.append({"index": index, "reason": UNAVAILABLE_DETAIL})
+            elif doctor_day.bookings.overlaps(start, end):
+                rejected.append({"index": index, "reason": BOOKING_CONFLICT_DETAIL})
+            elif reach_end is not None and start < reach_end:
+                rejected.append({"index": index, "reason": f"Overlaps row {reach_index} of this batch."})
+            else:
+                accepted.append((index, item))
+                if reach_end is None or end > reach_end:
+                    reach_end, reach_index = end, index
+    return accepted, rejected
+
+
+def insert_rows(db: Session, rows: List[Row], **columns: Any) -> Tuple[List[Tuple[int, Appointment]], List[dict]]:
+    """
+    One multi-row INSERT ... ON CONFLICT DO NOTHING RETURNING.
+
+    ``columns`` are set on every row (e.g. series_id). Rows the exclusion
+    constraint skips were booked concurrently by someone else since the
+    sweep; they are reported as conflicts.
+    """
+    if not rows:
+        return [], []
+    stmt = (
+        insert(Appointment)
+        .values([{**item.model_dump(), **columns} for _, item in rows])
+        .on_conflict_do_nothing()
+        .returning(Appointment)
+    )
+    inserted = {(a.doctor_id, a.appointment_date, a.start_time): a for a in db.scalars(stmt)}
+    created, lost = [], []
+    for index, item in rows:
+        appointment = inserted.get((item.doctor_id, item.appointment_date, item.start_time))
+        if appointment is None:
+            lost.append({"index": index, "reason": BOOKING_CONFLICT_DETAIL})
+        else:
+            created.append((index, appointment))
+    return created, lost
+
+
+def book(db: Session, items: List[Any], earliest_date: Optional[date] = None) -> dict:
+    """Validate, sweep and insert a batch; returns accepted and rejected rows by index."""
+    rows, rejected = validate_items(items)
+    days = interval_index.load_doctor_days(db, {(item.doctor_id, item.appointment_date) for _, item in rows})
+    accepted, conflicts = sweep(rows, days, earliest_date)
+    created, lost = insert_rows(db, accepted)
+    # Snapshot before commit expires the instances (one refresh per row otherwise)
+    snapshots = [(index, AppointmentOut.model_validate(a)) for index, a in created]
+    db.commit()
+
+    for _, a in snapshots:
+        interval_index.record_booking(a.doctor_id, a.appointment_date, a.start_time, a.end_time, a.id)
+    return {
+        "accepted": [{"index": index, "appointment": a} for index, a in sorted(snapshots, key=lambda r: r[0])],
+        "rejected": sorted(rejected + conflicts + lost, key=lambda r: r["index"]),
+    }
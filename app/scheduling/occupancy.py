@@ -0,0 +1,61 @@
+"""
+Bitmap occupancy queries over doctor calendars.
+
+Every interval index entry carries a 288-bit free mask (5-minute slots,
+see ``DoctorDay.free_bits``), so questions across many doctors reduce to
+integer operations instead of range queries: "who is free 10:00-10:30"
+is one AND per doctor, "when are these doctors all free" is an AND over
+their masks followed by a scan of the set-bit runs.
+
+The masks are exact for times on the 5-minute grid and conservative
+otherwise: a partially booked slot counts as busy, a partially worked
+slot as unavailable.
+
+Days not yet indexed are loaded through the session passed in and kept
+in the shared index that also checks bookings, so it must be a primary
+session, never the replica.
+"""
+
+from datetime import date, time
+from typing import Iterable, Iterator, List, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core import interval_index
+from app.core.interval_index import BIT_MINUTES, span_bits
+
+
+def _bit_time(slot: int) -> time:
+    minutes = min(slot * BIT_MINUTES, 24 * 60 - 1)  # a run ending at midnight ends at 23:59
+    return time(minutes // 60, minutes % 60)
+
+
+def runs(bits: int) -> Iterator[Tuple[int, int]]:
+    """(first, last) slot ranges of consecutive set bits, lowest first; ``last`` is exclusive."""
+    while bits:
+        first = (bits & -bits).bit_length() - 1
+        shifted = bits >> first
+        last = first + (shifted ^ (shifted + 1)).bit_length() - 1
+        yield first, last
+        bits &= ~0 << last
+
+
+def free_doctors(db: Session, doctor_ids: Iterable[int], day: date, start: time, end: time) -> List[int]:
+    """Doctors (ascending id) whose working hours cover [start, end) with nothing booked in it."""
+    need = span_bits(start, end)
+    keys = [(doctor_id, day) for doctor_id in sorted(set(doctor_ids))]
+    days = interval_index.get_doctor_days(db, keys)
+    return [doctor_id for doctor_id, _ in keys if days[(doctor_id, day)].free_bits & need == need]
+
+
+def common_free(db: Session, doctor_ids: Iterable[int], day: date, min_minutes: int = 0) -> List[Tuple[time, time]]:
+    """Windows of at least ``min_minutes`` in which every given doctor is free."""
+    keys = [(doctor_id, day) for doctor_id in set(doctor_ids)]
+    if not keys:
+        return []
+    days = interval_index.get_doctor_days(db, keys)
+    bits = ~0
+    for key in keys:
+        bits &= days[key].free_bits
+    min_slots = max(1, -(-min_minutes // BIT_MINUTES))
+    return [(_bit_time(first), _bit_time(last)) for first, last in runs(bits) if last - first >= min_slots]
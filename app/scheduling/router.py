@@ -1,17 +1,68 @@
-from typing import List, Any
-from datetime import datetime
+from typing import List, Any, Dict, Optional, Union
+from datetime import date, datetime, time
 from zoneinfo import ZoneInfo
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core import deps
-from app.core.conflict_detection import validate_doctor_availability
-from app.models.appointment import Appointment, AppointmentStatus, DoctorAvailability
+from app.core import deps, interval_index
+from app.core.config import settings
+from app.core.conflict_detection import is_booking_conflict
+from app.core.http_cache import not_modified, tagged_response, versioned_etag
+from app.core.pagination import MAX_PAGE_SIZE, paginate
+from app.models.appointment import Appointment, AppointmentSeries, AppointmentStatus, DoctorAvailability
 from app.models.users import User, UserRole
 from app.schemas import appointment as schemas
+from app.schemas.pagination import CursorPage
+from app.scheduling import bulk, occupancy, series, slots
+from app.scheduling.bulk import BOOKING_CONFLICT_DETAIL
 
 router = APIRouter()
 
+_availability_adapter = TypeAdapter(List[schemas.Availability])
+
+
+def _check_slot(
+    db: Session,
+    doctor_id: int,
+    appointment_date: date,
+    start_time: time,
+    end_time: time,
+    detail: str,
+    exclude_appointment_id: Optional[int] = None,
+) -> None:
+    """Working hours (400) and known overlapping bookings (409), answered from the interval index."""
+    if end_time <= start_time:
+        raise HTTPException(status_code=400, detail="end_time must be after start_time")
+    doctor_day = interval_index.get_doctor_day(db, doctor_id, appointment_date)
+    if not doctor_day.within_hours(start_time, end_time):
+        raise HTTPException(status_code=400, detail=detail)
+    if doctor_day.bookings.overlaps(start_time, end_time, exclude_appointment_id):
+        raise HTTPException(status_code=409, detail=BOOKING_CONFLICT_DETAIL)
+
+
+def _commit_booking(db: Session, appointment: Appointment) -> None:
+    """
+    Commit a new or changed appointment. The exclusion constraint on
+    appointments is the real guard against double booking: of two
+    concurrent requests for one slot, only the first insert commits and
+    the other gets 409, without any locking or extra round trip here.
+    """
+    doctor_id, appointment_date = appointment.doctor_id, appointment.appointment_date
+    try:
+        db.commit()
+    except IntegrityError as exc:
+        db.rollback()
+        if not is_booking_conflict(exc):
+            raise
+        # The index missed a booking (e.g. made by another worker); reload next time
+        interval_index.invalidate_day(doctor_id, appointment_date)
+        raise HTTPException(status_code=409, detail=BOOKING_CONFLICT_DETAIL)
+
 
 @router.post("/", response_model=schemas.Appointment)
 def create_appointment(
@@ -23,15 +74,14 @@ def create_appointment(
     """
     Create new appointment (Admin or Doctor only).
     """
-    is_available = validate_doctor_availability(
+    _check_slot(
         db,
         appointment_in.doctor_id,
         appointment_in.appointment_date,
         appointment_in.start_time,
         appointment_in.end_time,
+        detail="Doctor is not available at the requested time.",
     )
-    if not is_available:
-        raise HTTPException(status_code=400, detail="Doctor is not available at the requested time.")
 
     # Prevent non-admins from booking in the past (IST)
     today_ist = datetime.now(ZoneInfo("Asia/Kolkata")).date()
@@ -43,31 +93,283 @@ def create_appointment(
 
     appointment = Appointment(**appointment_in.model_dump())
     db.add(appointment)
-    db.commit()
+    _commit_booking(db, appointment)
     db.refresh(appointment)
+    interval_index.record_appointment(appointment)
     return appointment
 
 
-@router.get("/", response_model=List[schemas.Appointment])
-def read_appointments(
+@router.post("/bulk", response_model=schemas.BulkBookingResult)
+def bulk_create_appointments(
+    *,
+    db: Session = Depends(deps.get_db),
+    items: List[Dict[str, Any]] = Body(...),
+    current_user: User = Depends(deps.require_role([UserRole.ADMIN, UserRole.DOCTOR])),
+) -> Any:
+    """
+    Book many appointments at once (Admin or Doctor only), e.g. a clinic's day.
+
+    Each item is an AppointmentCreate. Rows are checked against working
+    hours, existing bookings and each other; valid, conflict-free rows are
+    inserted together and the rest are reported with a reason, both keyed
+    by their position in the request.
+    """
+    if len(items) > settings.BULK_APPOINTMENT_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400, detail=f"At most {settings.BULK_APPOINTMENT_MAX_ITEMS} appointments per request."
+        )
+    earliest_date = None if current_user.role == UserRole.ADMIN else _today_ist()
+    return bulk.book(db, items, earliest_date)
+
+
+def _today_ist() -> date:
+    return datetime.now(ZoneInfo("Asia/Kolkata")).date()
+
+
+def _series_conflict(exc: series.SeriesConflict) -> HTTPException:
+    return HTTPException(
+        status_code=409,
+        detail={
+            "message": "Some occurrences of the series cannot be booked.",
+            "conflicts": jsonable_encoder(exc.conflicts),
+        },
+    )
+
+
+def _get_series(db: Session, series_id: int, current_user: User) -> AppointmentSeries:
+    appointment_series = db.get(AppointmentSeries, series_id)
+    if not appointment_series:
+        raise HTTPException(status_code=404, detail="Appointment series not found")
+    if current_user.role == UserRole.DOCTOR and appointment_series.doctor_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not your appointment series")
+    return appointment_series
+
+
+@router.post("/series", response_model=schemas.AppointmentSeriesResult)
+def create_appointment_series(
+    *,
+    db: Session = Depends(deps.get_db),
+    series_in: schemas.AppointmentSeriesCreate,
+    skip_conflicts: bool = False,
+    current_user: User = Depends(deps.require_role([UserRole.ADMIN, UserRole.DOCTOR])),
+) -> Any:
+    """
+    Book a recurring series (Admin or Doctor only), e.g. weekly follow-ups.
+
+    ``rrule`` is an RFC 5545 recurrence rule expanded from appointment_date,
+    e.g. ``FREQ=WEEKLY;COUNT=8`` or ``FREQ=MONTHLY;BYMONTHDAY=5;UNTIL=20271231``.
+    All occurrences are checked at once. If any conflicts, nothing is booked
+    and 409 lists them, unless ``skip_conflicts`` books the free ones and
+    reports the rest.
+    """
+    earliest_date = None if current_user.role == UserRole.ADMIN else _today_ist()
+    try:
+        return series.create(db, series_in, earliest_date, skip_conflicts)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except series.SeriesConflict as exc:
+        raise _series_conflict(exc)
+
+
+@router.get("/series/{series_id}", response_model=List[schemas.Appointment])
+def read_appointment_series(
+    *,
+    db: Session = Depends(deps.get_db),
+    series_id: int,
+    current_user: User = Depends(deps.require_role([UserRole.ADMIN, UserRole.DOCTOR])),
+) -> Any:
+    """
+    All occurrences of a series, in date order.
+    """
+    _get_series(db, series_id, current_user)
+    return db.scalars(
+        select(Appointment)
+        .where(Appointment.series_id == series_id)
+        .order_by(Appointment.appointment_date, Appointment.start_time)
+    ).all()
+
+
+@router.put("/series/{series_id}", response_model=schemas.AppointmentSeriesResult)
+def reschedule_appointment_series(
+    *,
+    db: Session = Depends(deps.get_db),
+    series_id: int,
+    change: schemas.AppointmentSeriesReschedule,
+    from_date: Optional[date] = Query(None, alias="from"),
+    current_user: User = Depends(deps.require_role([UserRole.ADMIN, UserRole.DOCTOR])),
+) -> Any:
+    """
+    Move the scheduled occurrences on or after ``from`` (default today) by
+    ``shift_days`` and/or to new times, all or nothing (409 lists conflicts).
+    Only admins may move occurrences into the past.
+    """
+    _get_series(db, series_id, current_user)
+    earliest_date = None if current_user.role == UserRole.ADMIN else _today_ist()
+    try:
+        moved = series.reschedule(db, series_id, change, from_date or _today_ist(), earliest_date)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except series.SeriesConflict as exc:
+        raise _series_conflict(exc)
+    return {"series_id": series_id, "appointments": moved}
+
+
+@router.delete("/series/{series_id}", response_model=schemas.AppointmentSeriesResult)
+def cancel_appointment_series(
+    *,
     db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
+    series_id: int,
+    from_date: Optional[date] = Query(None, alias="from"),
+    current_user: User = Depends(deps.require_role([UserRole.ADMIN, UserRole.DOCTOR])),
+) -> Any:
+    """
+    Cancel the scheduled occurrences on or after ``from`` (default today).
+    """
+    _get_series(db, series_id, current_user)
+    return {"series_id": series_id, "appointments": series.cancel(db, series_id, from_date or _today_ist())}
+
+
+def _search_slots(
+    db: Session, doctor_ids: List[int], date_from: date, date_to: date, duration: int, limit: int
+) -> List[dict]:
+    # ``db`` must be a primary session: the doctor days loaded here go into the
+    # shared interval index that _check_slot trusts for bookings, so replica lag
+    # must not reach it.
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="'to' must not be before 'from'.")
+    if (date_to - date_from).days >= settings.SLOT_SEARCH_MAX_DAYS:
+        raise HTTPException(
+            status_code=400, detail=f"Search at most {settings.SLOT_SEARCH_MAX_DAYS} days at a time."
+        )
+    now_ist = datetime.now(ZoneInfo("Asia/Kolkata")).replace(tzinfo=None)
+    return slots.find_free_slots(db, doctor_ids, date_from, date_to, duration, not_before=now_ist, limit=limit)
+
+
+def _doctor_ids_or_all(db: Session, doctor_ids: Optional[List[int]]) -> List[int]:
+    if doctor_ids:
+        return doctor_ids
+    return db.scalars(select(User.id).where(User.role == UserRole.DOCTOR, User.is_active.is_(True))).all()
+
+
+@router.get("/slots", response_model=List[schemas.FreeSlot])
+def read_free_slots(
+    db: Session = Depends(deps.get_primary_db),
+    doctor_id: int = Query(...),
+    date_from: date = Query(..., alias="from"),
+    date_to: date = Query(..., alias="to"),
+    duration: int = Query(30, ge=5, le=8 * 60, description="Minutes; rounded up to 15"),
+    limit: int = Query(200, ge=1, le=5000),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Free slots of one doctor between two dates (inclusive), on a 15-minute grid.
+    A slot is free when it lies inside the doctor's working hours and no
+    scheduled appointment overlaps it. Past slots are omitted.
+    """
+    return _search_slots(db, [doctor_id], date_from, date_to, duration, limit)
+
+
+@router.get("/slots/any", response_model=List[schemas.FreeSlot])
+def read_free_slots_any_doctor(
+    db: Session = Depends(deps.get_primary_db),
+    doctor_ids: Optional[List[int]] = Query(None, alias="doctor_id"),
+    date_from: date = Query(..., alias="from"),
+    date_to: date = Query(..., alias="to"),
+    duration: int = Query(30, ge=5, le=8 * 60, description="Minutes; rounded up to 15"),
+    limit: int = Query(200, ge=1, le=5000),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Free slots across several doctors (repeat ``doctor_id``), or across all
+    active doctors when none is given, ordered by date, time and doctor.
+    """
+    return _search_slots(db, _doctor_ids_or_all(db, doctor_ids), date_from, date_to, duration, limit)
+
+
+@router.get("/free-doctors", response_model=List[schemas.FreeSlot])
+def read_free_doctors(
+    db: Session = Depends(deps.get_primary_db),
+    day: date = Query(..., alias="date"),
+    start_time: time = Query(..., alias="start"),
+    end_time: time = Query(..., alias="end"),
+    doctor_ids: Optional[List[int]] = Query(None, alias="doctor_id"),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Doctors free for the whole of [start, end) on a date: inside working
+    hours with no scheduled appointment in any 5-minute slot it touches.
+    Checks the given doctors (repeat ``doctor_id``) or all active doctors.
+    """
+    if end_time <= start_time:
+        raise HTTPException(status_code=400, detail="End time must be after start time.")
+    free = occupancy.free_doctors(db, _doctor_ids_or_all(db, doctor_ids), day, start_time, end_time)
+    return [
+        {"doctor_id": doctor_id, "date": day, "start_time": start_time, "end_time": end_time}
+        for doctor_id in free
+    ]
+
+
+@router.get("/common-availability", response_model=List[schemas.TimeWindow])
+def read_common_availability(
+    db: Session = Depends(deps.get_primary_db),
+    doctor_ids: List[int] = Query(..., alias="doctor_id"),
+    day: date = Query(..., alias="date"),
+    duration: int = Query(5, ge=5, le=24 * 60, description="Minimum window length in minutes"),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
-    Retrieve appointments.
+    Windows on a date in which every given doctor (repeat ``doctor_id``) is
+    free, on a 5-minute grid, e.g. to schedule a joint consultation.
+    """
+    return [
+        {"start_time": start, "end_time": end}
+        for start, end in occupancy.common_free(db, doctor_ids, day, min_minutes=duration)
+    ]
+
+
+@router.get("/", response_model=Union[List[schemas.Appointment], CursorPage[schemas.Appointment]])
+async def read_appointments(
+    db: AsyncSession = Depends(deps.get_async_db),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    doctor_id: Optional[int] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    status: Optional[AppointmentStatus] = None,
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Retrieve appointments, ordered by (appointment_date, start_time, id).
     Admin/HR/Staff see all. Doctor sees own. Others get 403.
+
+    Pass ``cursor`` (empty for the first page) for keyset pagination; the
+    response then carries ``next_cursor``. Without it, skip/limit apply.
     """
     if current_user.role == UserRole.ADMIN or current_user.role == UserRole.HR or current_user.role == UserRole.STAFF:
-        appointments = db.query(Appointment).offset(skip).limit(limit).all()
+        stmt = select(Appointment)
+        if doctor_id is not None:
+            stmt = stmt.where(Appointment.doctor_id == doctor_id)
     elif current_user.role == UserRole.DOCTOR:
-        appointments = db.query(Appointment).filter(
-            Appointment.doctor_id == current_user.id
-        ).offset(skip).limit(limit).all()
+        stmt = select(Appointment).where(Appointment.doctor_id == current_user.id)
     else:
         raise HTTPException(status_code=403, detail="Not enough privileges")
-    return appointments
+
+    if date_from is not None:
+        stmt = stmt.where(Appointment.appointment_date >= date_from)
+    if date_to is not None:
+        stmt = stmt.where(Appointment.appointment_date <= date_to)
+    if status is not None:
+        stmt = stmt.where(Appointment.status == status)
+
+    return await paginate(
+        db,
+        stmt,
+        [Appointment.appointment_date, Appointment.start_time, Appointment.id],
+        cursor=cursor,
+        skip=skip,
+        limit=limit,
+    )
 
 
 @router.put("/{appointment_id}", response_model=schemas.Appointment)
@@ -89,20 +391,21 @@ def update_appointment(
     if current_user.role == UserRole.DOCTOR and appointment.doctor_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not your appointment")
 
+    previous_date = appointment.appointment_date
     if appointment_in.appointment_date or appointment_in.start_time or appointment_in.end_time:
         new_date = appointment_in.appointment_date or appointment.appointment_date
         new_start = appointment_in.start_time or appointment.start_time
         new_end = appointment_in.end_time or appointment.end_time
 
-        is_available = validate_doctor_availability(
+        _check_slot(
             db,
             appointment.doctor_id,
             new_date,
             new_start,
             new_end,
+            detail="Doctor is not available at the new time.",
+            exclude_appointment_id=appointment.id,
         )
-        if not is_available:
-            raise HTTPException(status_code=400, detail="Doctor is not available at the new time.")
         appointment.appointment_date = new_date
         appointment.start_time = new_start
         appointment.end_time = new_end
@@ -114,8 +417,11 @@ def update_appointment(
         setattr(appointment, field, value)
 
     db.add(appointment)
-    db.commit()
+    _commit_booking(db, appointment)
     db.refresh(appointment)
+    if appointment.appointment_date != previous_date:
+        interval_index.forget_appointment(appointment.doctor_id, previous_date, appointment.id)
+    interval_index.record_appointment(appointment)
     return appointment
 
 
@@ -140,9 +446,37 @@ def cancel_appointment(
     db.add(appointment)
     db.commit()
     db.refresh(appointment)
+    interval_index.record_appointment(appointment)
     return appointment
 
 
+@router.get("/availability", response_model=List[schemas.Availability])
+def read_availability(
+    request: Request,
+    db: Session = Depends(deps.get_primary_db),
+    doctor_id: Optional[int] = None,
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Weekly working hours, of one doctor or all, ordered by doctor and day.
+
+    Supports If-None-Match: while no availability changed the answer is
+    304 without a query.
+    """
+    etag = versioned_etag(request, "doctor_availability")
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    stmt = select(DoctorAvailability).order_by(
+        DoctorAvailability.doctor_id, DoctorAvailability.day_of_week, DoctorAvailability.start_time
+    )
+    if doctor_id is not None:
+        stmt = stmt.where(DoctorAvailability.doctor_id == doctor_id)
+    rows = db.scalars(stmt).all()
+    body = _availability_adapter.dump_json(_availability_adapter.validate_python(rows, from_attributes=True))
+    return tagged_response(request, body, etag)
+
+
 @router.post("/availability", response_model=schemas.Availability)
 def create_availability(
     *,
@@ -157,4 +491,5 @@ def create_availability(
     db.add(availability)
     db.commit()
     db.refresh(availability)
+    interval_index.invalidate_doctor(availability.doctor_id)
     return availability
@@ -0,0 +1,219 @@
+"""
+Recurring appointment series.
+
+A series is one appointment template plus an RFC 5545 recurrence rule
+("FREQ=WEEKLY;COUNT=12", "FREQ=MONTHLY;BYMONTHDAY=5;UNTIL=20271231"),
+expanded server-side from the first appointment_date. Every occurrence is
+validated in one pass - the doctor-days are loaded in two queries and run
+through the bulk booking sweep - and the series is written with a single
+multi-row INSERT in one transaction.
+
+Rescheduling and cancelling operate on the whole series (from a date on)
+with one UPDATE each instead of a request per occurrence.
+"""
+
+from datetime import date, datetime, time
+from itertools import islice
+from typing import Dict, List, Optional, Tuple
+
+from dateutil.rrule import rrulestr
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core import interval_index
+from app.core.config import settings
+from app.core.conflict_detection import is_booking_conflict
+from app.models.appointment import Appointment, AppointmentSeries, AppointmentStatus
+from app.schemas.appointment import (
+    Appointment as AppointmentOut,
+    AppointmentCreate,
+    AppointmentSeriesCreate,
+    AppointmentSeriesReschedule,
+)
+from app.scheduling import bulk
+
+
+class SeriesConflict(Exception):
+    """Occurrences that cannot be booked; nothing was written."""
+
+    def __init__(self, conflicts: List[dict]):
+        super().__init__(f"{len(conflicts)} occurrence(s) conflict")
+        self.conflicts = conflicts
+
+
+def expand(rule: str, first: date, limit: Optional[int] = None) -> List[date]:
+    """Occurrence dates of ``rule`` starting at ``first``; ValueError if invalid or unbounded."""
+    limit = limit or settings.APPOINTMENT_SERIES_MAX_OCCURRENCES
+    try:
+        recurrence = rrulestr(rule, dtstart=datetime.combine(first, time()))
+        dates = [occurrence.date() for occurrence in islice(recurrence, limit + 1)]
+    except (ValueError, TypeError) as exc:
+        raise ValueError(f"Invalid recurrence rule: {exc}") from None
+    if len(dates) > limit:
+        raise ValueError(f"Recurrence yields more than {limit} occurrences; bound it with COUNT or UNTIL.")
+    if not dates:
+        raise ValueError("Recurrence yields no occurrences.")
+    return dates
+
+
+def _conflicts(rejected: List[dict], dates: List[date]) -> List[dict]:
+    return sorted(
+        ({"index": r["index"], "appointment_date": dates[r["index"]], "reason": r["reason"]} for r in rejected),
+        key=lambda r: r["index"],
+    )
+
+
+def create(
+    db: Session,
+    series_in: AppointmentSeriesCreate,
+    earliest_date: Optional[date] = None,
+    skip_conflicts: bool = False,
+) -> dict:
+    """
+    Expand, validate and book a series. With ``skip_conflicts`` the free
+    occurrences are booked and the rest reported; otherwise any conflict
+    raises SeriesConflict and nothing is booked.
+    """
+    dates = expand(series_in.rrule, series_in.appointment_date)
+    template = AppointmentCreate(**series_in.model_dump(exclude={"rrule"}))
+    rows = [(index, template.model_copy(update={"appointment_date": day})) for index, day in enumerate(dates)]
+
+    days = interval_index.load_doctor_days(db, {(series_in.doctor_id, day) for day in dates})
+    accepted, rejected = bulk.sweep(rows, days, earliest_date)
+    if (rejected and not skip_conflicts) or not accepted:
+        raise SeriesConflict(_conflicts(rejected, dates))
+
+    series = AppointmentSeries(
+        doctor_id=series_in.doctor_id,
+        patient_id=series_in.patient_id,
+        rrule=series_in.rrule,
+        starts_on=series_in.appointment_date,
+    )
+    db.add(series)
+    db.flush()
+    created, lost = bulk.insert_rows(db, accepted, series_id=series.id)
+    for r in lost:
+        # Booked by someone else since the sweep; the index missed it
+        interval_index.invalidate_day(series_in.doctor_id, dates[r["index"]])
+    if (lost and not skip_conflicts) or not created:
+        db.rollback()
+        raise SeriesConflict(_conflicts(lost, dates))
+
+    series_id = series.id
+    snapshots = [AppointmentOut.model_validate(a) for _, a in sorted(created, key=lambda r: r[0])]
+    db.commit()
+    for a in snapshots:
+        interval_index.record_booking(a.doctor_id, a.appointment_date, a.start_time, a.end_time, a.id)
+    return {"series_id": series_id, "appointments": snapshots, "rejected": _conflicts(rejected + lost, dates)}
+
+
+def _scheduled_from(series_id: int, from_date: date):
+    return (
+        Appointment.series_id == series_id,
+        Appointment.status == AppointmentStatus.SCHEDULED,
+        Appointment.appointment_date >= from_date,
+    )
+
+
+def reschedule(
+    db: Session,
+    series_id: int,
+    change: AppointmentSeriesReschedule,
+    from_date: date,
+    earliest_date: Optional[date] = None,
+) -> List[AppointmentOut]:
+    """
+    Move every scheduled occurrence on or after ``from_date`` by
+    ``shift_days`` and/or to new times, all or nothing. Raises
+    SeriesConflict listing the occurrences that would not fit, including
+    any that would land before ``earliest_date``.
+    """
+    occurrences = db.execute(
+        select(Appointment.id, Appointment.doctor_id, Appointment.appointment_date,
+               Appointment.start_time, Appointment.end_time)
+        .where(*_scheduled_from(series_id, from_date))
+        .order_by(Appointment.appointment_date, Appointment.start_time)
+    ).all()
+    if not occurrences:
+        return []
+
+    moves: List[Tuple[int, int, date, date, time, time]] = []
+    for o in occurrences:
+        new_date = date.fromordinal(o.appointment_date.toordinal() + change.shift_days)
+        start, end = change.start_time or o.start_time, change.end_time or o.end_time
+        if end <= start:
+            raise ValueError("end_time must be after start_time")
+        moves.append((o.id, o.doctor_id, o.appointment_date, new_date, start, end))
+
+    ids = {move[0] for move in moves}
+    days: Dict[Tuple[int, date], interval_index.DoctorDay] = interval_index.load_doctor_days(
+        db, {(doctor_id, new_date) for _, doctor_id, _, new_date, _, _ in moves}
+    )
+    conflicts = []
+    for index, (_, doctor_id, _, new_date, start, end) in enumerate(moves):
+        doctor_day = days[(doctor_id, new_date)]
+        if earliest_date is not None and new_date < earliest_date:
+            conflicts.append({"index": index, "appointment_date": new_date, "reason": bulk.PAST_DATE_DETAIL})
+        elif not doctor_day.within_hours(start, end):
+            conflicts.append({"index": index, "appointment_date": new_date, "reason": bulk.UNAVAILABLE_DETAIL})
+        elif any(i not in ids for i in doctor_day.bookings.overlapping(start, end)):
+            # The series' own occurrences are moving too, so they never block
+            conflicts.append({"index": index, "appointment_date": new_date, "reason": bulk.BOOKING_CONFLICT_DETAIL})
+    if conflicts:
+        raise SeriesConflict(conflicts)
+
+    values = {"appointment_date": Appointment.appointment_date + change.shift_days}
+    if change.start_time is not None:
+        values["start_time"] = change.start_time
+    if change.end_time is not None:
+        values["end_time"] = change.end_time
+    try:
+        # The exclusion constraint is checked row by row, so moving a weekly
+        # series by a week would briefly collide with its own next occurrence.
+        # Park the rows outside the constraint first, then move and restore them.
+        db.execute(
+            update(Appointment).where(Appointment.id.in_(ids)).values(status=AppointmentStatus.CANCELLED),
+            execution_options={"synchronize_session": False},
+        )
+        moved = db.scalars(
+            update(Appointment)
+            .where(Appointment.id.in_(ids))
+            .values(status=AppointmentStatus.SCHEDULED, **values)
+            .returning(Appointment),
+            execution_options={"synchronize_session": False},
+        ).all()
+        snapshots = [AppointmentOut.model_validate(a) for a in moved]
+        db.commit()
+    except IntegrityError as exc:
+        db.rollback()
+        if not is_booking_conflict(exc):
+            raise
+        for _, doctor_id, _, new_date, _, _ in moves:
+            interval_index.invalidate_day(doctor_id, new_date)
+        raise SeriesConflict([
+            {"index": index, "appointment_date": move[3], "reason": bulk.BOOKING_CONFLICT_DETAIL}
+            for index, move in enumerate(moves)
+        ])
+
+    for appointment_id, doctor_id, old_date, _, _, _ in moves:
+        interval_index.forget_appointment(doctor_id, old_date, appointment_id)
+    for a in snapshots:
+        interval_index.record_booking(a.doctor_id, a.appointment_date, a.start_time, a.end_time, a.id)
+    return sorted(snapshots, key=lambda a: (a.appointment_date, a.start_time))
+
+
+def cancel(db: Session, series_id: int, from_date: date) -> List[AppointmentOut]:
+    """Cancel every scheduled occurrence on or after ``from_date`` with one UPDATE."""
+    cancelled = db.scalars(
+        update(Appointment)
+        .where(*_scheduled_from(series_id, from_date))
+        .values(status=AppointmentStatus.CANCELLED)
+        .returning(Appointment),
+        execution_options={"synchronize_session": False},
+    ).all()
+    snapshots = [AppointmentOut.model_validate(a) for a in cancelled]
+    db.commit()
+    for a in snapshots:
+        interval_index.forget_appointment(a.doctor_id, a.appointment_date, a.id)
+    return sorted(snapshots, key=lambda a: (a.appointment_date, a.start_time))
@@ -0,0 +1,112 @@
+"""
+Free-slot search over doctor calendars.
+
+Each doctor-day becomes a boolean mask over a fixed 15-minute grid
+(96 slots): True where the slot lies inside a working window and does
+not touch a SCHEDULED booking. Masks for every requested doctor-day are
+stacked into one matrix, and the start slots of every free run of the
+requested length are found at once with a cumulative sum along each row.
+
+Masks are cached per doctor-day and tied to the interval index entry
+they were built from. Any booking change replaces that entry (write-through
+or reload), so a stale mask is simply never matched again.
+"""
+
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core import interval_index
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+
+_masks = TTLCache("slot_masks", maxsize=settings.INTERVAL_INDEX_MAX_ENTRIES)
+
+
+def _minutes(t: time) -> int:
+    return t.hour * 60 + t.minute + (1 if t.second or t.microsecond else 0)
+
+
+def _slot_time(slot: int) -> time:
+    minutes = slot * SLOT_MINUTES
+    return time(minutes // 60, minutes % 60)
+
+
+def free_mask(doctor_day: interval_index.DoctorDay) -> np.ndarray:
+    """Boolean mask of 15-minute slots that are inside working hours and unbooked."""
+    mask = np.zeros(SLOTS_PER_DAY, dtype=bool)
+    for start, end in doctor_day.windows:
+        # Only slots lying entirely inside the window
+        first = -(-_minutes(start) // SLOT_MINUTES)
+        mask[first:_minutes(end) // SLOT_MINUTES] = True
+    # A slot ending at 24:00 cannot be booked (end_time is a time of day)
+    mask[-1] = False
+    for start, end, _ in doctor_day.bookings:
+        # Every slot the booking touches
+        mask[_minutes(start) // SLOT_MINUTES:-(-_minutes(end) // SLOT_MINUTES)] = False
+    return mask
+
+
+def _cached_mask(key: Tuple[int, date], doctor_day: interval_index.DoctorDay) -> np.ndarray:
+    cached = _masks.get(key)
+    if cached is not None and cached[0] is doctor_day:
+        return cached[1]
+    mask = free_mask(doctor_day)
+    _masks.set(key, (doctor_day, mask))
+    return mask
+
+
+def run_starts(masks: np.ndarray, length: int) -> np.ndarray:
+    """(row, slot) pairs where ``length`` consecutive free slots start, for every row at once."""
+    counts = np.zeros((masks.shape[0], masks.shape[1] + 1), dtype=np.int16)
+    np.cumsum(masks, axis=1, out=counts[:, 1:])
+    return np.argwhere(counts[:, length:] - counts[:, :-length] == length)
+
+
+def find_free_slots(
+    db: Session,
+    doctor_ids: Iterable[int],
+    date_from: date,
+    date_to: date,
+    duration_minutes: int,
+    not_before: Optional[datetime] = None,
+    limit: Optional[int] = None,
+) -> List[Dict]:
+    """
+    Free slots of ``duration_minutes`` (rounded up to the 15-minute grid)
+    for each doctor and date in the inclusive range, ordered by date,
+    start time and doctor. Slots starting before ``not_before`` are skipped.
+    """
+    length = max(1, -(-duration_minutes // SLOT_MINUTES))
+    doctors = sorted(set(doctor_ids))
+    if not_before is not None:
+        date_from = max(date_from, not_before.date())
+    days = [date_from + timedelta(days=i) for i in range((date_to - date_from).days + 1)]
+    # Day-major row order: row // len(doctors) is the day, row % len(doctors) the doctor
+    keys = [(doctor_id, day) for day in days for doctor_id in doctors]
+    if not keys or length >= SLOTS_PER_DAY:
+        return []
+
+    doctor_days = interval_index.get_doctor_days(db, keys)
+    masks = np.stack([_cached_mask(key, doctor_days[key]) for key in keys])
+    if not_before is not None and days[0] == not_before.date():
+        masks[:len(doctors), :-(-_minutes(not_before.time()) // SLOT_MINUTES)] = False
+
+    hits = run_starts(masks, length)
+    rows, starts = hits[:, 0], hits[:, 1]
+    order = np.lexsort((rows, starts, rows // len(doctors)))  # by day, start slot, doctor
+    slots = []
+    for row, slot in hits[order][:limit].tolist():
+        doctor_id, day = keys[row]
+        slots.append({
+            "doctor_id": doctor_id,
+            "date": day,
+            "start_time": _slot_time(slot),
+            "end_time": _slot_time(slot + length),
+        })
+    return slots
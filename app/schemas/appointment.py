@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Any, List, Optional
 from datetime import date, time, datetime
 
 from pydantic import BaseModel, EmailStr, PositiveInt, constr, field_validator
@@ -57,6 +57,7 @@ class AppointmentUpdate(BaseModel):
 class AppointmentInDBBase(AppointmentBase):
     id: int
     status: AppointmentStatus
+    series_id: Optional[int] = None
     created_at: datetime
     updated_at: datetime
 
@@ -67,6 +68,57 @@ class AppointmentInDBBase(AppointmentBase):
 class Appointment(AppointmentInDBBase):
     pass
 
+class BulkAccepted(BaseModel):
+    index: int  # position in the request list
+    appointment: Appointment
+
+
+class BulkRejected(BaseModel):
+    index: int
+    reason: str
+    errors: Optional[List[Any]] = None  # pydantic errors for invalid rows
+
+
+class BulkBookingResult(BaseModel):
+    accepted: List[BulkAccepted]
+    rejected: List[BulkRejected]
+
+
+class AppointmentSeriesCreate(AppointmentCreate):
+    # appointment_date is the first occurrence (DTSTART); times apply to every occurrence
+    rrule: constr(min_length=1, max_length=255)  # e.g. "FREQ=WEEKLY;COUNT=12", "FREQ=MONTHLY;UNTIL=20271231"
+
+
+class AppointmentSeriesReschedule(BaseModel):
+    shift_days: int = 0
+    start_time: Optional[time] = None
+    end_time: Optional[time] = None
+
+
+class SeriesConflict(BaseModel):
+    index: int  # occurrence number within the series
+    appointment_date: date
+    reason: str
+
+
+class AppointmentSeriesResult(BaseModel):
+    series_id: Optional[int] = None
+    appointments: List[Appointment]
+    rejected: List[SeriesConflict] = []
+
+
+class FreeSlot(BaseModel):
+    doctor_id: int
+    date: date
+    start_time: time
+    end_time: time
+
+
+class TimeWindow(BaseModel):
+    start_time: time
+    end_time: time
+
+
 class AvailabilityBase(BaseModel):
     doctor_id: PositiveInt
     day_of_week: int
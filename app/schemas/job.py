@@ -0,0 +1,19 @@
+from typing import Any, Dict, Optional
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class Job(BaseModel):
+    id: str
+    kind: str
+    status: str  # pending, running, succeeded, failed
+    total: int
+    processed: int
+    failed: int
+    rows_per_second: float
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    result: Dict[str, Any] = {}
+    error: Optional[str] = None
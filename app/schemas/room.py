@@ -38,6 +38,17 @@ class Room(RoomBase):
         from_attributes = True
 
 
+class RoomCapacity(BaseModel):
+    # Only the dimensions requested in group_by are set
+    ward_name: Optional[str] = None
+    floor_number: Optional[int] = None
+    room_type: Optional[RoomType] = None
+    rooms: int
+    active_rooms: int
+    beds: int
+    active_beds: int
+
+
 # NOTE: OT-related schemas are commented out because the models don't match the database schema
 # Uncomment and fix these once the database schema is aligned
 
@@ -1,9 +1,9 @@
-from typing import Optional
-from datetime import datetime
+from typing import List, Optional
+from datetime import date, datetime, time
 
-from pydantic import BaseModel, PositiveInt, constr, field_validator
+from pydantic import BaseModel, Field, PositiveInt, constr, field_validator
 
-from app.models.shift import AssignmentStatus  # Removed ShiftName import as it's not used
+from app.models.shift import AssignmentStatus, ShiftName
 
 
 class ShiftBase(BaseModel):
@@ -59,6 +59,42 @@ class Shift(ShiftBase):
         from_attributes = True
 
 
+class ShiftTemplate(BaseModel):
+    type: ShiftName
+    name: Optional[str] = None
+    start: time
+    end: time  # at or before ``start`` means the shift ends the next day
+
+
+def _default_templates() -> List[ShiftTemplate]:
+    # Same day layout as the production data seeder
+    return [
+        ShiftTemplate(type=ShiftName.NIGHT, name="Night", start=time(0), end=time(8)),
+        ShiftTemplate(type=ShiftName.MORNING, name="Morning", start=time(8), end=time(16)),
+        ShiftTemplate(type=ShiftName.AFTERNOON, name="Afternoon", start=time(16), end=time(23, 59)),
+    ]
+
+
+class ShiftGenerate(BaseModel):
+    date_from: date
+    date_to: date  # inclusive
+    templates: List[ShiftTemplate] = Field(default_factory=_default_templates, min_length=1)
+    weekdays: Optional[List[int]] = None  # 0=Monday .. 6=Sunday; every day when omitted
+
+    @field_validator("weekdays")
+    @classmethod
+    def validate_weekdays(cls, v: Optional[List[int]]):
+        if v is not None and not all(0 <= d <= 6 for d in v):
+            raise ValueError("weekdays must be between 0 (Monday) and 6 (Sunday)")
+        return v
+
+
+class ShiftGenerateResult(BaseModel):
+    requested: int
+    created: int
+    skipped: int  # already existed
+
+
 class ShiftAssignmentBase(BaseModel):
     staff_id: PositiveInt
     shift_id: PositiveInt
@@ -79,6 +115,57 @@ class ShiftAssignment(ShiftAssignmentBase):
         from_attributes = True
 
 
+class ShiftAssignmentWithShift(ShiftAssignment):
+    shift: Shift
+
+
+class RosterStaff(BaseModel):
+    id: int
+    name: Optional[str] = None
+
+
+class WeeklyRoster(BaseModel):
+    week_start: date  # Monday
+    days: List[date]
+    staff: List[RosterStaff]
+    # cells[i][j]: shift types staff[i] works starting on days[j]
+    cells: List[List[List[str]]]
+
+
+class ShiftAssignmentPair(BaseModel):
+    staff_id: PositiveInt
+    shift_id: PositiveInt
+
+
+class BulkAssignmentAccepted(BaseModel):
+    index: int  # position in the request list
+    assignment: ShiftAssignment
+
+
+class BulkAssignmentRejected(BaseModel):
+    index: int
+    reason: str
+
+
+class BulkAssignmentResult(BaseModel):
+    accepted: List[BulkAssignmentAccepted]
+    rejected: List[BulkAssignmentRejected]
+
+
+class SwapExchange(BaseModel):
+    shift_id: int
+    start_time: datetime
+    end_time: datetime
+
+
+class SwapCandidate(BaseModel):
+    staff_id: int
+    name: Optional[str] = None
+    shifts_this_week: int
+    can_cover: bool  # could take the shift outright
+    exchanges: List[SwapExchange] = []  # own shifts the requester could take in return
+
+
 class ShiftSwapRequest(BaseModel):
     assignment_id: int
     target_staff_id: int
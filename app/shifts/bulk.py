@@ -0,0 +1,131 @@
+"""
+Bulk shift assignment.
+
+A batch of (staff, shift) pairs is checked with three set-based queries:
+the requested shifts, the requested staff, and the timelines of those
+staff around the requested weeks (app/shifts/timeline.py). Duplicates,
+overlaps and the weekly cap are then decided in memory by walking each
+staff member's timeline in shift order, so pairs of the same batch are checked
+against each other as well. Accepted pairs are written with one
+multi-row INSERT ... ON CONFLICT DO NOTHING on the active-assignment
+unique index.
+"""
+
+from datetime import datetime, time, timedelta
+from typing import List, Tuple
+
+from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.shift import AssignmentStatus, Shift, StaffShiftAssignment
+from app.models.users import User
+from app.schemas.shift import ShiftAssignment as ShiftAssignmentOut, ShiftAssignmentPair
+from app.shifts import cache
+from app.shifts.roster import week_start
+from app.shifts.timeline import StaffTimeline, load_timelines
+
+SHIFT_NOT_FOUND_DETAIL = "Shift not found."
+STAFF_NOT_FOUND_DETAIL = "Staff not found."
+ALREADY_ASSIGNED_DETAIL = "Staff is already assigned to this shift."
+OVERLAP_DETAIL = "Staff has overlapping shift."
+
+Row = Tuple[int, ShiftAssignmentPair]  # (index in the request, pair)
+
+
+def check(db: Session, pairs: List[ShiftAssignmentPair]) -> Tuple[List[Row], List[dict]]:
+    """Accept or reject every pair; earlier shifts win within a staff member's batch."""
+    shifts = {
+        row.id: row
+        for row in db.execute(
+            select(Shift.id, Shift.start_time, Shift.end_time).where(Shift.id.in_({p.shift_id for p in pairs}))
+        )
+    }
+    staff = set(db.scalars(select(User.id).where(User.id.in_({p.staff_id for p in pairs}))))
+
+    rejected: List[dict] = []
+    rows: List[Row] = []
+    for index, pair in enumerate(pairs):
+        if pair.shift_id not in shifts:
+            rejected.append({"index": index, "reason": SHIFT_NOT_FOUND_DETAIL})
+        elif pair.staff_id not in staff:
+            rejected.append({"index": index, "reason": STAFF_NOT_FOUND_DETAIL})
+        else:
+            rows.append((index, pair))
+    if not rows:
+        return [], rejected
+
+    # Existing active shifts of these staff in the requested weeks (for the
+    # cap) and reaching into them (for overlaps), in one query
+    requested = [shifts[pair.shift_id] for _, pair in rows]
+    window_start = datetime.combine(min(week_start(s.start_time) for s in requested), time())
+    window_end = max(
+        datetime.combine(max(week_start(s.start_time) for s in requested) + timedelta(days=7), time()),
+        max(s.end_time for s in requested),
+    )
+    timelines = load_timelines(db, {pair.staff_id for _, pair in rows}, window_start, window_end)
+
+    accepted: List[Row] = []
+    rows.sort(key=lambda row: (shifts[row[1].shift_id].start_time, row[0]))
+    for index, pair in rows:
+        shift = shifts[pair.shift_id]
+        timeline = timelines.get(pair.staff_id, StaffTimeline())
+        if timeline.holds(pair.shift_id):
+            rejected.append({"index": index, "reason": ALREADY_ASSIGNED_DETAIL})
+        elif not timeline.is_free(shift.start_time, shift.end_time):
+            rejected.append({"index": index, "reason": OVERLAP_DETAIL})
+        elif not timeline.under_cap(shift.start_time):
+            rejected.append({
+                "index": index,
+                "reason": f"Staff already has {timeline.shifts_in_week(shift.start_time)} shifts that week "
+                          f"(limit {settings.STAFF_MAX_SHIFTS_PER_WEEK}).",
+            })
+        else:
+            accepted.append((index, pair))
+            timelines[pair.staff_id] = timeline.with_shift(shift.start_time, shift.end_time, pair.shift_id)
+    return accepted, rejected
+
+
+def insert_rows(db: Session, rows: List[Row]) -> Tuple[List[Tuple[int, StaffShiftAssignment]], List[dict]]:
+    """
+    One multi-row INSERT ... ON CONFLICT DO NOTHING RETURNING; pairs the
+    unique index skips were assigned concurrently since the check.
+    """
+    if not rows:
+        return [], []
+    stmt = (
+        insert(StaffShiftAssignment)
+        .values([
+            {"staff_id": pair.staff_id, "shift_id": pair.shift_id, "status": AssignmentStatus.ASSIGNED}
+            for _, pair in rows
+        ])
+        .on_conflict_do_nothing(
+            index_elements=["staff_id", "shift_id"],
+            index_where=text("status IN ('ASSIGNED', 'SWAP_REQUESTED')"),
+        )
+        .returning(StaffShiftAssignment)
+    )
+    inserted = {(a.staff_id, a.shift_id): a for a in db.scalars(stmt)}
+    created, lost = [], []
+    for index, pair in rows:
+        assignment = inserted.get((pair.staff_id, pair.shift_id))
+        if assignment is None:
+            lost.append({"index": index, "reason": ALREADY_ASSIGNED_DETAIL})
+        else:
+            created.append((index, assignment))
+    return created, lost
+
+
+def assign(db: Session, pairs: List[ShiftAssignmentPair]) -> dict:
+    """Check and insert a batch; returns accepted and rejected pairs by index."""
+    accepted, rejected = check(db, pairs)
+    created, lost = insert_rows(db, accepted)
+    # Snapshot before commit expires the instances
+    snapshots = [(index, ShiftAssignmentOut.model_validate(a)) for index, a in created]
+    db.commit()
+    cache.invalidate_shifts(db, {a.shift_id for _, a in snapshots})
+    return {
+        "accepted": [{"index": index, "assignment": a} for index, a in sorted(snapshots, key=lambda r: r[0])],
+        "rejected": sorted(rejected + lost, key=lambda r: r["index"]),
+    }
@@ -0,0 +1,47 @@
+"""
+Cache of serialized weekly rosters.
+
+One entry per week (keyed by its Monday) holds the ready-to-send JSON
+body of GET /shifts/roster. The shift endpoints invalidate exactly the
+weeks a write touches: the week a shift starts in, before and after an
+update. Entries are per worker; the TTL bounds how long another worker's
+writes go unseen.
+"""
+
+from datetime import date
+from typing import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.shift import Shift
+from app.schemas.shift import WeeklyRoster
+from app.shifts.roster import week_start, weekly_roster
+
+_rosters = TTLCache(
+    "shift_roster",
+    maxsize=settings.ROSTER_CACHE_MAX_WEEKS,
+    ttl=settings.ROSTER_CACHE_TTL_SECONDS,
+)
+
+
+def get_roster(db: Session, monday: date) -> bytes:
+    return _rosters.get_or_set(
+        monday, lambda: WeeklyRoster.model_validate(weekly_roster(db, monday)).model_dump_json().encode()
+    )
+
+
+def invalidate(*moments) -> None:
+    """Drop the cached weeks containing each shift start (date or datetime)."""
+    for moment in moments:
+        if moment is not None:
+            _rosters.pop(week_start(moment))
+
+
+def invalidate_shifts(db: Session, shift_ids: Iterable[int]) -> None:
+    """Drop the cached weeks of several shifts, looked up in one query."""
+    shift_ids = set(shift_ids)
+    if shift_ids:
+        invalidate(*db.scalars(select(Shift.start_time).where(Shift.id.in_(shift_ids))))
@@ -0,0 +1,93 @@
+"""
+Shift roster generation and the weekly roster view.
+
+A day layout (one template per shift type) is stamped over a date range
+and written with a single multi-row INSERT ... ON CONFLICT DO NOTHING on
+the (start_time, type) unique key, so re-running a range only fills the
+gaps and a year of shifts is one round trip.
+
+The weekly roster is a staff x day matrix of the shift types each staff
+member works, built from one aggregate query grouped by (staff, day).
+"""
+
+from datetime import date, datetime, time, timedelta
+from typing import List
+
+from sqlalchemy import Date, String, cast, func, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert
+from sqlalchemy.orm import Session
+
+from app.core.conflict_detection import ACTIVE_ASSIGNMENT_STATUSES
+from app.models.shift import Shift, StaffShiftAssignment
+from app.models.users import User
+from app.schemas.shift import ShiftGenerate
+
+
+def expand(request: ShiftGenerate) -> List[dict]:
+    """Shift rows for every selected day in the range, in start order."""
+    weekdays = set(range(7) if request.weekdays is None else request.weekdays)
+    rows = []
+    for offset in range((request.date_to - request.date_from).days + 1):
+        day = request.date_from + timedelta(days=offset)
+        if day.weekday() not in weekdays:
+            continue
+        for template in request.templates:
+            start = datetime.combine(day, template.start)
+            end = datetime.combine(day, template.end)
+            if end <= start:
+                end += timedelta(days=1)
+            rows.append({"name": template.name, "start_time": start, "end_time": end, "type": template.type})
+    rows.sort(key=lambda row: (row["start_time"], row["type"].value))
+    return rows
+
+
+def generate(db: Session, request: ShiftGenerate) -> dict:
+    rows = expand(request)
+    created = 0
+    if rows:
+        stmt = (
+            insert(Shift)
+            .values(rows)
+            .on_conflict_do_nothing(constraint="uq_shifts_start_time_type")
+            .returning(Shift.id)
+        )
+        created = len(db.scalars(stmt).all())
+        db.commit()
+    return {"requested": len(rows), "created": created, "skipped": len(rows) - created}
+
+
+def week_start(moment) -> date:
+    """Monday of the week containing ``moment`` (a date or datetime)."""
+    day = moment.date() if isinstance(moment, datetime) else moment
+    return day - timedelta(days=day.weekday())
+
+
+def weekly_roster(db: Session, monday: date) -> dict:
+    """Staff x day matrix of active assignments for the week starting ``monday``."""
+    days = [monday + timedelta(days=i) for i in range(7)]
+    day = cast(Shift.start_time, Date)
+    rows = db.execute(
+        select(
+            StaffShiftAssignment.staff_id,
+            User.full_name,
+            day,
+            func.array_agg(aggregate_order_by(cast(Shift.type, String), Shift.start_time)),
+        )
+        .join(Shift, Shift.id == StaffShiftAssignment.shift_id)
+        .join(User, User.id == StaffShiftAssignment.staff_id)
+        .where(
+            StaffShiftAssignment.status.in_(ACTIVE_ASSIGNMENT_STATUSES),
+            Shift.start_time >= datetime.combine(monday, time()),
+            Shift.start_time < datetime.combine(monday + timedelta(days=7), time()),
+        )
+        .group_by(StaffShiftAssignment.staff_id, User.full_name, day)
+        .order_by(User.full_name, StaffShiftAssignment.staff_id, day)
+    ).all()
+
+    staff, cells = [], []
+    for staff_id, name, shift_day, types in rows:
+        if not staff or staff[-1]["id"] != staff_id:
+            staff.append({"id": staff_id, "name": name})
+            cells.append([[] for _ in days])
+        cells[-1][(shift_day - monday).days] = types
+    return {"week_start": monday, "days": days, "staff": staff, "cells": cells}
@@ -1,18 +1,53 @@
-from typing import List, Any
-from datetime import datetime
+from typing import List, Any, Optional, Union
+from datetime import date, datetime, time, timedelta
 from zoneinfo import ZoneInfo
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, contains_eager
 
 from app.core import deps
-from app.core.conflict_detection import validate_shift_overlap
+from app.core.conflict_detection import ACTIVE_ASSIGNMENT_STATUSES, StaffLoad, staff_shift_load
+from app.core.config import settings
+from app.core.http_cache import conditional_response
+from app.core.pagination import MAX_PAGE_SIZE, paginate
 from app.models.shift import Shift, StaffShiftAssignment, AssignmentStatus
 from app.models.users import User, UserRole
 from app.schemas import shift as schemas
+from app.schemas.pagination import CursorPage
+from app.shifts import bulk, cache, roster, swaps
 
 router = APIRouter()
 
+DUPLICATE_SHIFT_DETAIL = "A shift of this type already starts at that time."
+
+
+def _commit_shift(db: Session, detail: str = DUPLICATE_SHIFT_DETAIL) -> None:
+    """Commit; a unique key violation (duplicate shift or assignment) maps to 409."""
+    try:
+        db.commit()
+    except IntegrityError as exc:
+        db.rollback()
+        if getattr(exc.orig, "pgcode", None) != "23505":  # unique_violation
+            raise
+        raise HTTPException(status_code=409, detail=detail)
+
+
+def _check_staff_free(db: Session, staff_id: int, shift: Shift, overlap_detail: str) -> None:
+    """Reject (400) if the staff member has an overlapping active shift or is at the weekly cap."""
+    load = staff_shift_load(db, [staff_id], shift.start_time, shift.end_time).get(staff_id, StaffLoad())
+    if load.overlapping:
+        raise HTTPException(status_code=400, detail=overlap_detail)
+    if load.over_weekly_cap:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Staff already has {load.shifts_this_week} shifts that week "
+                   f"(limit {settings.STAFF_MAX_SHIFTS_PER_WEEK}).",
+        )
+
 
 @router.post("/", response_model=schemas.Shift)
 def create_shift(
@@ -26,23 +61,56 @@ def create_shift(
     """
     shift = Shift(**shift_in.model_dump())
     db.add(shift)
-    db.commit()
+    _commit_shift(db)
     db.refresh(shift)
+    cache.invalidate(shift.start_time)
     return shift
 
 
-@router.get("/", response_model=List[schemas.Shift])
-def list_shifts(
+@router.post("/generate", response_model=schemas.ShiftGenerateResult)
+def generate_shifts(
+    *,
     db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
+    request: schemas.ShiftGenerate,
+    current_user: User = Depends(deps.require_role([UserRole.ADMIN, UserRole.HR])),
+) -> Any:
+    """
+    Generate the shift roster for a date range (HR/Admin only).
+
+    Every selected day gets one shift per template (default: the standard
+    NIGHT/MORNING/AFTERNOON layout). Shifts that already exist for a type
+    and start time are skipped, so re-running a range is safe.
+    """
+    if request.date_to < request.date_from:
+        raise HTTPException(status_code=400, detail="date_to must not be before date_from.")
+    if (request.date_to - request.date_from).days >= settings.SHIFT_GENERATE_MAX_DAYS:
+        raise HTTPException(
+            status_code=400, detail=f"Generate at most {settings.SHIFT_GENERATE_MAX_DAYS} days at a time."
+        )
+    return roster.generate(db, request)
+
+
+@router.get("/", response_model=Union[List[schemas.Shift], CursorPage[schemas.Shift]])
+async def list_shifts(
+    db: AsyncSession = Depends(deps.get_async_db),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    start_from: Optional[datetime] = None,
+    start_to: Optional[datetime] = None,
     current_user: User = Depends(deps.require_role([UserRole.ADMIN, UserRole.HR, UserRole.DOCTOR, UserRole.STAFF])),
 ) -> Any:
     """
-    List all shifts (All authenticated users).
+    List all shifts ordered by (start_time, id) (All authenticated users).
+
+    Pass ``cursor`` (empty for the first page) for keyset pagination.
     """
-    shifts = db.query(Shift).offset(skip).limit(limit).all()
-    return shifts
+    stmt = select(Shift)
+    if start_from is not None:
+        stmt = stmt.where(Shift.start_time >= start_from)
+    if start_to is not None:
+        stmt = stmt.where(Shift.start_time < start_to)
+    return await paginate(db, stmt, [Shift.start_time, Shift.id], cursor=cursor, skip=skip, limit=limit)
 
 
 @router.put("/{shift_id}", response_model=schemas.Shift)
@@ -60,13 +128,15 @@ def update_shift(
     if not shift:
         raise HTTPException(status_code=404, detail="Shift not found")
 
+    previous_start = shift.start_time
     update_data = shift_in.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(shift, field, value)
 
     db.add(shift)
-    db.commit()
+    _commit_shift(db)
     db.refresh(shift)
+    cache.invalidate(previous_start, shift.start_time)
     return shift
 
 
@@ -87,8 +157,10 @@ def delete_shift(
     # Delete associated assignments first to avoid foreign key constraint
     db.query(StaffShiftAssignment).filter(StaffShiftAssignment.shift_id == shift_id).delete()
     
+    start_time = shift.start_time
     db.delete(shift)
     db.commit()
+    cache.invalidate(start_time)
     return {"detail": "Shift deleted"}
 
 
@@ -106,16 +178,7 @@ def assign_shift(
     if not shift:
         raise HTTPException(status_code=404, detail="Shift not found")
 
-    # Note: Skipping overlap validation as shift_date column doesn't exist in current schema
-    # is_valid = validate_shift_overlap(
-    #     db,
-    #     assignment_in.staff_id,
-    #     shift.shift_date,
-    #     shift.start_time,
-    #     shift.end_time,
-    # )
-    # if not is_valid:
-    #     raise HTTPException(status_code=400, detail="Staff has overlapping shift.")
+    _check_staff_free(db, assignment_in.staff_id, shift, "Staff has overlapping shift.")
 
     # Check if shift.required_staff_count exists (it doesn't in current DB schema)
     # Skipping capacity check as required_staff_count column doesn't exist
@@ -130,25 +193,115 @@ def assign_shift(
     # if active_assignments >= shift.required_staff_count:
     #     raise HTTPException(status_code=400, detail="Required staff count already reached for this shift.")
 
+    start_time = shift.start_time
     assignment = StaffShiftAssignment(**assignment_in.model_dump())
     db.add(assignment)
-    db.commit()
+    _commit_shift(db, bulk.ALREADY_ASSIGNED_DETAIL)
     db.refresh(assignment)
+    cache.invalidate(start_time)
     return assignment
 
 
-@router.get("/my-shifts", response_model=List[schemas.ShiftAssignment])
-def read_my_shifts(
+@router.post("/assign/bulk", response_model=schemas.BulkAssignmentResult)
+def bulk_assign_shifts(
+    *,
     db: Session = Depends(deps.get_db),
+    pairs: List[schemas.ShiftAssignmentPair] = Body(...),
+    current_user: User = Depends(deps.require_role([UserRole.ADMIN, UserRole.HR])),
+) -> Any:
+    """
+    Assign many (staff_id, shift_id) pairs at once, e.g. a month's roster.
+
+    Each pair is checked for a missing shift or staff member, an existing
+    assignment to the same shift, an overlapping active shift and the
+    weekly cap, against the database and the rest of the batch. Accepted
+    pairs are inserted together; the rest come back with a reason, both
+    keyed by their position in the request.
+    """
+    if len(pairs) > settings.BULK_SHIFT_ASSIGNMENT_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.BULK_SHIFT_ASSIGNMENT_MAX_ITEMS} assignments per request.",
+        )
+    return bulk.assign(db, pairs)
+
+
+_my_shifts_adapter = TypeAdapter(List[schemas.ShiftAssignmentWithShift])
+
+
+@router.get("/roster", response_model=schemas.WeeklyRoster)
+def read_weekly_roster(
+    request: Request,
+    db: Session = Depends(deps.get_primary_db),
+    week: date = Query(..., description="Any date in the week; weeks start on Monday"),
+    current_user: User = Depends(deps.require_role([UserRole.ADMIN, UserRole.HR, UserRole.DOCTOR])),
+) -> Any:
+    """
+    Staff x day grid of who works which shift in a week (Admin/HR/Doctor).
+
+    ``cells[i][j]`` lists the shift types ``staff[i]`` works starting on
+    ``days[j]``. Served from a per-week cache that shift writes invalidate;
+    supports If-None-Match.
+    """
+    return conditional_response(request, cache.get_roster(db, roster.week_start(week)))
+
+
+@router.get("/my-shifts", response_model=List[schemas.ShiftAssignmentWithShift])
+async def read_my_shifts(
+    request: Request,
+    db: AsyncSession = Depends(deps.get_async_db),
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
-    View personal shifts.
+    View personal shifts with their shift details, ordered by start time.
+
+    ``from``/``to`` (inclusive dates) filter on the shift start. Supports
+    If-None-Match: an unchanged result is answered with 304 and no body.
+    """
+    stmt = (
+        select(StaffShiftAssignment)
+        .join(StaffShiftAssignment.shift)
+        .options(contains_eager(StaffShiftAssignment.shift))
+        .where(StaffShiftAssignment.staff_id == current_user.id)
+        .order_by(Shift.start_time, StaffShiftAssignment.id)
+    )
+    if date_from is not None:
+        stmt = stmt.where(Shift.start_time >= datetime.combine(date_from, time()))
+    if date_to is not None:
+        stmt = stmt.where(Shift.start_time < datetime.combine(date_to + timedelta(days=1), time()))
+    assignments = (await db.execute(stmt)).scalars().all()
+    body = _my_shifts_adapter.dump_json(_my_shifts_adapter.validate_python(assignments, from_attributes=True))
+    return conditional_response(request, body)
+
+
+@router.get("/swap/candidates/{assignment_id}", response_model=List[schemas.SwapCandidate])
+def read_swap_candidates(
+    *,
+    db: Session = Depends(deps.get_db),
+    assignment_id: int,
+    exchange_days: int = Query(0, ge=0, le=settings.SWAP_EXCHANGE_MAX_DAYS),
+    current_user: User = Depends(deps.require_role([UserRole.ADMIN, UserRole.HR, UserRole.DOCTOR, UserRole.STAFF])),
+) -> Any:
+    """
+    Colleagues who could take this assignment's shift: free at that time and
+    under the weekly cap (can_cover), and/or holding a shift within
+    exchange_days of it that the requester could take in return.
     """
-    assignments = db.query(StaffShiftAssignment).filter(
-        StaffShiftAssignment.staff_id == current_user.id
-    ).all()
-    return assignments
+    row = db.execute(
+        select(StaffShiftAssignment, Shift)
+        .join(Shift, Shift.id == StaffShiftAssignment.shift_id)
+        .where(StaffShiftAssignment.id == assignment_id)
+    ).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Assignment not found")
+    assignment, shift = row
+    if current_user.role not in (UserRole.ADMIN, UserRole.HR) and assignment.staff_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not your shift")
+    if assignment.status not in ACTIVE_ASSIGNMENT_STATUSES:
+        raise HTTPException(status_code=400, detail="Assignment is no longer active")
+    return swaps.candidates(db, assignment.staff_id, shift, exchange_days)
 
 
 @router.post("/swap", response_model=schemas.ShiftAssignment)
@@ -209,17 +362,10 @@ def approve_swap(
     if not shift:
         raise HTTPException(status_code=404, detail="Associated shift not found")
 
-    # Validate target staff has no overlapping shift
-    # Note: shift_date doesn't exist in current schema, using start_time/end_time directly
-    # is_valid = validate_shift_overlap(
-    #     db,
-    #     assignment.target_staff_id,
-    #     shift.shift_date,
-    #     shift.start_time,
-    #     shift.end_time,
-    # )
-    # if not is_valid:
-    #     raise HTTPException(status_code=400, detail="Target staff has overlapping shift. Cannot approve swap.")
+    # Validate target staff has no overlapping shift and is under the weekly cap
+    _check_staff_free(
+        db, assignment.target_staff_id, shift, "Target staff has overlapping shift. Cannot approve swap."
+    )
 
     # Mark original assignment as swapped
     assignment.status = "SWAPPED"  # Use correct database enum value
@@ -230,7 +376,9 @@ def approve_swap(
         shift_id=assignment.shift_id,
         status="ASSIGNED",  # Use correct database enum value
     )
+    start_time = shift.start_time
     db.add(new_assignment)
     db.commit()
     db.refresh(new_assignment)
+    cache.invalidate(start_time)
     return new_assignment
@@ -0,0 +1,94 @@
+"""
+Swap candidates.
+
+Who could take a given assignment's shift? The requester's colleagues
+(active users of the same role) are loaded in one query and their
+timelines around the shift in another (app/shifts/timeline.py); every
+candidate is then decided in memory:
+
+  can_cover   no overlapping active shift and below the weekly cap, so the
+              swap can be approved as it stands
+  exchanges   shifts the candidate holds within ``exchange_days`` of the
+              requested one that the two could trade - the requester is
+              free for it once their own shift is gone, the candidate is
+              free for the requested shift once theirs is gone, and
+              neither ends up over the weekly cap
+
+A candidate list for a roster of hundreds of staff therefore costs three
+queries regardless of its size.
+"""
+
+from datetime import datetime, time, timedelta
+from typing import List
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.shift import Shift
+from app.models.users import User
+from app.shifts.roster import week_start
+from app.shifts.timeline import StaffTimeline, load_timelines, week_of
+
+
+def _exchanges(requester: StaffTimeline, candidate: StaffTimeline, shift: Shift, exchange_days: int) -> List[dict]:
+    shift_id, shift_start, shift_end = shift.id, shift.start_time, shift.end_time
+    earliest = shift_start - timedelta(days=exchange_days)
+    latest = shift_start + timedelta(days=exchange_days)
+    same_week = week_start(shift_start)
+    found = []
+    for start, end, other_id in candidate.shifts:
+        if not earliest <= start <= latest or other_id == shift_id or requester.holds(other_id):
+            continue
+        # Trading within one week leaves both weekly counts unchanged
+        traded = 1 if week_of(start) == same_week else 0
+        if (
+            requester.is_free(start, end, ignoring=shift_id)
+            and requester.under_cap(start, giving_up=traded)
+            and candidate.is_free(shift_start, shift_end, ignoring=other_id)
+            and candidate.under_cap(shift_start, giving_up=traded)
+        ):
+            found.append({"shift_id": other_id, "start_time": start, "end_time": end})
+    return found
+
+
+def candidates(db: Session, requester_id: int, shift: Shift, exchange_days: int = 0) -> List[dict]:
+    """
+    Colleagues of ``requester_id`` who could cover ``shift`` outright or
+    trade one of their shifts for it; those who can cover come first, then
+    the least loaded that week.
+    """
+    role = db.scalar(select(User.role).where(User.id == requester_id))
+    colleagues = db.execute(
+        select(User.id, User.full_name).where(
+            User.role == role, User.is_active.is_(True), User.id != requester_id
+        )
+    ).all()
+
+    first = shift.start_time - timedelta(days=exchange_days)
+    last = shift.start_time + timedelta(days=exchange_days)
+    timelines = load_timelines(
+        db,
+        [requester_id, *(c.id for c in colleagues)],
+        datetime.combine(week_start(first), time()),
+        # A day's margin so exchanged shifts ending next week still see overlaps
+        max(datetime.combine(week_start(last), time()) + timedelta(days=8), shift.end_time),
+    )
+    requester = timelines.get(requester_id, StaffTimeline())
+
+    found = []
+    for colleague in colleagues:
+        timeline = timelines.get(colleague.id, StaffTimeline())
+        if timeline.holds(shift.id):
+            continue
+        can_cover = timeline.is_free(shift.start_time, shift.end_time) and timeline.under_cap(shift.start_time)
+        exchanges = _exchanges(requester, timeline, shift, exchange_days) if exchange_days else []
+        if can_cover or exchanges:
+            found.append({
+                "staff_id": colleague.id,
+                "name": colleague.full_name,
+                "shifts_this_week": timeline.shifts_in_week(shift.start_time),
+                "can_cover": can_cover,
+                "exchanges": exchanges,
+            })
+    found.sort(key=lambda c: (not c["can_cover"], c["shifts_this_week"], c["staff_id"]))
+    return found
@@ -0,0 +1,88 @@
+"""
+Per-staff shift timelines.
+
+One query loads every active assignment (joined to its shift) of a set
+of staff within a time window and builds, per staff member, an
+IntervalSet of their shifts (ids are shift ids) plus shift counts per
+week. Overlap and weekly-cap questions are then answered in memory -
+for a whole batch of assignments or a whole roster of swap candidates -
+without a query per staff member.
+
+Weekly counts are exact for weeks lying entirely inside the window.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from datetime import date, datetime
+from typing import Dict, Iterable, Mapping, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.conflict_detection import ACTIVE_ASSIGNMENT_STATUSES
+from app.core.interval_index import IntervalSet
+from app.models.shift import Shift, StaffShiftAssignment
+from app.shifts.roster import week_start
+
+# Shifts start at a handful of distinct times, so the week lookups made
+# per row and per candidate are nearly always hits
+week_of = lru_cache(maxsize=4096)(week_start)
+
+
+@dataclass(frozen=True)
+class StaffTimeline:
+    shifts: IntervalSet = IntervalSet()
+    weekly: Mapping[date, int] = field(default_factory=dict)  # week (Monday) -> active shifts
+
+    def holds(self, shift_id: int) -> bool:
+        return shift_id in self.shifts.ids
+
+    def is_free(self, start: datetime, end: datetime, ignoring: Optional[int] = None) -> bool:
+        """No shift overlaps [start, end), not counting shift ``ignoring`` (one being given away)."""
+        return not self.shifts.overlaps(start, end, ignoring)
+
+    def shifts_in_week(self, moment) -> int:
+        return self.weekly.get(week_of(moment), 0)
+
+    def under_cap(self, moment, giving_up: int = 0) -> bool:
+        """Room for one more shift in the week of ``moment`` after giving up ``giving_up`` there."""
+        return self.shifts_in_week(moment) - giving_up < settings.STAFF_MAX_SHIFTS_PER_WEEK
+
+    def with_shift(self, start: datetime, end: datetime, shift_id: int) -> "StaffTimeline":
+        weekly = dict(self.weekly)
+        weekly[week_of(start)] = weekly.get(week_of(start), 0) + 1
+        return StaffTimeline(self.shifts.with_interval(start, end, shift_id), weekly)
+
+
+def load_timelines(
+    db: Session,
+    staff_ids: Iterable[int],
+    window_start: datetime,
+    window_end: datetime,
+) -> Dict[int, StaffTimeline]:
+    """Timelines of shifts overlapping [window_start, window_end); staff without any are absent."""
+    staff_ids = set(staff_ids)
+    if not staff_ids:
+        return {}
+    held: Dict[int, list] = defaultdict(list)
+    weekly: Dict[int, Dict[date, int]] = defaultdict(dict)
+    for staff_id, shift_id, start, end in db.execute(
+        select(StaffShiftAssignment.staff_id, Shift.id, Shift.start_time, Shift.end_time)
+        .join(Shift, Shift.id == StaffShiftAssignment.shift_id)
+        .where(
+            StaffShiftAssignment.staff_id.in_(staff_ids),
+            StaffShiftAssignment.status.in_(ACTIVE_ASSIGNMENT_STATUSES),
+            Shift.start_time < window_end,
+            Shift.end_time > window_start,
+        )
+    ):
+        held[staff_id].append((start, end, shift_id))
+        counts = weekly[staff_id]
+        week = week_of(start)
+        counts[week] = counts.get(week, 0) + 1
+    return {
+        staff_id: StaffTimeline(IntervalSet.build(intervals), weekly[staff_id])
+        for staff_id, intervals in held.items()
+    }
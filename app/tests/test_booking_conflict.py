@@ -0,0 +1,59 @@
+import os
+import sys
+from datetime import date
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+
+from app.core import interval_index
+from app.core.conflict_detection import BOOKING_CONFLICT_CONSTRAINT
+from app.scheduling.bulk import BOOKING_CONFLICT_DETAIL
+from app.scheduling.router import _commit_booking
+
+DAY = date(2031, 3, 4)
+
+
+def _integrity_error(pgcode: str, constraint: str) -> IntegrityError:
+    orig = SimpleNamespace(pgcode=pgcode, diag=SimpleNamespace(constraint_name=constraint))
+    return IntegrityError("INSERT INTO appointments ...", {}, orig)
+
+
+def _failing_session(exc: IntegrityError) -> mock.Mock:
+    db = mock.Mock()
+    db.commit.side_effect = exc
+    return db
+
+
+def test_exclusion_violation_becomes_409_and_drops_the_cached_day():
+    interval_index._index.set((7, DAY), "stale")
+    db = _failing_session(_integrity_error("23P01", BOOKING_CONFLICT_CONSTRAINT))
+
+    with pytest.raises(HTTPException) as exc:
+        _commit_booking(db, SimpleNamespace(doctor_id=7, appointment_date=DAY))
+
+    assert exc.value.status_code == 409
+    assert exc.value.detail == BOOKING_CONFLICT_DETAIL
+    db.rollback.assert_called_once()
+    assert interval_index._index.get((7, DAY)) is None
+
+
+@pytest.mark.parametrize("pgcode, constraint", [
+    ("23505", "uq_something"),  # unique violation
+    ("23P01", "ex_some_other_table"),  # another exclusion constraint
+])
+def test_other_integrity_errors_propagate(pgcode, constraint):
+    error = _integrity_error(pgcode, constraint)
+    db = _failing_session(error)
+
+    with pytest.raises(IntegrityError) as exc:
+        _commit_booking(db, SimpleNamespace(doctor_id=7, appointment_date=DAY))
+
+    assert exc.value is error
+    db.rollback.assert_called_once()
@@ -0,0 +1,46 @@
+import os
+import sys
+from datetime import date, time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from app.core.interval_index import DoctorDay, IntervalSet
+from app.scheduling.bulk import sweep, validate_items
+
+DAY = date(2031, 3, 3)
+
+
+def _item(start: str, end: str, **overrides) -> dict:
+    return {
+        "patient_id": 1, "doctor_id": 7, "appointment_date": DAY.isoformat(),
+        "start_time": start, "end_time": end,
+        "patient_name": "p", "patient_phone": "1", "patient_gender": "Male", "patient_age": 30,
+        "appointment_type": "Consultation", "reason_for_visit": "x", **overrides,
+    }
+
+
+def test_invalid_rows_are_reported_by_index():
+    rows, rejected = validate_items([_item("09:00", "09:30"), _item("10:00", "09:00"), {"doctor_id": 7}])
+    assert [index for index, _ in rows] == [0]
+    assert [r["index"] for r in rejected] == [1, 2]
+    assert rejected[0]["errors"][0]["loc"] == ["end_time"]
+
+
+def test_sweep_rejects_existing_and_in_batch_overlaps():
+    days = {(7, DAY): DoctorDay(((time(9), time(17)),), IntervalSet.build([(time(12), time(13), 99)]))}
+    rows, _ = validate_items([
+        _item("10:15", "10:45"),  # 0: overlaps row 1, which starts earlier
+        _item("10:00", "10:30"),  # 1: accepted
+        _item("10:30", "11:00"),  # 2: accepted, touches row 1 only
+        _item("12:30", "13:00"),  # 3: overlaps existing booking 99
+        _item("16:30", "17:30"),  # 4: outside working hours
+        _item("09:00", "09:30", appointment_date="2020-01-01"),  # 5: in the past
+    ])
+    accepted, rejected = sweep(rows, days, earliest_date=date(2031, 1, 1))
+    assert sorted(index for index, _ in accepted) == [1, 2]
+    reasons = {r["index"]: r["reason"] for r in rejected}
+    assert reasons[0] == "Overlaps row 1 of this batch."
+    assert "already has an appointment" in reasons[3]
+    assert "not available" in reasons[4]
+    assert "past" in reasons[5]
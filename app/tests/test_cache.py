@@ -0,0 +1,42 @@
+import os
+import sys
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from app.core.cache import TTLCache, cache_stats
+from app.core import deps
+from app.core.security import create_access_token
+
+
+def test_ttl_cache_lru_and_counters():
+    cache = TTLCache("test_lru", maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "a" is now most recently used
+    cache.set("c", 3)           # evicts "b"
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+    stats = cache_stats()["test_lru"]
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["evictions"] == 1
+
+
+def test_ttl_cache_expiry():
+    cache = TTLCache("test_expiry", maxsize=10, ttl=0.01)
+    cache.set("k", "v")
+    assert cache.get("k") == "v"
+    time.sleep(0.02)
+    assert cache.get("k") is None
+
+
+def test_decoded_token_is_memoized():
+    token = create_access_token(subject="memo@test.com")
+    assert deps._decode_token(token) == "memo@test.com"
+    hits = deps._token_cache.hits
+    assert deps._decode_token(token) == "memo@test.com"
+    assert deps._token_cache.hits == hits + 1
+    assert deps._decode_token("not-a-token") is None
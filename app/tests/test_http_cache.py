@@ -0,0 +1,28 @@
+import os
+import sys
+
+from starlette.requests import Request
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from app.core.http_cache import conditional_response, make_etag
+
+
+def _request(if_none_match=None) -> Request:
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "headers": headers})
+
+
+def test_conditional_response_answers_304_for_a_known_etag():
+    body = b'[{"id": 1}]'
+    etag = make_etag(body)
+
+    fresh = conditional_response(_request(), body)
+    assert fresh.status_code == 200 and fresh.body == body and fresh.headers["etag"] == etag
+
+    for header in (etag, f'"other", W/{etag}', "*"):
+        cached = conditional_response(_request(header), body)
+        assert cached.status_code == 304 and cached.body == b""
+
+    assert conditional_response(_request('"stale"'), body).status_code == 200
@@ -0,0 +1,99 @@
+import csv
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from app.imports.pipeline import _chunks, _validate
+from app.imports.readers import read
+from app.models.users import UserRole
+from app.schemas.room import RoomCreate
+from app.schemas.users import UserCreate
+
+
+def _write(tmp_path, name: str, text) -> str:
+    path = tmp_path / name
+    path.write_bytes(text.encode("utf-8") if isinstance(text, str) else text)
+    return str(path)
+
+
+def test_csv_records_carry_their_line_and_malformed_rows_are_flagged(tmp_path):
+    path = _write(tmp_path, "rooms.csv", (
+        "room_number,ward_name,room_type,bed_capacity,floor_number\n"
+        "G1,General,General,2,1\n"
+        "G2,General,,x,1\n"
+        "G3,General,General,2,1,extra\n"
+    ))
+    records = list(read(path, "csv"))
+    assert [r.line for r in records] == [2, 3, 4]
+    assert "room_type" not in records[1].data  # empty cell
+    assert records[2].error == "1 more cells than header columns"
+
+    rows, rejects = _validate(RoomCreate, records)
+    assert [line for line, _ in rows] == [2]
+    assert [line for line, _ in rejects] == [3, 4]
+    assert "bed_capacity" in rejects[0][1]
+
+
+def test_ndjson_skips_blank_lines_and_rejects_non_objects(tmp_path):
+    path = _write(tmp_path, "users.ndjson", '{"email": "a@example.com"}\n\nnot json\n[1, 2]\n')
+    records = list(read(path, "ndjson"))
+    assert [(r.line, r.error is None) for r in records] == [(1, True), (3, False), (4, False)]
+    assert records[1].error.startswith("Invalid JSON")
+    assert records[2].error == "Expected a JSON object"
+
+
+def test_empty_cells_fall_back_to_defaults(tmp_path):
+    rooms = _write(tmp_path, "rooms.csv", (
+        "room_number,ward_name,room_type,bed_capacity,floor_number,is_active\n"
+        "G1,General,General,2,1,\n"
+    ))
+    (_, room), = _validate(RoomCreate, list(read(rooms, "csv")))[0]
+    assert room.is_active is True
+
+    users = _write(tmp_path, "users.csv", "email,password,role,full_name\na@example.com,pw,,\n")
+    (_, user), = _validate(UserCreate, list(read(users, "csv")))[0]
+    assert user.role == UserRole.STAFF
+    assert user.full_name is None
+
+
+def test_undecodable_and_nul_lines_are_rejected_individually(tmp_path):
+    path = _write(tmp_path, "rooms.csv", (
+        b"room_number,ward_name\n"
+        b"G1,General\n"
+        b"G2,Gen\xfferal\n"
+        b"G3,Gen\x00eral\n"
+        b"G4,General\n"
+    ))
+    records = list(read(path, "csv"))
+    assert [(r.line, r.error) for r in records] == [
+        (2, None), (3, "Not valid UTF-8"), (4, "Contains a NUL character"), (5, None),
+    ]
+
+    path = _write(tmp_path, "users.ndjson", (
+        b'{"email": "a@example.com"}\n'
+        b'{"email": "\xff@example.com"}\n'
+        b'{"email": "\\u0000@example.com"}\n'
+        b'{"email": "b@example.com"}\n'
+    ))
+    records = list(read(path, "ndjson"))
+    assert [(r.line, r.error) for r in records] == [
+        (1, None), (2, "Not valid UTF-8"), (3, "Contains a NUL character"), (4, None),
+    ]
+
+
+def test_malformed_csv_row_is_rejected_and_reading_continues(tmp_path):
+    path = _write(tmp_path, "rooms.csv", "room_number,ward_name\nG1,General\nG2," + "x" * 50 + "\nG3,ICU\n")
+    limit = csv.field_size_limit(20)
+    try:
+        records = list(read(path, "csv"))
+    finally:
+        csv.field_size_limit(limit)
+    assert [r.line for r in records] == [2, 3, 4]
+    assert records[1].error.startswith("Malformed CSV")
+    assert records[2].data == {"room_number": "G3", "ward_name": "ICU"}
+
+
+def test_chunks():
+    assert [len(c) for c in _chunks(range(5), 2)] == [2, 2, 1]
@@ -0,0 +1,42 @@
+import os
+import random
+import sys
+from datetime import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from app.core.conflict_detection import check_time_overlap
+from app.core.interval_index import DoctorDay, IntervalSet
+
+
+def t(minutes: int) -> time:
+    return time(minutes // 60, minutes % 60)
+
+
+def test_interval_set_matches_linear_scan():
+    rng = random.Random(7)
+    rows = []
+    for i in range(200):
+        start = rng.randrange(0, 23 * 60)
+        rows.append((t(start), t(min(start + rng.randrange(5, 120), 23 * 60 + 59)), i))
+    index = IntervalSet.build(rows)
+
+    for _ in range(500):
+        start = rng.randrange(0, 23 * 60)
+        q_start, q_end = t(start), t(min(start + rng.randrange(5, 90), 23 * 60 + 59))
+        expected = {i for s, e, i in rows if check_time_overlap(q_start, q_end, s, e)}
+        assert set(index.overlapping(q_start, q_end)) == expected
+
+
+def test_doctor_day_write_through_and_exclusion():
+    day = DoctorDay(windows=((time(9), time(17)),), bookings=IntervalSet.build([(time(10), time(11), 1)]))
+    assert not day.is_free(time(8), time(9, 30))           # outside working hours
+    assert not day.is_free(time(10, 30), time(11, 30))     # overlaps booking 1
+    assert day.is_free(time(11), time(12))                 # touching is not overlapping
+    assert day.is_free(time(10, 30), time(11, 30), exclude_appointment_id=1)
+
+    moved = DoctorDay(day.windows, day.bookings.with_interval(time(14), time(15), 1))
+    assert len(moved.bookings) == 1
+    assert moved.is_free(time(10), time(11))
+    assert not moved.is_free(time(14, 30), time(16))
@@ -0,0 +1,30 @@
+import os
+import sys
+import threading
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from app.workers import jobs
+
+
+def _wait(job, status):
+    deadline = time.monotonic() + 5
+    while job.status != status and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert job.status == status
+
+
+def test_retention_starts_when_the_job_finishes(monkeypatch):
+    monkeypatch.setattr(jobs.settings, "JOB_RETENTION_SECONDS", 0)
+    release = threading.Event()
+    job = jobs.submit_job("test", lambda job: release.wait(5) and {"done": True})
+    _wait(job, "running")
+    time.sleep(0.01)
+    assert jobs.get_job(job.id) is job  # older than the retention, but still running
+
+    release.set()
+    _wait(job, "succeeded")
+    time.sleep(0.01)
+    assert jobs.get_job(job.id) is None
@@ -0,0 +1,35 @@
+import os
+import sys
+import threading
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from app.core.metrics import Counter, Histogram, render
+
+
+def test_counter_sums_thread_shards():
+    counter = Counter("test_counter_total", "test", ["kind"])
+
+    def work():
+        for _ in range(1000):
+            counter.inc(("a",))
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert counter.values() == {("a",): 4000}
+
+
+def test_histogram_buckets_are_cumulative():
+    hist = Histogram("test_latency_seconds", "test", ["route"], buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        hist.observe(value, ("/x",))
+
+    text = render()
+    assert 'test_latency_seconds_bucket{route="/x",le="0.1"} 2' in text
+    assert 'test_latency_seconds_bucket{route="/x",le="1.0"} 3' in text
+    assert 'test_latency_seconds_bucket{route="/x",le="+Inf"} 4' in text
+    assert 'test_latency_seconds_count{route="/x"} 4' in text
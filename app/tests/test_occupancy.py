@@ -0,0 +1,27 @@
+import os
+import sys
+from datetime import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from app.core.interval_index import DoctorDay, IntervalSet, inner_bits, span_bits
+from app.scheduling.occupancy import runs
+
+
+def test_span_and_inner_bits_round_outwards_and_inwards():
+    assert span_bits(time(10, 2), time(10, 11)) == 0b111 << 120
+    assert inner_bits(time(10, 2), time(10, 11)) == 0b1 << 121
+    assert inner_bits(time(10, 2), time(10, 4)) == 0
+
+
+def test_free_bits_follow_bookings():
+    day = DoctorDay(((time(9), time(10)),), IntervalSet.build([(time(9, 20), time(9, 30), 1)]))
+    assert list(runs(day.free_bits)) == [(108, 112), (114, 120)]
+    moved = DoctorDay(day.windows, day.bookings.with_interval(time(9, 40), time(9, 45), 1))
+    assert list(runs(moved.free_bits)) == [(108, 116), (117, 120)]
+    assert list(runs(DoctorDay(day.windows, day.bookings.without(1)).free_bits)) == [(108, 120)]
+
+
+def test_runs_handles_high_bits():
+    assert list(runs((1 << 287) | (1 << 286) | 1)) == [(0, 1), (286, 288)]
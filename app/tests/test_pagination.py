@@ -0,0 +1,32 @@
+import os
+import sys
+from datetime import date, datetime, time
+
+import pytest
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from fastapi import HTTPException
+from app.core.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip_preserves_types():
+    values = [date(2024, 5, 1), time(9, 30), datetime(2024, 5, 1, 9, 30), 42]
+    cursor = encode_cursor(values)
+    assert "=" not in cursor
+    assert decode_cursor(cursor, [date, time, datetime, int]) == values
+
+
+def test_invalid_cursor_is_rejected():
+    with pytest.raises(HTTPException):
+        decode_cursor("garbage!", [int, int])
+    with pytest.raises(HTTPException):
+        decode_cursor(encode_cursor([1, 2]), [int, int, int])
+
+
+@pytest.mark.parametrize("values", [["1"], [True], [1.5], [None], [{"d": "2024-05-01"}], [[1]]])
+def test_cursor_with_wrong_types_is_rejected(values):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(encode_cursor(values), [int])
+    assert exc.value.status_code == 400
@@ -0,0 +1,67 @@
+import os
+import sys
+
+import pytest
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from app.core.query_tracker import QueryTrackerMiddleware, assert_max_queries, track
+
+engine = create_engine("sqlite://")
+
+app = FastAPI()
+app.add_middleware(QueryTrackerMiddleware)
+
+
+@app.get("/sync/{n}")
+def run_sync(n: int):
+    with engine.connect() as conn:
+        for i in range(n):
+            conn.execute(text("SELECT :i"), {"i": i})
+
+
+@app.get("/async/{n}")
+async def run_async(n: int):
+    with engine.connect() as conn:
+        for i in range(n):
+            conn.execute(text("SELECT :i"), {"i": i})
+
+
+client = TestClient(app)
+
+
+def test_repeated_statements_are_flagged():
+    with track() as stats:
+        with engine.connect() as conn:
+            for i in range(6):
+                conn.execute(text("SELECT :i"), {"i": i})
+            conn.execute(text("SELECT 1"))
+    assert stats.count == 7
+    assert stats.repeated(5) == [("SELECT ?", 6)]
+
+
+def test_query_budget_is_enforced():
+    with assert_max_queries(2):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    with pytest.raises(AssertionError, match="at most 1 queries"):
+        with assert_max_queries(1):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                conn.execute(text("SELECT 2"))
+
+
+@pytest.mark.parametrize("kind", ["sync", "async"])
+def test_query_budget_covers_requests_through_the_middleware(kind):
+    with assert_max_queries(3) as stats:
+        client.get(f"/{kind}/3")
+    assert stats.count == 3
+
+    with pytest.raises(AssertionError, match="at most 3 queries"):
+        with assert_max_queries(3):
+            client.get(f"/{kind}/4")
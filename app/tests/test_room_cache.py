@@ -0,0 +1,28 @@
+import os
+import sys
+from datetime import datetime
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from app.models.room import RoomType
+from app.rooms import cache
+from app.schemas.room import Room
+
+
+def _room(number: str) -> Room:
+    now = datetime(2031, 1, 1)
+    return Room(id=1, room_number=number, ward_name="ICU", room_type=RoomType.ICU, bed_capacity=1,
+                floor_number=2, created_at=now, updated_at=now)
+
+
+def test_write_through_follows_renames_and_deletes():
+    cache.remember(_room("ICU01"))
+    assert cache.get_room(None, "ICU01").room_number == "ICU01"  # served without a session
+
+    cache.remember(_room("ICU09"), previous_number="ICU01")
+    assert cache._rooms.get("ICU01") is None
+    assert cache.get_room(None, "ICU09").room_number == "ICU09"
+
+    cache.forget("ICU09")
+    assert cache._rooms.get("ICU09") is None
@@ -0,0 +1,36 @@
+import os
+import sys
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from app.models.room import RoomType
+from app.rooms import capacity
+
+
+class _Recorder:
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, stmt):
+        self.statements.append(stmt.compile(dialect=postgresql.dialect()))
+
+
+def test_state_accepts_enum_names_from_raw_rows():
+    row = SimpleNamespace(ward_name="ICU", floor_number=2, room_type="ICU", bed_capacity=1, is_active=True)
+    assert capacity.state(row) == ("ICU", 2, RoomType.ICU, 1, True)
+
+
+def test_apply_nets_out_deltas():
+    db = _Recorder()
+    room = ("General", 1, RoomType.GENERAL, 4, True)
+    capacity.apply(db, room, room)
+    assert db.statements == []  # nothing the counters depend on changed
+
+    capacity.apply(db, room, ("General", 1, RoomType.GENERAL, 4, False))
+    (stmt,) = db.statements
+    assert "ON CONFLICT (ward_name, floor_number, room_type) DO UPDATE" in str(stmt)
+    assert [v for k, v in stmt.params.items() if k.startswith(("rooms", "active_rooms", "beds", "active_beds"))] == [0, -1, 0, -4]
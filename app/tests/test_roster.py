@@ -0,0 +1,28 @@
+import os
+import sys
+from datetime import date, datetime
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from app.models.shift import ShiftName
+from app.schemas.shift import ShiftGenerate
+from app.shifts.roster import expand
+
+
+def test_default_layout_covers_each_day():
+    rows = expand(ShiftGenerate(date_from=date(2031, 1, 1), date_to=date(2031, 12, 31)))
+    assert len(rows) == 365 * 3
+    assert [row["type"] for row in rows[:3]] == [ShiftName.NIGHT, ShiftName.MORNING, ShiftName.AFTERNOON]
+
+
+def test_overnight_templates_and_weekdays():
+    rows = expand(ShiftGenerate(
+        date_from=date(2031, 3, 7), date_to=date(2031, 3, 10),  # Friday to Monday
+        weekdays=[0, 4],
+        templates=[{"type": "NIGHT", "start": "22:00", "end": "06:00"}],
+    ))
+    assert [(row["start_time"], row["end_time"]) for row in rows] == [
+        (datetime(2031, 3, 7, 22), datetime(2031, 3, 8, 6)),
+        (datetime(2031, 3, 10, 22), datetime(2031, 3, 11, 6)),
+    ]
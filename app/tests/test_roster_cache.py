@@ -0,0 +1,23 @@
+import os
+import sys
+from datetime import date, datetime
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from app.shifts import cache
+from app.shifts.roster import week_start
+
+
+def test_week_start_is_monday():
+    assert week_start(date(2031, 3, 9)) == date(2031, 3, 3)  # Sunday
+    assert week_start(datetime(2031, 3, 10, 23, 30)) == date(2031, 3, 10)
+
+
+def test_invalidate_drops_only_the_touched_weeks():
+    for monday in (date(2031, 3, 3), date(2031, 3, 10), date(2031, 3, 17)):
+        cache._rosters.set(monday, b"{}")
+    cache.invalidate(datetime(2031, 3, 9, 22, 0), None, date(2031, 3, 19))
+    assert cache._rosters.get(date(2031, 3, 3)) is None
+    assert cache._rosters.get(date(2031, 3, 10)) == b"{}"
+    assert cache._rosters.get(date(2031, 3, 17)) is None
@@ -0,0 +1,98 @@
+import os
+import sys
+import threading
+
+import pytest
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core import deps, security
+from app.core.security import HashingBusyError, HashingExecutor, pwd_context
+from app.main import app
+from app.models.users import User, UserRole
+
+engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+User.__table__.create(engine)
+TestSession = sessionmaker(bind=engine)
+
+
+def _get_db():
+    db = TestSession()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def client():
+    app.dependency_overrides[deps.get_db] = _get_db
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+
+def _add_user(email: str, hashed_password: str) -> None:
+    with TestSession() as db:
+        db.add(User(email=email, hashed_password=hashed_password, role=UserRole.STAFF, is_active=True))
+        db.commit()
+
+
+def _stored_hash(email: str) -> str:
+    with TestSession() as db:
+        return db.query(User.hashed_password).filter(User.email == email).scalar()
+
+
+def _saturated() -> tuple:
+    """An executor whose only slot is held until the returned event is set."""
+    executor = HashingExecutor(workers=1, queue_size=0, timeout=5)
+    release, started = threading.Event(), threading.Event()
+
+    def hold():
+        started.set()
+        release.wait(5)
+
+    threading.Thread(target=executor.run, args=(hold,), daemon=True).start()
+    started.wait(5)
+    return executor, release
+
+
+def test_saturated_executor_rejects_immediately():
+    executor, release = _saturated()
+    try:
+        with pytest.raises(HashingBusyError, match="saturated"):
+            executor.run(lambda: None)
+    finally:
+        release.set()
+
+
+def test_login_sheds_load_with_503(client, monkeypatch):
+    _add_user("busy@example.com", pwd_context.hash("pw"))
+    executor, release = _saturated()
+    monkeypatch.setattr(security, "hashing_executor", executor)
+    try:
+        response = client.post("/api/v1/login/access-token", data={"username": "busy@example.com", "password": "pw"})
+    finally:
+        release.set()
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_login_rehashes_outdated_parameters(client):
+    outdated = pwd_context.handler("argon2").using(memory_cost=1024).hash("pw")
+    assert pwd_context.needs_update(outdated)
+    _add_user("old@example.com", outdated)
+
+    response = client.post("/api/v1/login/access-token", data={"username": "old@example.com", "password": "pw"})
+    assert response.status_code == 200
+    upgraded = _stored_hash("old@example.com")
+    assert upgraded != outdated
+    assert not pwd_context.needs_update(upgraded)
+    assert pwd_context.verify("pw", upgraded)
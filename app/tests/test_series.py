@@ -0,0 +1,23 @@
+import os
+import sys
+from datetime import date
+
+import pytest
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from app.scheduling.series import expand
+
+
+def test_expand_weekly_and_monthly_rules():
+    assert expand("FREQ=WEEKLY;COUNT=3", date(2031, 3, 3)) == [date(2031, 3, 3), date(2031, 3, 10), date(2031, 3, 17)]
+    # Months without a 31st are skipped, as RFC 5545 requires
+    assert expand("RRULE:FREQ=MONTHLY;UNTIL=20310430", date(2031, 1, 31)) == [date(2031, 1, 31), date(2031, 3, 31)]
+
+
+def test_expand_rejects_unbounded_and_invalid_rules():
+    with pytest.raises(ValueError, match="more than 10"):
+        expand("FREQ=DAILY", date(2031, 3, 3), limit=10)
+    with pytest.raises(ValueError, match="Invalid recurrence rule"):
+        expand("FREQ=SOMETIMES", date(2031, 3, 3))
@@ -0,0 +1,45 @@
+import os
+import sys
+from datetime import datetime, timedelta
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.db import Base
+from app.core.query_tracker import assert_max_queries
+from app.models.shift import AssignmentStatus, Shift, ShiftName, StaffShiftAssignment
+from app.models.users import User, UserRole
+from app.schemas.shift import ShiftAssignmentPair
+from app.shifts.bulk import ALREADY_ASSIGNED_DETAIL, OVERLAP_DETAIL, SHIFT_NOT_FOUND_DETAIL, check
+
+engine = create_engine("sqlite://")
+Base.metadata.create_all(engine, tables=[User.__table__, Shift.__table__, StaffShiftAssignment.__table__])
+Session = sessionmaker(bind=engine)
+
+MONDAY = datetime(2030, 1, 7, 8, 0)
+
+
+def test_check_is_set_based_and_sees_the_batch():
+    with Session() as db:
+        db.add(User(id=1, email="s@x.com", hashed_password="x", full_name="s", role=UserRole.STAFF, is_active=True))
+        morning = Shift(start_time=MONDAY, end_time=MONDAY + timedelta(hours=8), type=ShiftName.MORNING)
+        late = Shift(start_time=MONDAY + timedelta(hours=4), end_time=MONDAY + timedelta(hours=12), type=ShiftName.AFTERNOON)
+        tuesday = Shift(start_time=MONDAY + timedelta(days=1), end_time=MONDAY + timedelta(days=1, hours=8),
+                        type=ShiftName.MORNING)
+        db.add_all([morning, late, tuesday])
+        db.flush()
+        db.add(StaffShiftAssignment(staff_id=1, shift_id=tuesday.id, status=AssignmentStatus.ASSIGNED))
+        db.flush()
+
+        pairs = [ShiftAssignmentPair(staff_id=1, shift_id=s) for s in (late.id, morning.id, tuesday.id, 999)]
+        with assert_max_queries(3):
+            accepted, rejected = check(db, pairs)
+
+        # The morning shift starts first and wins; the later, overlapping one is refused
+        assert [index for index, _ in accepted] == [1]
+        assert sorted((r["index"], r["reason"]) for r in rejected) == [
+            (0, OVERLAP_DETAIL), (2, ALREADY_ASSIGNED_DETAIL), (3, SHIFT_NOT_FOUND_DETAIL),
+        ]
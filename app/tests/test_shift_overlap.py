@@ -0,0 +1,56 @@
+import os
+import sys
+from datetime import datetime, timedelta
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.conflict_detection import staff_shift_load, validate_shift_overlap
+from app.core.db import Base
+from app.core.query_tracker import assert_max_queries
+from app.models.shift import AssignmentStatus, Shift, ShiftName, StaffShiftAssignment
+from app.models.users import User
+
+engine = create_engine("sqlite://")
+Base.metadata.create_all(engine, tables=[User.__table__, Shift.__table__, StaffShiftAssignment.__table__])
+Session = sessionmaker(bind=engine)
+
+MONDAY = datetime(2030, 1, 7, 8, 0)
+
+
+def _assign(db, staff_id, start, hours=8, status=AssignmentStatus.ASSIGNED):
+    # Shifts are unique per (start_time, type); staff share them
+    shift = db.query(Shift).filter_by(start_time=start, type=ShiftName.MORNING).first()
+    if shift is None:
+        shift = Shift(start_time=start, end_time=start + timedelta(hours=hours), type=ShiftName.MORNING)
+        db.add(shift)
+        db.flush()
+    db.add(StaffShiftAssignment(staff_id=staff_id, shift_id=shift.id, status=status))
+    db.flush()
+
+
+def test_overlap_and_weekly_cap_in_one_query():
+    with Session() as db:
+        _assign(db, 1, MONDAY)
+        _assign(db, 1, MONDAY + timedelta(days=1), status=AssignmentStatus.SWAPPED)  # no longer theirs
+        for day in range(2, 2 + settings.STAFF_MAX_SHIFTS_PER_WEEK - 1):
+            _assign(db, 2, MONDAY + timedelta(days=day))
+
+        with assert_max_queries(1):
+            loads = staff_shift_load(db, [1, 2, 3], MONDAY + timedelta(hours=4), MONDAY + timedelta(hours=12))
+
+        assert loads[1].overlapping == 1 and loads[1].shifts_this_week == 1
+        assert loads[2].overlapping == 0 and not loads[2].over_weekly_cap
+        assert 3 not in loads
+
+        assert not validate_shift_overlap(db, 1, MONDAY + timedelta(hours=4), MONDAY + timedelta(hours=12))
+        assert validate_shift_overlap(db, 1, MONDAY + timedelta(days=1), MONDAY + timedelta(days=1, hours=8))
+
+        _assign(db, 2, MONDAY + timedelta(days=6, hours=9))  # evening shift; reaches the cap
+        assert not validate_shift_overlap(db, 2, MONDAY, MONDAY + timedelta(hours=8))
+        # The following week is unaffected
+        assert validate_shift_overlap(db, 2, MONDAY + timedelta(days=7), MONDAY + timedelta(days=7, hours=8))
@@ -0,0 +1,28 @@
+import os
+import sys
+from datetime import time
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from app.core.interval_index import DoctorDay, IntervalSet
+from app.scheduling.slots import free_mask, run_starts
+
+
+def test_free_mask_respects_hours_and_bookings():
+    day = DoctorDay(((time(9), time(11, 10)),), IntervalSet.build([(time(9, 50), time(10, 20), 1)]))
+    mask = free_mask(day)
+    free = [i for i in np.flatnonzero(mask)]
+    # 09:00-09:45 free, 09:45-10:30 touched by the booking, 10:30-11:00 free, 11:00 slot ends past 11:10
+    assert free == [36, 37, 38, 42, 43]
+
+
+def test_run_starts_finds_every_row_at_once():
+    masks = np.array([
+        [1, 1, 1, 0, 1, 1],
+        [0, 1, 1, 1, 1, 0],
+    ], dtype=bool)
+    assert run_starts(masks, 2).tolist() == [[0, 0], [0, 1], [0, 4], [1, 1], [1, 2], [1, 3]]
+    assert run_starts(masks, 4).tolist() == [[1, 1]]
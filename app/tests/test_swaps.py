@@ -0,0 +1,44 @@
+import os
+import sys
+from datetime import datetime
+from types import SimpleNamespace
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from app.core.config import settings
+from app.core.interval_index import IntervalSet
+from app.shifts.swaps import _exchanges
+from app.shifts.timeline import StaffTimeline
+
+
+def _timeline(*shifts):
+    timeline = StaffTimeline()
+    for start, end, shift_id in shifts:
+        timeline = timeline.with_shift(start, end, shift_id)
+    return timeline
+
+
+def test_timeline_overlap_and_cap():
+    monday = datetime(2031, 3, 3, 8, 0)
+    timeline = _timeline(*((monday.replace(day=3 + d), monday.replace(day=3 + d, hour=16), d + 1)
+                           for d in range(settings.STAFF_MAX_SHIFTS_PER_WEEK)))
+    assert timeline.holds(1) and not timeline.holds(99)
+    assert not timeline.is_free(datetime(2031, 3, 3, 12), datetime(2031, 3, 3, 20))
+    assert timeline.is_free(datetime(2031, 3, 3, 12), datetime(2031, 3, 3, 20), ignoring=1)
+    assert not timeline.under_cap(datetime(2031, 3, 9, 20))
+    assert timeline.under_cap(datetime(2031, 3, 9, 20), giving_up=1)
+    assert timeline.under_cap(datetime(2031, 3, 10, 8))  # next week
+    assert isinstance(StaffTimeline().shifts, IntervalSet)
+
+
+def test_exchanges_respect_both_timelines():
+    shift = SimpleNamespace(id=1, start_time=datetime(2031, 3, 4, 8), end_time=datetime(2031, 3, 4, 16))
+    requester = _timeline((shift.start_time, shift.end_time, 1), (datetime(2031, 3, 6, 8), datetime(2031, 3, 6, 16), 2))
+    candidate = _timeline(
+        (datetime(2031, 3, 4, 12), datetime(2031, 3, 4, 20), 3),  # overlaps the shift: fine once traded away
+        (datetime(2031, 3, 6, 12), datetime(2031, 3, 6, 20), 4),  # requester busy then
+        (datetime(2031, 3, 20, 8), datetime(2031, 3, 20, 16), 5),  # outside the window
+    )
+    found = _exchanges(requester, candidate, shift, exchange_days=7)
+    assert [e["shift_id"] for e in found] == [3]
@@ -0,0 +1,32 @@
+import os
+import sys
+from types import SimpleNamespace
+
+from sqlalchemy import delete, insert, update
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from app.core import table_versions
+from app.models.room import Room
+
+
+def test_etag_changes_with_version_and_parts():
+    first = table_versions.etag(["rooms"], "/rooms/", "")
+    assert table_versions.etag(["rooms"], "/rooms/", "") == first
+    assert table_versions.etag(["rooms"], "/rooms/", "cursor=") != first
+
+    table_versions.bump(["users"])
+    assert table_versions.etag(["rooms"], "/rooms/", "") == first
+    table_versions.bump(["rooms"])
+    assert table_versions.etag(["rooms"], "/rooms/", "") != first
+
+
+def test_touch_and_dml_targets():
+    session = SimpleNamespace(info={})
+    table_versions.touch(session, "rooms")
+    table_versions.touch(session, "rooms", "users")
+    assert session.info["pending_tables"] == {"rooms", "users"}
+
+    for stmt in (insert(Room), update(Room).values(floor_number=1), delete(Room)):
+        assert table_versions.table_of(stmt) == "rooms"
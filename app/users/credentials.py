@@ -0,0 +1,129 @@
+"""
+Bulk credential pipeline.
+
+Hashes passwords in parallel across CPU cores and writes them back in
+chunks, committing after each chunk so no single transaction is held for
+the whole run. Used by the bulk password reset and bulk user import
+endpoints, which run it as a background job (app/workers/jobs.py).
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from sqlalchemy import Integer, String, column, func, select, update, values
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core import deps
+from app.core.config import settings
+from app.core.db import SessionLocal
+from app.core.security import pwd_context
+from app.models.users import User, UserRole
+from app.workers.jobs import Job
+
+_pool: ProcessPoolExecutor | None = None
+_pool_size = settings.BULK_HASH_PROCESSES or os.cpu_count() or 1
+
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # The server process is multi-threaded; forking it could copy a held lock
+        # into a child, so workers start from a fresh interpreter instead.
+        _pool = ProcessPoolExecutor(max_workers=_pool_size, mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+
+def hash_passwords(passwords: Sequence[str]) -> List[str]:
+    """Hash many passwords in parallel, preserving order."""
+    if not passwords:
+        return []
+    chunksize = max(1, len(passwords) // (4 * _pool_size))
+    return list(_get_pool().map(_hash, passwords, chunksize=chunksize))
+
+
+def _chunks(items: Sequence, size: int) -> Iterable[Sequence]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def write_password_hashes(db: Session, pairs: Sequence[Tuple[int, str]]) -> int:
+    """
+    Apply (user_id, hashed_password) pairs with one
+    UPDATE ... FROM (VALUES ...) statement. The caller owns the transaction.
+    """
+    if not pairs:
+        return 0
+    v = values(
+        column("id", Integer), column("hashed_password", String), name="v"
+    ).data(list(pairs))
+    users = User.__table__
+    result = db.execute(
+        update(users)
+        .where(users.c.id == v.c.id)
+        .values(hashed_password=v.c.hashed_password, updated_at=func.now())
+    )
+    return result.rowcount
+
+
+def reset_passwords_job(job: Job, password_map: Dict[UserRole, str], default_password: str) -> Dict:
+    """Background job: reset every user's password according to their role."""
+    db = SessionLocal()
+    try:
+        rows = db.execute(select(User.id, User.role).order_by(User.id)).all()
+        db.rollback()  # release the snapshot before the long hashing phase
+        job.total = len(rows)
+
+        updated = 0
+        for chunk in _chunks(rows, settings.BULK_CREDENTIAL_CHUNK_SIZE):
+            hashes = hash_passwords([password_map.get(role, default_password) for _, role in chunk])
+            updated += write_password_hashes(db, [(user_id, h) for (user_id, _), h in zip(chunk, hashes)])
+            db.commit()
+            job.advance(processed=len(chunk))
+    finally:
+        db.close()
+        deps.invalidate_all_principals()
+
+    return {"updated_count": updated}
+
+
+def import_users_job(job: Job, users: List[Dict]) -> Dict:
+    """
+    Background job: create users in chunks. Emails that already exist are
+    skipped (INSERT ... ON CONFLICT DO NOTHING) and reported.
+    """
+    db = SessionLocal()
+    created: List[str] = []
+    try:
+        for chunk in _chunks(users, settings.BULK_CREDENTIAL_CHUNK_SIZE):
+            hashes = hash_passwords([u["password"] for u in chunk])
+            rows = [
+                {
+                    "email": u["email"],
+                    "hashed_password": h,
+                    "full_name": u.get("full_name"),
+                    "role": u["role"],
+                    "is_active": u.get("is_active") if u.get("is_active") is not None else True,
+                }
+                for u, h in zip(chunk, hashes)
+            ]
+            inserted = db.scalars(
+                insert(User).values(rows).on_conflict_do_nothing(index_elements=[User.email]).returning(User.email)
+            ).all()
+            db.commit()
+            created.extend(inserted)
+            job.advance(processed=len(inserted), failed=len(chunk) - len(inserted))
+    finally:
+        db.close()
+
+    created_set = set(created)
+    return {
+        "created_count": len(created),
+        "skipped_existing": [u["email"] for u in users if u["email"] not in created_set],
+    }
@@ -1,13 +1,24 @@
-from typing import List, Any, Optional
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Any, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.core import deps
+from app.core.http_cache import not_modified, tagged_response, versioned_etag
+from app.core.pagination import MAX_PAGE_SIZE, paginate
 from app.core.security import get_password_hash
 from app.models.users import User, UserRole
+from app.schemas.job import Job as JobSchema
+from app.schemas.pagination import CursorPage
 from app.schemas.users import User as UserSchema, UserCreate, UserUpdate
+from app.users import credentials
+from app.workers.jobs import submit_job
 
 router = APIRouter()
 
+_users_adapter = TypeAdapter(Union[List[UserSchema], CursorPage[UserSchema]])
+
 
 @router.post("/register", response_model=UserSchema)
 def register_user(
@@ -64,18 +75,29 @@ def create_user(
     return user
 
 
-@router.get("/", response_model=List[UserSchema])
-def list_users(
-    db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
+@router.get("/", response_model=Union[List[UserSchema], CursorPage[UserSchema]])
+async def list_users(
+    request: Request,
+    db: AsyncSession = Depends(deps.get_primary_async_db),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     current_user: User = Depends(deps.require_role([UserRole.ADMIN, UserRole.HR])),
 ) -> Any:
     """
-    List all users (Admin/HR only).
+    List all users ordered by id (Admin/HR only).
+
+    Pass ``cursor`` (empty for the first page) for keyset pagination.
+    Supports If-None-Match: while no user changed the answer is 304
+    without a query.
     """
-    users = db.query(User).offset(skip).limit(limit).all()
-    return users
+    etag = versioned_etag(request, "users")
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    page = await paginate(db, select(User), [User.id], cursor=cursor, skip=skip, limit=limit)
+    body = _users_adapter.dump_json(_users_adapter.validate_python(page, from_attributes=True))
+    return tagged_response(request, body, etag)
 
 
 @router.get("/{user_id}", response_model=UserSchema)
@@ -107,6 +129,7 @@ def update_user(
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    previous_email = user.email
 
     update_data = user_in.model_dump(exclude_unset=True)
     if "password" in update_data and update_data["password"]:
@@ -120,6 +143,7 @@ def update_user(
     db.add(user)
     db.commit()
     db.refresh(user)
+    deps.invalidate_principal(previous_email, user.email)
     return user
 
 
@@ -141,6 +165,7 @@ def deactivate_user(
     db.add(user)
     db.commit()
     db.refresh(user)
+    deps.invalidate_principal(user.email)
     return user
 
 
@@ -163,18 +188,20 @@ def reset_user_password(
     db.add(user)
     db.commit()
     db.refresh(user)
+    deps.invalidate_principal(user.email)
     return user
 
 
-@router.post("/reset-all-passwords", response_model=dict)
+@router.post("/reset-all-passwords", response_model=JobSchema, status_code=202)
 def reset_all_passwords(
     *,
-    db: Session = Depends(deps.get_db),
     current_user: User = Depends(deps.require_role([UserRole.ADMIN])),
 ) -> Any:
     """
     Reset all user passwords based on their role (Admin only).
     Used to fix batch authentication issues.
+
+    Runs as a background job; poll /jobs/{id} for progress.
     """
     password_map = {
         UserRole.ADMIN: "admin123",
@@ -182,19 +209,25 @@ def reset_all_passwords(
         UserRole.HR: "password123",
         UserRole.STAFF: "password123",
     }
-    
-    users = db.query(User).all()
-    updated_count = 0
-    
-    for user in users:
-        password = password_map.get(user.role, "password123")
-        user.hashed_password = get_password_hash(password)
-        updated_count += 1
-    
-    db.commit()
-    
-    return {
-        "status": "success",
-        "updated_count": updated_count,
-        "message": f"Reset passwords for {updated_count} users"
-    }
+    job = submit_job("reset_all_passwords", credentials.reset_passwords_job, password_map, "password123")
+    return job.to_dict()
+
+
+@router.post("/bulk", response_model=JobSchema, status_code=202)
+def bulk_create_users(
+    *,
+    users_in: List[UserCreate],
+    current_user: User = Depends(deps.require_role([UserRole.ADMIN, UserRole.HR])),
+) -> Any:
+    """
+    Create many users in one call (Admin/HR only), e.g. onboarding a department.
+
+    Runs as a background job; existing emails are skipped and listed in the job result.
+    """
+    emails = [u.email for u in users_in]
+    if len(set(emails)) != len(emails):
+        raise HTTPException(status_code=400, detail="Duplicate emails in request")
+
+    users = [u.model_dump() for u in users_in]
+    job = submit_job("bulk_create_users", credentials.import_users_job, users, total=len(users))
+    return job.to_dict()
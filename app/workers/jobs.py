@@ -0,0 +1,119 @@
+"""
+In-process background jobs with progress reporting.
+
+Long-running admin operations (bulk credential resets, imports) are
+submitted here and run on a small dedicated pool, so the HTTP request
+returns immediately with a job id that clients poll via /jobs/{job_id}.
+
+Jobs live in memory on the worker that accepted them. A job is kept for
+as long as it is pending or running, and for JOB_RETENTION_SECONDS after
+it finishes so its result can still be read.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=settings.JOB_WORKERS, thread_name_prefix="job")
+_jobs: Dict[str, "Job"] = {}
+_jobs_lock = threading.Lock()
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    status: str = "pending"  # pending -> running -> succeeded | failed
+    total: int = 0
+    processed: int = 0
+    failed: int = 0
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    result: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    _t0: float = field(default=0.0, repr=False)
+    _t1: Optional[float] = field(default=None, repr=False)
+
+    def advance(self, processed: int = 0, failed: int = 0) -> None:
+        with self._lock:
+            self.processed += processed
+            self.failed += failed
+
+    @property
+    def rows_per_second(self) -> float:
+        if not self._t0:
+            return 0.0
+        elapsed = (self._t1 or time.perf_counter()) - self._t0
+        return round(self.processed / elapsed, 1) if elapsed > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "total": self.total,
+            "processed": self.processed,
+            "failed": self.failed,
+            "rows_per_second": self.rows_per_second,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+def submit_job(kind: str, fn: Callable[..., Optional[Dict[str, Any]]], *args: Any, total: int = 0) -> Job:
+    """
+    Run ``fn(job, *args)`` in the background and return the job handle.
+
+    ``fn`` reports progress through ``job.advance`` and may return a dict
+    that becomes ``job.result``.
+    """
+    job = Job(id=uuid.uuid4().hex, kind=kind, total=total)
+    with _jobs_lock:
+        _remove_expired()
+        _jobs[job.id] = job
+    _executor.submit(_run, job, fn, args)
+    return job
+
+
+def get_job(job_id: str) -> Optional[Job]:
+    with _jobs_lock:
+        _remove_expired()
+        return _jobs.get(job_id)
+
+
+def _remove_expired() -> None:
+    """Drop jobs that finished more than JOB_RETENTION_SECONDS ago (caller holds the lock)."""
+    cutoff = time.perf_counter() - settings.JOB_RETENTION_SECONDS
+    expired = [job_id for job_id, job in _jobs.items() if job._t1 is not None and job._t1 < cutoff]
+    for job_id in expired:
+        del _jobs[job_id]
+
+
+def _run(job: Job, fn: Callable, args: tuple) -> None:
+    job.status = "running"
+    job.started_at = datetime.now(timezone.utc)
+    job._t0 = time.perf_counter()
+    try:
+        job.result = fn(job, *args) or {}
+        job.status = "succeeded"
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("Job %s (%s) failed", job.id, job.kind)
+        job.error = str(exc)
+        job.status = "failed"
+    finally:
+        job._t1 = time.perf_counter()
+        job.finished_at = datetime.now(timezone.utc)
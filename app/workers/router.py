@@ -0,0 +1,24 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.core import deps
+from app.models.users import User, UserRole
+from app.schemas import job as schemas
+from app.workers.jobs import get_job
+
+router = APIRouter()
+
+
+@router.get("/{job_id}", response_model=schemas.Job)
+def read_job(
+    job_id: str,
+    current_user: User = Depends(deps.require_role([UserRole.ADMIN, UserRole.HR])),
+) -> Any:
+    """
+    Poll a background job's progress (Admin/HR only).
+    """
+    job = get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
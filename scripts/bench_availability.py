@@ -0,0 +1,97 @@
+"""
+Doctor availability checks: legacy two-query SQL path vs the interval index.
+
+Replays random (doctor, date, start, end) booking checks against the
+seeded database. The SQL path is the original implementation (working
+hours lookup + three-branch OR overlap query); the index path is
+validate_doctor_availability as used by the scheduling endpoints.
+Both must agree on every answer.
+
+Seed a dataset first (python -m app.ml.production_data_seeder), then:
+
+Run: python scripts/bench_availability.py --checks 5000
+"""
+import argparse
+import os
+import random
+import sys
+import time as clock
+from datetime import date, time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import and_, func, or_, select
+
+from app.core import interval_index
+from app.core.conflict_detection import validate_doctor_availability
+from app.db.db import SessionLocal
+from app.models.appointment import Appointment, AppointmentStatus, DoctorAvailability
+
+
+def sql_available(db, doctor_id: int, appointment_date: date, start_time: time, end_time: time) -> bool:
+    availability = db.query(DoctorAvailability).filter(
+        DoctorAvailability.doctor_id == doctor_id,
+        DoctorAvailability.day_of_week == appointment_date.weekday(),
+    ).first()
+    if not availability or start_time < availability.start_time or end_time > availability.end_time:
+        return False
+    overlap = db.query(Appointment).filter(
+        Appointment.doctor_id == doctor_id,
+        Appointment.appointment_date == appointment_date,
+        Appointment.status == AppointmentStatus.SCHEDULED,
+        or_(
+            and_(Appointment.start_time < end_time, Appointment.start_time >= start_time),
+            and_(Appointment.end_time > start_time, Appointment.end_time <= end_time),
+            and_(Appointment.start_time <= start_time, Appointment.end_time >= end_time),
+        ),
+    ).first()
+    return overlap is None
+
+
+def sample_checks(db, n: int, seed: int) -> list:
+    rng = random.Random(seed)
+    days = db.execute(
+        select(Appointment.doctor_id, Appointment.appointment_date)
+        .group_by(Appointment.doctor_id, Appointment.appointment_date)
+        .order_by(func.count().desc())
+        .limit(200)
+    ).all()
+    if not days:
+        sys.exit("No appointments found - seed the database first.")
+    checks = []
+    for _ in range(n):
+        doctor_id, day = rng.choice(days)
+        start = rng.randrange(8 * 60, 18 * 60, 15)
+        end = start + rng.choice((15, 30, 45, 60))
+        checks.append((doctor_id, day, time(start // 60, start % 60), time(end // 60, end % 60)))
+    return checks
+
+
+def run(label: str, fn, db, checks) -> list:
+    started = clock.perf_counter()
+    answers = [fn(db, *check) for check in checks]
+    elapsed = clock.perf_counter() - started
+    print(f"{label:28} {len(checks) / elapsed:10.0f} checks/s   {elapsed / len(checks) * 1e6:8.1f} us/check")
+    return answers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--checks", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        checks = sample_checks(db, args.checks, args.seed)
+        sql = run("SQL (2 queries/check)", sql_available, db, checks)
+        interval_index._index.clear()
+        cold = run("index (cold, loads on miss)", validate_doctor_availability, db, checks)
+        warm = run("index (warm)", validate_doctor_availability, db, checks)
+
+    mismatches = sum(a != b for a, b in zip(sql, cold)) + sum(a != b for a, b in zip(sql, warm))
+    print(f"\n{sum(sql)} of {len(checks)} slots free; {mismatches} mismatches between SQL and index")
+    print(f"index cache: {interval_index._index.stats()}")
+
+
+if __name__ == "__main__":
+    main()
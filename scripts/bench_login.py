@@ -0,0 +1,73 @@
+"""
+Benchmark login latency under concurrent load.
+
+Fires concurrent POSTs at /api/v1/login/access-token on a running server
+and reports p50/p99 latency plus how many requests were shed with 503.
+
+Run: python scripts/bench_login.py --base-url http://localhost:8000 \
+        --email admin@hospital.com --password admin123 --concurrency 32 --requests 256
+"""
+import argparse
+import statistics
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+
+def login_once(url: str, body: bytes) -> tuple:
+    started = time.perf_counter()
+    request = urllib.request.Request(
+        url, data=body, headers={"Content-Type": "application/x-www-form-urlencoded"}
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as exc:
+        status = exc.code
+    return status, time.perf_counter() - started
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", default="admin@hospital.com")
+    parser.add_argument("--password", default="admin123")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=256)
+    args = parser.parse_args()
+
+    url = f"{args.base_url.rstrip('/')}/api/v1/login/access-token"
+    body = urllib.parse.urlencode({"username": args.email, "password": args.password}).encode()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(lambda _: login_once(url, body), range(args.requests)))
+    elapsed = time.perf_counter() - started
+
+    ok = [latency for status, latency in results if status == 200]
+    shed = sum(1 for status, _ in results if status == 503)
+    failed = len(results) - len(ok) - shed
+
+    print("=" * 60)
+    print(f"LOGIN BENCHMARK  concurrency={args.concurrency} requests={args.requests}")
+    print("=" * 60)
+    print(f"Throughput : {len(results) / elapsed:.1f} req/s")
+    print(f"Succeeded  : {len(ok)}")
+    print(f"Shed (503) : {shed}")
+    print(f"Failed     : {failed}")
+    if ok:
+        print(f"p50        : {statistics.median(ok) * 1000:.1f} ms")
+        print(f"p99        : {percentile(ok, 99) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
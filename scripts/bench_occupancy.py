@@ -0,0 +1,151 @@
+"""
+Doctor calendar queries: interval SQL vs bitmap occupancy.
+
+Replays two kinds of random questions against the seeded database:
+
+  free doctors   "which of these doctors are free 10:00-10:30 on <date>"
+                 SQL: one NOT EXISTS range query over all doctors;
+                 bitmap: one AND per doctor (occupancy.free_doctors)
+  common windows "when are these 3 doctors all free on <date>"
+                 SQL: 288 5-minute slots from generate_series, each checked
+                 against every doctor's hours and bookings;
+                 bitmap: AND of the masks plus a run scan (occupancy.common_free)
+
+Both paths must agree on every answer. Also reports the memory held per
+doctor-day by the bitmap and by the interval entry it is derived from.
+
+Seed a dataset first (python -m app.ml.production_data_seeder), then:
+
+Run: python scripts/bench_occupancy.py --queries 2000
+"""
+import argparse
+import os
+import random
+import sys
+import time as clock
+from datetime import date, time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import func, select, text
+
+from app.core import interval_index
+from app.core.interval_index import BIT_MINUTES
+from app.db.db import SessionLocal
+from app.models.appointment import Appointment
+from app.models.users import User, UserRole
+from app.scheduling import occupancy
+
+FREE_DOCTORS = text("""
+    SELECT da.doctor_id FROM doctor_availability da
+    WHERE da.doctor_id = ANY(:ids) AND da.day_of_week = :dow
+      AND da.start_time <= :start AND da.end_time >= :end
+      AND NOT EXISTS (
+          SELECT 1 FROM appointments a
+          WHERE a.doctor_id = da.doctor_id AND a.appointment_date = :day AND a.status = 'SCHEDULED'
+            AND a.start_time < :end AND a.end_time > :start)
+    GROUP BY da.doctor_id ORDER BY da.doctor_id
+""")
+
+COMMON_SLOTS = text(f"""
+    SELECT s FROM generate_series(0, {24 * 60 // BIT_MINUTES - 1}) AS s
+    WHERE NOT EXISTS (
+        SELECT 1 FROM unnest(CAST(:ids AS integer[])) AS d(id)
+        WHERE NOT EXISTS (
+                SELECT 1 FROM doctor_availability da
+                WHERE da.doctor_id = d.id AND da.day_of_week = :dow
+                  AND da.start_time <= time '00:00' + s * interval '{BIT_MINUTES} min'
+                  AND da.end_time - time '00:00' >= (s + 1) * interval '{BIT_MINUTES} min')
+           OR EXISTS (
+                SELECT 1 FROM appointments a
+                WHERE a.doctor_id = d.id AND a.appointment_date = :day AND a.status = 'SCHEDULED'
+                  AND a.start_time - time '00:00' < (s + 1) * interval '{BIT_MINUTES} min'
+                  AND a.end_time > time '00:00' + s * interval '{BIT_MINUTES} min'))
+    ORDER BY s
+""")
+
+
+def sql_free_doctors(db, doctor_ids, day: date, start: time, end: time) -> list:
+    params = {"ids": doctor_ids, "dow": day.weekday(), "day": day, "start": start, "end": end}
+    return list(db.execute(FREE_DOCTORS, params).scalars())
+
+
+def sql_common_free(db, doctor_ids, day: date) -> list:
+    bits = 0
+    for slot in db.execute(COMMON_SLOTS, {"ids": doctor_ids, "dow": day.weekday(), "day": day}).scalars():
+        bits |= 1 << slot
+    return [(occupancy._bit_time(first), occupancy._bit_time(last)) for first, last in occupancy.runs(bits)]
+
+
+def deep_size(obj, seen=None) -> int:
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, tuple):
+        size += sum(deep_size(item, seen) for item in obj)
+    elif hasattr(obj, "__dataclass_fields__"):
+        size += sum(deep_size(getattr(obj, name), seen) for name in obj.__dataclass_fields__)
+    return size
+
+
+def run(label: str, fn, db, queries) -> list:
+    started = clock.perf_counter()
+    answers = [fn(db, *query) for query in queries]
+    elapsed = clock.perf_counter() - started
+    print(f"{label:34} {len(queries) / elapsed:10.0f} queries/s   {elapsed / len(queries) * 1e6:9.1f} us/query")
+    return answers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with SessionLocal() as db:
+        doctors = db.scalars(select(User.id).where(User.role == UserRole.DOCTOR).order_by(User.id)).all()
+        dates = db.scalars(
+            select(Appointment.appointment_date).group_by(Appointment.appointment_date)
+            .order_by(func.count().desc()).limit(60)
+        ).all()
+        if not doctors or not dates:
+            sys.exit("No doctors or appointments found - seed the database first.")
+
+        windows = []
+        for _ in range(args.queries):
+            start = rng.randrange(8 * 60, 18 * 60, 15)
+            end = start + rng.choice((15, 30, 60))
+            windows.append((doctors, rng.choice(dates), time(start // 60, start % 60), time(end // 60, end % 60)))
+        groups = [(rng.sample(doctors, min(3, len(doctors))), rng.choice(dates)) for _ in range(args.queries // 4)]
+
+        print(f"free doctors among {len(doctors)}:")
+        sql_free = run("  SQL (1 range query)", sql_free_doctors, db, windows)
+        interval_index._index.clear()
+        cold_free = run("  bitmap (cold, loads on miss)", occupancy.free_doctors, db, windows)
+        warm_free = run("  bitmap (warm)", occupancy.free_doctors, db, windows)
+
+        print("common windows of 3 doctors:")
+        sql_common = run("  SQL (288 slots x doctors)", sql_common_free, db, groups)
+        warm_common = run("  bitmap (warm)", occupancy.common_free, db, groups)
+
+    mismatches = (
+        sum(a != b for a, b in zip(sql_free, cold_free))
+        + sum(a != b for a, b in zip(sql_free, warm_free))
+        + sum(a != b for a, b in zip(sql_common, warm_common))
+    )
+    print(f"\n{mismatches} mismatches between SQL and bitmap")
+
+    entries = [entry for entry, _ in list(interval_index._index._data.values())]
+    if entries:
+        bitmap = sum(sys.getsizeof(e.free_bits) + sys.getsizeof(e.hours_bits) for e in entries) / len(entries)
+        intervals = sum(deep_size(e.windows) + deep_size(e.bookings) for e in entries) / len(entries)
+        bookings = sum(len(e.bookings) for e in entries) / len(entries)
+        print(f"memory per doctor-day ({len(entries)} cached, {bookings:.1f} bookings avg): "
+              f"bitmap {bitmap:.0f} B, interval entry {intervals:.0f} B")
+
+
+if __name__ == "__main__":
+    main()
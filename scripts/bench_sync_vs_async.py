@@ -0,0 +1,118 @@
+"""
+Side-by-side throughput benchmark of sync vs async list handlers.
+
+Serves two equivalent endpoints with uvicorn - one sync `def` handler on
+a sync Session, one `async def` handler on an AsyncSession - and hammers
+each with the same concurrent load against a local Postgres.
+
+Both engines use the pool the app configures (DB_POOL_SIZE, DB_MAX_OVERFLOW,
+DB_POOL_TIMEOUT_SECONDS and DB_POOL_RECYCLE_SECONDS from the settings).
+--latency-ms adds pg_sleep per request to mimic a remote database.
+
+Run: python scripts/bench_sync_vs_async.py --database-url postgresql://postgres@localhost/hospital \
+        --concurrency 64 --requests 2000 --latency-ms 20
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import uvicorn
+from fastapi import FastAPI
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db.db import _async_url
+from app.models.room import Room
+
+
+POOL = {
+    "pool_pre_ping": True,
+    "pool_size": settings.DB_POOL_SIZE,
+    "max_overflow": settings.DB_MAX_OVERFLOW,
+    "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+    "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+}
+
+
+def build_app(database_url: str, latency_s: float) -> FastAPI:
+    sync_engine = create_engine(database_url, **POOL)
+    async_engine = create_async_engine(_async_url(database_url), **POOL)
+    SyncSession = sessionmaker(bind=sync_engine)
+    AsyncSession = async_sessionmaker(async_engine, expire_on_commit=False)
+    app = FastAPI()
+
+    @app.get("/sync/rooms")
+    def sync_rooms():
+        with SyncSession() as db:
+            if latency_s:
+                db.execute(text("SELECT pg_sleep(:s)"), {"s": latency_s})
+            return [r.id for r in db.scalars(select(Room).limit(100))]
+
+    @app.get("/async/rooms")
+    async def async_rooms():
+        async with AsyncSession() as db:
+            if latency_s:
+                await db.execute(text("SELECT pg_sleep(:s)"), {"s": latency_s})
+            return [r.id for r in (await db.scalars(select(Room).limit(100)))]
+
+    return app
+
+
+def fetch(url: str) -> float:
+    started = time.perf_counter()
+    with urllib.request.urlopen(url, timeout=120) as response:
+        response.read()
+    return time.perf_counter() - started
+
+
+def run(url: str, concurrency: int, requests: int) -> dict:
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = sorted(pool.map(lambda _: fetch(url), range(requests)))
+    elapsed = time.perf_counter() - started
+    return {
+        "rps": requests / elapsed,
+        "p50": statistics.median(latencies) * 1000,
+        "p99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default=os.environ.get("BENCH_DATABASE_URL", "postgresql://postgres@localhost/hospital"))
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    app = build_app(args.database_url, args.latency_ms / 1000)
+    server = uvicorn.Server(uvicorn.Config(app, port=args.port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+
+    base = f"http://127.0.0.1:{args.port}"
+    print("=" * 60)
+    print(f"SYNC vs ASYNC  concurrency={args.concurrency} requests={args.requests} latency={args.latency_ms}ms "
+          f"pool={settings.DB_POOL_SIZE}+{settings.DB_MAX_OVERFLOW}")
+    print("=" * 60)
+    for name in ("sync", "async"):
+        fetch(f"{base}/{name}/rooms")  # warm the pool
+        r = run(f"{base}/{name}/rooms", args.concurrency, args.requests)
+        print(f"{name:6} {r['rps']:8.1f} req/s   p50 {r['p50']:7.1f} ms   p99 {r['p99']:7.1f} ms")
+
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+EXPLAIN ANALYZE timings for the hot-path queries, before and after migrations.
+
+Seed a dataset first (python -m app.ml.production_data_seeder), then:
+
+Run: python scripts/explain_hot_paths.py              # timings on the current schema
+     python scripts/explain_hot_paths.py --migrate    # before, apply migrations, after
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import text
+
+from app.db import migrations
+from app.db.db import engine
+
+QUERIES = {
+    "appointment overlap (conflict check)": """
+        SELECT id FROM appointments
+        WHERE doctor_id = :doctor_id AND appointment_date = :appointment_date
+          AND status = 'SCHEDULED' AND start_time < :end_time AND end_time > :start_time
+        LIMIT 1
+    """,
+    "doctor availability lookup": """
+        SELECT * FROM doctor_availability
+        WHERE doctor_id = :doctor_id AND day_of_week = :day_of_week
+        LIMIT 1
+    """,
+    "my shifts (by staff_id)": """
+        SELECT * FROM staff_shift_assignments WHERE staff_id = :staff_id
+    """,
+    "room by room_number": """
+        SELECT * FROM rooms WHERE room_number = :room_number LIMIT 1
+    """,
+    "appointments keyset page (doctor)": """
+        SELECT * FROM appointments
+        WHERE doctor_id = :doctor_id
+          AND (appointment_date, start_time, id) > (:appointment_date, :start_time, 0)
+        ORDER BY appointment_date, start_time, id
+        LIMIT 100
+    """,
+}
+
+
+def sample_params(conn) -> dict:
+    appt = conn.execute(text(
+        "SELECT doctor_id, appointment_date, start_time, end_time FROM appointments "
+        "ORDER BY id DESC LIMIT 1"
+    )).mappings().first()
+    staff_id = conn.execute(text("SELECT staff_id FROM staff_shift_assignments LIMIT 1")).scalar()
+    room_number = conn.execute(text("SELECT room_number FROM rooms ORDER BY id DESC LIMIT 1")).scalar()
+    if appt is None:
+        sys.exit("No appointments found - seed the database first.")
+    return {
+        "doctor_id": appt["doctor_id"],
+        "appointment_date": appt["appointment_date"],
+        "start_time": appt["start_time"],
+        "end_time": appt["end_time"],
+        "day_of_week": appt["appointment_date"].weekday(),
+        "staff_id": staff_id or 0,
+        "room_number": room_number or "",
+    }
+
+
+def plan_nodes(plan: dict) -> list:
+    nodes = [plan.get("Index Name") or plan["Node Type"]]
+    for child in plan.get("Plans", []):
+        nodes.extend(plan_nodes(child))
+    return nodes
+
+
+def measure(repeat: int) -> dict:
+    results = {}
+    with engine.connect() as conn:
+        params = sample_params(conn)
+        for name, sql in QUERIES.items():
+            timings, plan = [], None
+            for _ in range(repeat):
+                raw = conn.execute(text(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}"), params).scalar()
+                doc = (json.loads(raw) if isinstance(raw, str) else raw)[0]
+                timings.append(doc["Execution Time"])
+                plan = doc["Plan"]
+            results[name] = (statistics.median(timings), " > ".join(plan_nodes(plan)))
+    return results
+
+
+def report(title: str, results: dict) -> None:
+    print(f"\n{title}")
+    print("-" * 100)
+    for name, (ms, plan) in results.items():
+        print(f"{name:40} {ms:9.3f} ms   {plan}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--migrate", action="store_true", help="apply pending migrations between runs")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    before = measure(args.repeat)
+    report("BEFORE" if args.migrate else "CURRENT SCHEMA", before)
+    if not args.migrate:
+        return
+
+    applied = migrations.upgrade()
+    print(f"\nApplied {len(applied)} migration(s): {', '.join(m.name for m in applied) or '-'}")
+    after = measure(args.repeat)
+    report("AFTER", after)
+
+    print("\nSPEEDUP")
+    print("-" * 100)
+    for name in QUERIES:
+        b, a = before[name][0], after[name][0]
+        print(f"{name:40} {b / a if a else float('inf'):8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
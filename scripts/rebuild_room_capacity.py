@@ -0,0 +1,31 @@
+"""
+Recompute the room_capacity counters from the rooms table.
+Run: python -m scripts.rebuild_room_capacity
+Or:  python scripts/rebuild_room_capacity.py
+"""
+import sys
+import os
+
+# Add project root to path so imports work when run as a module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import func, select
+
+from app.db.db import SessionLocal
+from app.models.room import RoomCapacity
+from app.rooms import capacity
+
+
+def rebuild_room_capacity():
+    db = SessionLocal()
+    try:
+        capacity.rebuild(db)
+        db.commit()
+        groups = db.scalar(select(func.count()).select_from(RoomCapacity))
+        print(f"Rebuilt room_capacity: {groups} group(s)")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    rebuild_room_capacity()
@@ -0,0 +1,147 @@
+"""
+Concurrent booking stress test: proves the database never double-books.
+
+Starts the API under uvicorn with several worker processes (so each
+worker's in-memory interval index is blind to the others' bookings) and
+fires many concurrent POST /appointments requests for heavily
+overlapping slots of one doctor on one date. Afterwards it counts
+overlapping SCHEDULED appointment pairs in the database, which must be 0.
+
+The test date's appointments and the temporary availability window are
+removed again unless --keep is given. Use a development database.
+
+Run: python scripts/stress_booking.py --admin-email admin@hospital.com --doctor-id 2 \
+        --requests 2000 --concurrency 64 --workers 4
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, time as dtime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import text
+
+from app.core.security import create_access_token
+from app.db.db import SessionLocal
+from app.models.appointment import DoctorAvailability
+
+OVERLAP_PAIRS = text("""
+    SELECT count(*) FROM appointments a
+    JOIN appointments b ON b.doctor_id = a.doctor_id AND b.appointment_date = a.appointment_date
+     AND b.id > a.id AND b.start_time < a.end_time AND b.end_time > a.start_time
+    WHERE a.doctor_id = :doctor_id AND a.appointment_date = :day
+      AND a.status = 'SCHEDULED' AND b.status = 'SCHEDULED'
+""")
+
+
+def start_server(port: int, workers: int) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=os.path.abspath(os.path.join(os.path.dirname(__file__), "..")),
+    )
+    for _ in range(100):
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1)
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    sys.exit("Server did not start")
+
+
+def book(url: str, token: str, body: dict) -> int:
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(body).encode(),
+        headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"},
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return response.status
+    except urllib.error.HTTPError as exc:
+        return exc.code
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--admin-email", required=True)
+    parser.add_argument("--doctor-id", type=int, required=True)
+    parser.add_argument("--date", type=date.fromisoformat, default=date(2099, 1, 5))
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--keep", action="store_true", help="keep the test appointments afterwards")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        window = DoctorAvailability(
+            doctor_id=args.doctor_id, day_of_week=args.date.weekday(), start_time=dtime(0), end_time=dtime(23, 59),
+        )
+        db.add(window)
+        db.commit()
+        window_id = window.id
+
+    rng = random.Random(0)
+    bodies = []
+    for i in range(args.requests):
+        # 30-minute slots on a 5-minute grid inside a 4-hour block: almost every pair overlaps
+        start = 9 * 60 + 5 * rng.randrange(0, 48)
+        bodies.append({
+            "patient_id": i + 1,
+            "doctor_id": args.doctor_id,
+            "appointment_date": args.date.isoformat(),
+            "start_time": f"{start // 60:02d}:{start % 60:02d}:00",
+            "end_time": f"{(start + 30) // 60:02d}:{(start + 30) % 60:02d}:00",
+            "patient_name": f"Stress {i}",
+            "patient_phone": "0000000000",
+            "patient_gender": "Other",
+            "patient_age": 30,
+            "appointment_type": "Consultation",
+            "reason_for_visit": "stress test",
+        })
+
+    token = create_access_token(subject=args.admin_email)
+    url = f"http://127.0.0.1:{args.port}/api/v1/appointments/"
+    server = start_server(args.port, args.workers)
+    try:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            statuses = Counter(pool.map(lambda body: book(url, token, body), bodies))
+        elapsed = time.perf_counter() - started
+    finally:
+        server.terminate()
+        server.wait()
+
+    with SessionLocal() as db:
+        overlaps = db.execute(OVERLAP_PAIRS, {"doctor_id": args.doctor_id, "day": args.date}).scalar()
+        if not args.keep:
+            db.execute(
+                text("DELETE FROM appointments WHERE doctor_id = :d AND appointment_date = :day"),
+                {"d": args.doctor_id, "day": args.date},
+            )
+        db.execute(text("DELETE FROM doctor_availability WHERE id = :id"), {"id": window_id})
+        db.commit()
+
+    print(f"{args.requests} requests in {elapsed:.1f}s ({args.requests / elapsed:.0f} req/s), "
+          f"concurrency {args.concurrency}, {args.workers} workers")
+    print(f"status codes: {dict(sorted(statuses.items()))}")
+    print(f"overlapping scheduled pairs: {overlaps}")
+    if overlaps or set(statuses) - {200, 409}:
+        sys.exit("FAILED")
+    print("OK: no double bookings")
+
+
+if __name__ == "__main__":
+    main()